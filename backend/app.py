@@ -1,113 +1,123 @@
-from flask import Flask, jsonify, send_from_directory, request
+from flask import Flask, Response, abort, g, jsonify, send_from_directory, request, stream_with_context
+from werkzeug.security import safe_join
 from flask_cors import CORS
-from services.imagen_service import generate_image
-from services.contour_service import process_contours_and_split3, process_contours_and_split3_json
-from services.json_service import contours_txt_to_json
-from services.image_question_service import generate_questions_from_image
-from services.tts_service import generate_tts
-from services.db_service import init_database, save_contours_to_db, get_random_drawing_by_category, get_wrong_answers_by_category
-import os, random,subprocess, re
-import subprocess
+from services.imagen_service import generate_image_array
+from services.contour_service import iter_split3_json_parts, process_contours_and_split3_json
+from services.image_question_service import generate_questions_from_image, iter_questions_from_image, prepare_image
+from services.tts_service import TTS_CACHE_DIR, cached_tts, get_tts, submit_tts, tts_cache_stats
+from services.contour_cache import cache_stats
+from services.prompt_cache import claim, finish, get_or_run, normalize_prompt, prompt_cache_stats
+from services.response_cache import choose_encoding, compress_response, file_etag, get_file_payload, get_payload, payload_cache_stats
+from services.path_optimizer import optimize_pen_path, pen_up_distance
+from services.plotter_service import get_plotter, sse_stream, PlotterBusyError
+from services.job_service import submit_job, get_job, wait_job, job_stats, QueueFullError
+from services.metrics_service import metrics_enabled, set_enabled as set_metrics_enabled, observe, inc, stage_timer, snapshot as metrics_snapshot, render_prometheus, reset as reset_metrics
+from catalog import NAME_MAP, CATEGORY_MAP
+from services.db_service import init_database, get_pool_stats, save_contours_to_db, get_random_drawing_with_wrong_answers, get_drawing_part, PART_NUMBERS
+import os, random, re
+import contextlib
+import hmac
 import json
+import queue
+import threading
+import time
+from concurrent.futures import as_completed
+from urllib.parse import quote
 
 app = Flask(__name__)
 CORS(app)
 
 init_database()
 
+# 엔드포인트별 지연 시간 (계측이 꺼져 있으면 플래그 확인만 한다)
+# 스트리밍 응답(SSE)은 헤더를 보낼 때까지의 시간만 잡힌다
+@app.before_request
+def _metrics_start():
+    if metrics_enabled():
+        g.metrics_start = time.perf_counter()
+
+@app.after_request
+def _metrics_end(response):
+    start = g.pop("metrics_start", None)
+    if start is not None:
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        observe("http_request_seconds", time.perf_counter() - start, endpoint=endpoint, method=request.method)
+        inc("http_requests_total", endpoint=endpoint, method=request.method, status=response.status_code)
+    return response
+
+# 큰 JSON 응답(컨투어 포함)은 gzip/brotli 로 압축 (이미 압축된 캐시 응답은 건너뜀)
+@app.after_request
+def _compress_json(response):
+    return compress_response(response, request.accept_encodings)
+
 # 이미지가 들어있는 폴더 경로
 IMAGE_FOLDER = os.path.join(app.root_path, "static/images")
 JSON_FOLDER = os.path.join(app.root_path, "drawing_bot/contour_json")
 
-# 파일명 → 한글 이름 매핑
-NAME_MAP = {
-    "apple": "사과",
-    "grape": "포도",
-    "banana": "바나나",
-    "strawberry": "딸기",
-    "watermelon" : "수박",
-    "pear" : "배",
-    "cosmos":"코스모스",
-    "jangmi" : "장미",
-    "haebalagi" : "해바라기",
-    "gookhwa" : "국화",
-    "baekhap" :"백합",
-    "tulip" : "튤립",
-    "jindallae" :"진달래",
-    "bicycle" : "자전거",
-    "airplane" : "비행기",
-    "bus" : "버스",
-    "motorcycle" : "오토바이",
-    "train" : "기차",
-    "yulgigoo" : "열기구",
-    "ship" : "배",
-    "bag" : "가방",
-    "clock" : "시계",
-    "cup" : "컵",
-    "glass" : "안경",
-    "hat" : "모자",
-    "shoes" : "신발",
-    "umbrella" : "우산",
-    "cat_drawing" : "고양이",
-    "dog_drawing" : "강아지",
-    "fox_drawing" : "여우",
-    "giraffe_drawing" : "기린",
-    "hippo_drawing" : "하마",
-    "owl_drawing" : "부엉이",
-    "penguin" : "펭귄",
-    "1_drawing" : "송학(솔)",
-    "2_drawing" : "매조",
-    "3_drawing" : "벚꽃(사쿠라)",
-    "4_draiwng" :"등나무(흑싸리)",
-    "5_drawing" : "제비붓꽃(난초)",
-    "6_drawing" : "모란(목단)",
-    "7_drawing" : "싸리",
-    "8_drawing" : "억새",
-    "9_drawing" : "국화",
-    "10_drawing" : "단풍",
-    "11_drawing" : "오동",
-    "12_drawing" : "버드나무"
-}
-
-CATEGORY_MAP = {
-    "동물": "animals",
-    "과일": "fruits",
-    "탈것": "vehicles",
-    "꽃": "flowers",
-    "화투" : "hwatu",
-    "사물" : "objects"
-}
+# 브라우저 캐시 시간(초): 번들 이미지/precompute JSON/DB part 는 내용이 바뀌면 ETag 가 바뀐다
+STATIC_MAX_AGE = int(os.environ.get("STATIC_MAX_AGE", "86400"))
+PART_MAX_AGE = int(os.environ.get("PART_MAX_AGE", "86400"))
+
+_folder_images = {}   # 폴더 이름 → (폴더 mtime, [(파일명, 표시 이름), ...])
+
+def _category_images(folder_name):
+    """카테고리 폴더의 이미지 목록. 폴더 mtime 이 바뀌었을 때(파일 추가/삭제)만 다시 읽는다."""
+    category_path = os.path.join(IMAGE_FOLDER, folder_name)
+    mtime = os.stat(category_path).st_mtime_ns
+    entry = _folder_images.get(folder_name)
+    if entry is None or entry[0] != mtime:
+        images = sorted(img for img in os.listdir(category_path) if img.lower().endswith((".png", ".jpg", ".jpeg")))
+        entry = (mtime, [(img, NAME_MAP.get(os.path.splitext(img)[0], os.path.splitext(img)[0])) for img in images])
+        _folder_images[folder_name] = entry
+    return entry[1]
+
+def _payload_response(payload, max_age):
+    """캐시된 JSON Payload → 압축본 + strong ETag + Cache-Control, If-None-Match 가 맞으면 304"""
+    body, encoding, etag = payload.encoded(choose_encoding(request.accept_encodings))
+    response = Response(body, mimetype="application/json")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response.make_conditional(request)
+
+def _send_static(directory, filename, max_age):
+    """send_from_directory + 내용 해시 ETag (Range/304 처리는 werkzeug 가 한다)"""
+    path = safe_join(directory, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    return send_from_directory(directory, filename, max_age=max_age, etag=file_etag(path))
 
 @app.route("/api/random/<category>")
 def random_image(category):
-    db_result = get_random_drawing_by_category(category)
+    # lazy=1: 퀴즈에 필요한 메타데이터만 보내고 컨투어는 part 별 URL 로 (그릴 때 받아감)
+    lazy = request.args.get("lazy") in ("1", "true")
+    db_result = get_random_drawing_with_wrong_answers(category, 3, include_parts=not lazy)
     if db_result:
-        wrong_answers = get_wrong_answers_by_category(category, db_result['id'], 3)
-        return jsonify({
+        response = {
             "name": db_result['name'],
             "imageUrl": db_result['imageUrl'],
-            "part1Contours": db_result['part1Contours'],
-            "part2Contours": db_result['part2Contours'],
-            "part3Contours": db_result['part3Contours'],
-            "wrongAnswers": wrong_answers
-        })
+            "wrongAnswers": db_result['wrongAnswers']
+        }
+        for n in PART_NUMBERS:
+            if lazy:
+                response[f"part{n}JsonUrl"] = f"/api/drawings/{db_result['id']}/parts/{n}"
+            else:
+                response[f"part{n}Contours"] = db_result[f'part{n}Contours']
+        return jsonify(response)
     
     folder_name = CATEGORY_MAP.get(category)
     if not folder_name:
         return jsonify({"error": "Category not found"}), 404
 
-    category_path = os.path.join(IMAGE_FOLDER, folder_name)
-    images = [img for img in os.listdir(category_path) if img.lower().endswith((".png", ".jpg", ".jpeg"))]
+    images = _category_images(folder_name)
     if not images:
         return jsonify({"error": "No images in this category"}), 404
 
-    image_file = random.choice(images)
-    correct_name = NAME_MAP.get(os.path.splitext(image_file)[0], os.path.splitext(image_file)[0])
-
-    wrong_names = [
-        NAME_MAP.get(os.path.splitext(img)[0], os.path.splitext(img)[0])
-        for img in images if img != image_file
-    ]
+    image_file, correct_name = random.choice(images)
+    wrong_names = [name for img, name in images if img != image_file]
     wrong_sample = random.sample(wrong_names, min(3, len(wrong_names)))
 
     return jsonify({
@@ -119,6 +129,27 @@ def random_image(category):
         "wrongAnswers": wrong_sample
     })
 
+def _queue_on_plotter(contours, **extra):
+    try:
+        batch_id = get_plotter().submit(contours)
+    except PlotterBusyError as e:
+        return jsonify({"error": str(e)}), 503
+    return jsonify(dict({
+        "status": "queued",
+        "batchId": batch_id,
+        "statusUrl": f"/api/plotter/status?batch={batch_id}"
+    }, **extra)), 202
+
+@app.route("/api/drawings/<int:drawing_id>/parts/<int:part>")
+def drawing_part(drawing_id, part):
+    if part not in PART_NUMBERS:
+        return jsonify({"error": "Part not found"}), 404
+    # 저장된 part 는 바뀌지 않으므로 직렬화/압축 결과를 캐시하고 ETag 로 재요청은 304
+    payload = get_payload(("part", drawing_id, part), lambda: get_drawing_part(drawing_id, part))
+    if payload is None:
+        return jsonify({"error": "Drawing not found"}), 404
+    return _payload_response(payload, PART_MAX_AGE)
+
 @app.route("/api/draw/<category>/<image_name>", methods=["POST"])
 def draw_on_ev3(category, image_name):
     folder_name = CATEGORY_MAP.get(category)
@@ -131,14 +162,9 @@ def draw_on_ev3(category, image_name):
     if not os.path.exists(json_file):
         return jsonify({"error": "JSON file not found"}), 404
 
-    try:
-        subprocess.run(
-            ["python3", "control_ev3.py", json_file],
-            check=True
-        )
-        return jsonify({"status": "success", "file": os.path.basename(json_file)})
-    except subprocess.CalledProcessError as e:
-        return jsonify({"error": str(e)}), 500
+    with open(json_file, "r", encoding="utf-8") as f:
+        contours = [json.loads(line) for line in f if line.strip()]
+    return _queue_on_plotter(contours, file=os.path.basename(json_file))
 
 @app.route("/api/draw/contours", methods=["POST"])
 def draw_contours_on_ev3():
@@ -148,27 +174,263 @@ def draw_contours_on_ev3():
     if not contours:
         return jsonify({"error": "No contours provided"}), 400
     
+    # 펜업 이동이 최소가 되도록 순서/시작점 정리 후 전송
     try:
-        import tempfile
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-        for contour in contours:
-            temp_file.write(json.dumps(contour) + "\n")
-        temp_file.close()
-        
-        subprocess.run(
-            ["python3", "control_ev3.py", temp_file.name],
-            check=True
-        )
-        
-        os.unlink(temp_file.name)
-        return jsonify({"status": "success", "message": "Contours drawn successfully"})
-    except Exception as e:
-        if os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
-        return jsonify({"error": str(e)}), 500
+        pen_up_before = pen_up_distance(contours)
+        contours, _ = optimize_pen_path(contours)
+        pen_up_after = pen_up_distance(contours)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid contours: {str(e)}"}), 400
+
+    # 플로터 세션 대기열에 넣고 바로 반환 (진행 상황은 /api/plotter/status, /api/plotter/events)
+    return _queue_on_plotter(
+        [c.tolist() for c in contours],
+        penUpBefore=round(pen_up_before, 1),
+        penUpAfter=round(pen_up_after, 1)
+    )
+
+@app.route("/api/plotter/status")
+def plotter_status():
+    return jsonify(get_plotter().status(request.args.get("batch")))
+
+@app.route("/api/plotter/events")
+def plotter_events():
+    return Response(
+        stream_with_context(sse_stream(get_plotter())),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def stream_format(stream, accept):
+    """
+    스트리밍 응답 요청 여부 (stream: ?stream= 값, accept: Accept 헤더)
+    ?stream=1 / ?stream=ndjson / Accept: application/x-ndjson → "ndjson",
+    ?stream=sse / Accept: text/event-stream → "sse", 아니면 None (JSON 한 번에)
+    """
+    accept = accept or ""
+    if stream == "sse" or (stream is None and "text/event-stream" in accept):
+        return "sse"
+    if stream in ("1", "ndjson") or (stream is None and "application/x-ndjson" in accept):
+        return "ndjson"
+    return None
+
+def format_event(fmt, event):
+    """이벤트 dict → NDJSON 한 줄 또는 SSE 메시지 (plotter events 와 같은 data: 형식)"""
+    data = json.dumps(event, ensure_ascii=False)
+    return f"data: {data}\n\n" if fmt == "sse" else data + "\n"
+
+STREAM_MIMETYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+def stream_events(fmt, events):
+    """이벤트 제너레이터 → 응답 본문 조각. 클라이언트가 끊으면 events 도 바로 닫는다 (finally 정리)."""
+    with contextlib.closing(events):
+        for event in events:
+            yield format_event(fmt, event)
+
+def stream_response(fmt, events):
+    return Response(
+        stream_with_context(stream_events(fmt, events)),
+        mimetype=STREAM_MIMETYPES[fmt],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 def safe_filename(text: str) -> str:
     return re.sub(r'[^a-zA-Z0-9_-]', '_', text)
+
+class DrawingSaveError(Exception):
+    pass
+
+def request_prompt(user_text):
+    return f"Digital sketch of {user_text} with cartoon style, flat colors, playful and whimsical, white background"
+
+def generated_image_path(prompt):
+    os.makedirs("static/generated", exist_ok=True)
+    return f"static/generated/{safe_filename(prompt)}.png"
+
+def contour_options(options):
+    """요청 JSON → process_contours_and_split3_json 추가 단순화 옵션"""
+    return {
+        "tolerance": options.get("tolerance"),
+        "max_vertices": options.get("maxVertices"),
+        "max_seconds": options.get("maxSeconds"),
+    }
+
+def save_generated_drawing(user_text, image_url, part1, part2, part3):
+    category = "generated"
+    try:
+        with stage_timer("db_save"):
+            drawing_id = save_contours_to_db(user_text, category, image_url, part1, part2, part3)
+        app.logger.debug("Drawing saved to DB with ID: %s", drawing_id)
+    except Exception as db_error:
+        app.logger.error("DB save error: %s", db_error)
+        raise DrawingSaveError(f"DB 저장 실패: {str(db_error)}")
+    return drawing_id
+
+def request_result(prompt, image_url, parts, pipeline_stats):
+    part1, part2, part3 = parts
+    observe("drawing_points", pipeline_stats["vertexCount"])
+    observe("drawing_contours", len(part1) + len(part2) + len(part3))
+    return {
+        "status": "success",
+        "prompt": prompt,
+        "message": "그림이 완성되었습니다!",
+        "imageUrl": image_url,
+        "part1Contours": part1,
+        "part2Contours": part2,
+        "part3Contours": part3,
+        "stats": pipeline_stats
+    }
+
+def request_key(user_text, host_url, options):
+    """요청 합치기/결과 캐시 키: 정규화된 text + 결과에 영향을 주는 옵션 (imageUrl 에 host 가 들어감)"""
+    return (normalize_prompt(user_text), host_url) + tuple(sorted(contour_options(options).items()))
+
+def run_request_pipeline(user_text, host_url, options):
+    """
+    이미지 생성 → 컨투어 → DB 저장. /api/request 와 작업 큐(/api/jobs)가 같이 사용한다.
+    같은 text 로 동시에 들어온 요청은 진행 중인 생성 하나를 같이 기다리고,
+    끝난 결과는 PROMPT_CACHE_TTL 동안 재사용한다.
+    ASGI 모드(asgi.py)는 같은 도우미로 비동기 버전을 만든다.
+    """
+    return get_or_run(request_key(user_text, host_url, options),
+                      _generate_drawing, user_text, host_url, options)
+
+def _generate_drawing(user_text, host_url, options):
+    prompt = request_prompt(user_text)
+    image_path = generated_image_path(prompt)
+    # 디코딩된 배열을 바로 컨투어 추출에 넘기고, PNG 파일은 그동안 백그라운드에서 저장
+    with stage_timer("generate_image"):
+        image, image_saved = generate_image_array(prompt, save_path=image_path)
+    image_url = f"{host_url}static/generated/{os.path.basename(image_path)}"
+
+    pipeline_stats = {}
+    parts = process_contours_and_split3_json(image, stats=pipeline_stats, **contour_options(options))
+    save_generated_drawing(user_text, image_url, *parts)
+
+    # imageUrl 을 돌려주기 전에 파일이 다 써졌는지 확인
+    image_saved.result()
+    return request_result(prompt, image_url, parts, pipeline_stats)
+
+def _save_in_background(user_text, image_url, parts):
+    """스트리밍 응답용 DB 저장: 작업 큐에서 실행하고 작업 id 반환 (큐가 가득 차면 바로 저장)"""
+    try:
+        return submit_job("db_save", save_generated_drawing, user_text, image_url, *parts).id
+    except QueueFullError:
+        save_generated_drawing(user_text, image_url, *parts)
+        return None
+
+class _PlotterFeed:
+    """
+    스트리밍 중 part 를 받는 대로 플로터에 넣는다. part1 은 바로 새 batch 로(가득 차면 거절),
+    이후 part 는 전용 스레드가 순서대로 이어 붙인다 (플로터 대기열을 기다리느라 응답이 멈추지 않게).
+    """
+
+    def __init__(self):
+        self.batch_id = None
+        self.rejected = False
+        self.parts = queue.Queue()
+        self.thread = None
+
+    def add(self, contours):
+        """return: 첫 part 면 plotter 이벤트 dict, 아니면 None"""
+        if self.rejected:
+            return None
+        if self.batch_id is None:
+            try:
+                self.batch_id = get_plotter().submit(contours)
+            except PlotterBusyError as e:
+                self.rejected = True
+                return {"type": "plotter", "error": str(e)}
+            self.thread = threading.Thread(target=self._extend, name="plotter-feed", daemon=True)
+            self.thread.start()
+            return {"type": "plotter", "batchId": self.batch_id,
+                    "statusUrl": f"/api/plotter/status?batch={self.batch_id}"}
+        self.parts.put(contours)
+        return None
+
+    def close(self):
+        if self.thread is not None:
+            self.parts.put(None)
+
+    def _extend(self):
+        while (contours := self.parts.get()) is not None:
+            get_plotter().extend(self.batch_id, contours)
+
+def _result_events(result):
+    """캐시된/합쳐진 결과를 스트리밍 이벤트 순서로"""
+    yield {"type": "image", "prompt": result["prompt"], "imageUrl": result["imageUrl"]}
+    for number in PART_NUMBERS:
+        yield {"type": "part", "part": number, "contours": result[f"part{number}Contours"]}
+    yield {"type": "done", "message": result["message"], "stats": result["stats"]}
+
+def stream_request_events(user_text, host_url, options):
+    """
+    /api/request 스트리밍 모드 (NDJSON/SSE). 응답 JSON 을 기다리지 않고 준비되는 대로:
+        {"type": "image", "prompt": ..., "imageUrl": ...}        이미지 생성 직후
+        {"type": "part", "part": 1, "contours": [...]}            part1 펜 경로 최적화 직후, 이어서 2, 3
+        {"type": "plotter", "batchId": ...}                       options["plot"] 이면 part1 을 바로 플로터로
+        {"type": "done", "message": ..., "stats": {...}, "saveJobId": ...}   DB 저장은 작업 큐에서
+    같은 text 의 진행 중/최근 요청이 있으면(요청 합치기, 결과 캐시) 그 결과를 같은 순서로 보낸다.
+    """
+    key = request_key(user_text, host_url, options)
+    state, value = claim(key)
+    if state != "miss":
+        try:
+            result = value if state == "hit" else value.result()
+        except Exception as e:
+            yield {"type": "error", "error": f"이미지 생성 실패: {str(e)}"}
+            return
+        yield from _result_events(result)
+        return
+
+    future, finished = value, False
+    feed = _PlotterFeed() if options.get("plot") else None
+    try:
+        prompt = request_prompt(user_text)
+        image_path = generated_image_path(prompt)
+        with stage_timer("generate_image"):
+            image, image_saved = generate_image_array(prompt, save_path=image_path)
+        image_url = f"{host_url}static/generated/{os.path.basename(image_path)}"
+        # 클라이언트가 imageUrl 을 바로 요청하므로 파일부터 확인
+        image_saved.result()
+        yield {"type": "image", "prompt": prompt, "imageUrl": image_url}
+
+        pipeline_stats, parts = {}, []
+        for number, part in iter_split3_json_parts(image, stats=pipeline_stats, **contour_options(options)):
+            parts.append(part)
+            yield {"type": "part", "part": number, "contours": part}
+            plotter_event = feed.add(part) if feed is not None else None
+            if plotter_event is not None:
+                yield plotter_event
+        result = request_result(prompt, image_url, parts, pipeline_stats)
+        save_job_id = _save_in_background(user_text, image_url, parts)
+        finish(key, future, result)
+        finished = True
+        yield {"type": "done", "message": result["message"], "stats": pipeline_stats, "saveJobId": save_job_id}
+    except Exception as e:
+        app.logger.exception("Image generation error: %s", e)
+        finish(key, future, error=e)
+        finished = True
+        yield {"type": "error", "error": f"이미지 생성 실패: {str(e)}"}
+    finally:
+        if feed is not None:
+            feed.close()
+        if not finished:
+            # 클라이언트가 중간에 끊음: 기다리던 요청은 다시 시도하게
+            finish(key, future, error=RuntimeError("요청이 취소되었습니다."))
+
+def _submit_request_job(user_text, options):
+    try:
+        job = submit_job("request", run_request_pipeline, user_text, request.host_url, options)
+    except QueueFullError as e:
+        return jsonify({"error": str(e)}), 503
+    return jsonify({
+        "jobId": job.id,
+        "status": job.status,
+        "statusUrl": f"/api/jobs/{job.id}",
+        "waitUrl": f"/api/jobs/{job.id}/wait"
+    }), 202
+
 @app.route("/api/request", methods=["POST"])
 def handle_request():
     data = request.get_json()
@@ -176,69 +438,53 @@ def handle_request():
     if not user_text:
         return jsonify({"error": "내용이 비어있습니다."}), 400
 
-    prompt = f"Digital sketch of {user_text} with cartoon style, flat colors, playful and whimsical, white background"
+    # 비동기 모드: 작업 id 를 바로 반환하고 /api/jobs/<id> 로 결과 조회
+    if data.get("async") or request.args.get("async") == "1":
+        return _submit_request_job(user_text, data)
 
-    try:
-        safe_prompt = safe_filename(prompt)
-        os.makedirs("static/generated", exist_ok=True)
-        image_path = f"static/generated/{safe_prompt}.png"
-        generate_image(prompt, save_path=image_path)
-        image_url = f"{request.host_url}static/generated/{os.path.basename(image_path)}"
-        
-        part1, part2, part3 = process_contours_and_split3_json(image_path)
-        
-        category = "generated"
-        try:
-            drawing_id = save_contours_to_db(user_text, category, image_url, part1, part2, part3)
-            print(f"Drawing saved to DB with ID: {drawing_id}")
-        except Exception as db_error:
-            print(f"DB save error: {str(db_error)}")
-            return jsonify({"error": f"DB 저장 실패: {str(db_error)}"}), 500
-        
-        return jsonify({
-            "status": "success",
-            "prompt": prompt,
-            "message": "그림이 완성되었습니다!",
-            "imageUrl": image_url,
-            "part1Contours": part1,
-            "part2Contours": part2,
-            "part3Contours": part3
-        })
+    # 스트리밍 모드: 이미지 URL → part1 → part2 → part3 순서로 준비되는 대로
+    fmt = stream_format(request.args.get("stream"), request.headers.get("Accept"))
+    if fmt:
+        return stream_response(fmt, stream_request_events(user_text, request.host_url, data))
 
+    try:
+        result = run_request_pipeline(user_text, request.host_url, data)
+        with stage_timer("json_encode"):
+            return jsonify(result)
+    except DrawingSaveError as e:
+        return jsonify({"error": str(e)}), 500
     except Exception as e:
-        print(f"Image generation error: {str(e)}")
+        app.logger.exception("Image generation error: %s", e)
         return jsonify({"error": f"이미지 생성 실패: {str(e)}"}), 500
 
+@app.route("/api/jobs", methods=["POST"])
+def create_job():
+    data = request.get_json()
+    user_text = data.get("text", "").strip()
+    if not user_text:
+        return jsonify({"error": "내용이 비어있습니다."}), 400
+    return _submit_request_job(user_text, data)
 
-        # 2️⃣ 이미지 → 컨투어
-        #output_dir = f"drawing_bot/contour_txt/{safe_prompt}"
-        #process_contours_and_split3(image_path, output_dir)
-
-        #txt_files = [
-        #    os.path.join(output_dir, f) for f in os.listdir(output_dir) if f.endswith(".txt")
-        #]
-
-        # 3️⃣ txt → json 변환
-        #json_file = f"drawing_bot/json/{safe_prompt}.json"
-        #os.makedirs("drawing_bot/json", exist_ok=True)
-        #contours_txt_to_json(txt_files, json_file)
+@app.route("/api/jobs", methods=["GET"])
+def list_jobs():
+    return jsonify(job_stats())
 
-        # 4️⃣ EV3 실행
-        #subprocess.run(
-            ###)
+@app.route("/api/jobs/<job_id>")
+def job_status(job_id):
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
 
-        #return jsonify({
-        #    "status": "success",
-        #    "prompt": prompt,
-        #    "message" : "그림이 완성되었습니다!",
-        #    "imageUrl": image_url,
-        #    "jsonFile": os.path.basename(json_file)
-        #})
+@app.route("/api/jobs/<job_id>/wait")
+def job_wait(job_id):
+    # long-poll: 완료되면 200 + 결과, 시간 초과면 202 + 현재 상태
+    timeout = min(float(request.args.get("timeout", 30)), 120.0)
+    job = wait_job(job_id, timeout)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict()), (200 if job.done.is_set() else 202)
 
-    #except subprocess.CalledProcessError as e:
-    #    return jsonify({"error": f"EV3 실행 실패: {str(e)}"}), 500
-    #except Exception as e:
-    #    return jsonify({"error": f"처리 실패: {str(e)}"}), 500
 
 UPLOAD_FOLDER = "static/uploads"
 AUDIO_FOLDER = "static/audio"
@@ -248,12 +494,78 @@ os.makedirs(AUDIO_FOLDER, exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['AUDIO_FOLDER'] = AUDIO_FOLDER
 
+def upload_path(filename):
+    return os.path.join(app.config['UPLOAD_FOLDER'], filename)
+
 # 업로드된 파일 접근 라우트
 @app.route('/static/uploads/<filename>')
 def uploaded_file(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    # 같은 파일명으로 다시 올라올 수 있으므로 매번 ETag 로 재검증 (max-age=0)
+    return _send_static(app.config['UPLOAD_FOLDER'], filename, max_age=0)
+
+def tts_url(host_url, path):
+    """TTS 캐시 파일 경로 → /static/audio/tts/<key>.mp3 URL"""
+    return f"{host_url}static/audio/tts/{quote(os.path.basename(path))}"
+
+# 캐시된 TTS 음성: 파일 이름이 내용(text, voice, model) 해시라 바뀌지 않으므로 오래 캐시
+@app.route("/static/audio/tts/<filename>")
+def serve_tts(filename):
+    return _send_static(TTS_CACHE_DIR, filename, STATIC_MAX_AGE)
+
+# 문구 하나의 음성 URL (캐시에 있으면 provider 호출 없음)
+@app.route("/api/tts", methods=["GET", "POST"])
+def tts_audio():
+    data = request.get_json(silent=True) or {}
+    text = (data.get("text") or request.args.get("text") or "").strip()
+    if not text:
+        return jsonify({"error": "내용이 비어있습니다."}), 400
+    path = cached_tts(text)
+    cached = path is not None
+    if not cached:
+        try:
+            path = get_tts(text)
+        except Exception as e:
+            app.logger.error("TTS error: %s", e)
+            return jsonify({"error": "음성 생성 실패"}), 500
+    return jsonify({"audioUrl": tts_url(request.host_url, path), "cached": cached})
+
+def upload_events(image, host_url):
+    """
+    /api/upload 스트리밍 모드: 질문이 한 줄 완성되는 대로 내보내고 그 질문의 TTS 를 바로 시작,
+    음성 파일이 준비되는 순서대로 URL 을 내보낸다. 첫 음성까지 ≈ 질문 생성 첫 줄 + TTS 한 번.
+        {"type": "question", "index": 0, "text": "..."}
+        {"type": "audio", "index": 0, "audioUrl": "..."}   (실패 시 "error")
+        {"type": "done", "questions": [...], "audioFiles": [...]}
+    """
+    questions, audio_files, pending = [], {}, {}
+
+    def audio_event(future):
+        index = pending.pop(future)
+        try:
+            path = future.result()
+        except Exception as e:
+            app.logger.error("TTS error: %s", e)
+            return {"type": "audio", "index": index, "error": "음성 생성 실패"}
+        audio_files[index] = tts_url(host_url, path)
+        return {"type": "audio", "index": index, "audioUrl": audio_files[index]}
 
-# 이미지 업로드 API
+    try:
+        for index, question in enumerate(iter_questions_from_image(image)):
+            questions.append(question)
+            yield {"type": "question", "index": index, "text": question}
+            pending[submit_tts(question)] = index
+            # 다음 질문을 기다리는 사이에 끝난 음성부터
+            for future in [f for f in pending if f.done()]:
+                yield audio_event(future)
+        for future in as_completed(list(pending)):
+            yield audio_event(future)
+    except Exception as e:
+        app.logger.exception("Question generation error: %s", e)
+        yield {"type": "error", "error": "질문 생성 실패"}
+    yield {"type": "done", "questions": questions,
+           "audioFiles": [audio_files.get(i) for i in range(len(questions))]}
+
+# 이미지 업로드 API (스트리밍 요청이면 질문 + 음성을 준비되는 대로)
 @app.route("/api/upload", methods=["POST"])
 def upload_image():
     if "file" not in request.files:
@@ -264,32 +576,74 @@ def upload_image():
         return jsonify({"error": "No selected file"}), 400
 
     # 1️⃣ 이미지 저장
-    save_path = os.path.join(app.config['UPLOAD_FOLDER'], file.filename)
-    file.save(save_path)
+    data = file.read()
+    with open(upload_path(file.filename), "wb") as f:
+        f.write(data)
+
+    # 2️⃣ 질문 생성용으로 줄여서 (base64 페이로드 감소)
+    image = prepare_image(data)
+
+    fmt = stream_format(request.args.get("stream"), request.headers.get("Accept"))
+    if fmt:
+        # 3️⃣ + 4️⃣ 질문 생성과 TTS 를 겹쳐서 실행하며 스트리밍
+        return stream_response(fmt, upload_events(image, request.host_url))
 
     # 3️⃣ OpenAI로 질문 생성
-    questions = generate_questions_from_image(save_path)
+    questions = generate_questions_from_image(image)
 
     return jsonify({
         "questions": questions
     })
 
-    # 4️⃣ TTS 생성
-    #audio_paths = []
-    #for i, q in enumerate(questions):
-        #audio_file = os.path.join(app.config['AUDIO_FOLDER'], f"{file.filename}_q{i}.mp3")
-        #generate_tts(q, save_path=audio_file)
-        #audio_paths.append(audio_file)
-
-    #return jsonify({
-        #"questions": questions,
-        #"audioFiles": audio_paths
-    #})
+# 컨투어 캐시 모니터링 (hit/miss 카운터)
+@app.route("/api/cache/stats")
+def contour_cache_stats():
+    return jsonify(dict(cache_stats(), responses=payload_cache_stats(), prompts=prompt_cache_stats(), tts=tts_cache_stats()))
+
+# DB 연결 풀 모니터링 (사용 중/대기 횟수/대기 시간)
+@app.route("/api/db/pool")
+def db_pool_stats():
+    return jsonify(get_pool_stats())
+
+# 계측 (Prometheus text format). 꺼져 있으면 drawbot_metrics_enabled 0 만 나온다
+@app.route("/metrics")
+def prometheus_metrics():
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+# 계측 켜기/끄기: {"enabled": true|false, "reset": true}
+# 변경(POST)은 METRICS_TOKEN 이 설정돼 있으면 X-Metrics-Token 헤더가 일치할 때만, 없으면 localhost 에서만 허용
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+LOCAL_ADDRS = {"127.0.0.1", "::1"}
+
+def _metrics_control_allowed():
+    if METRICS_TOKEN:
+        return hmac.compare_digest(request.headers.get("X-Metrics-Token", ""), METRICS_TOKEN)
+    return request.remote_addr in LOCAL_ADDRS
+
+@app.route("/api/metrics", methods=["GET", "POST"])
+def metrics_control():
+    if request.method == "POST":
+        if not _metrics_control_allowed():
+            return jsonify({"error": "계측 설정을 바꿀 권한이 없습니다."}), 403
+        data = request.get_json(silent=True) or {}
+        if data.get("reset"):
+            reset_metrics()
+        if "enabled" in data:
+            set_metrics_enabled(data["enabled"])
+    return jsonify(metrics_snapshot())
 
 # 정적 파일 제공
 @app.route("/static/images/<path:filename>")
 def serve_image(filename):
-    return send_from_directory(IMAGE_FOLDER, filename)
+    return _send_static(IMAGE_FOLDER, filename, STATIC_MAX_AGE)
+
+# precompute_contours.py 로 생성한 파트별 컨투어 JSON (압축본 캐시 + ETag)
+@app.route("/drawing_bot/contour_json/<path:filename>")
+def serve_contour_json(filename):
+    path = safe_join(JSON_FOLDER, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    return _payload_response(get_file_payload(path), STATIC_MAX_AGE)
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,250 @@
+"""
+ASGI 실행 모드 (python serve.py).
+
+- /api/request, /api/upload 는 async 라우트: OpenAI 응답을 기다리는 동안 스레드를 잡지 않으므로
+  동시 요청 수가 스레드 수에 묶이지 않는다. OpenAI 클라이언트는 프로세스당 하나(연결 재사용).
+- 컨투어 추출(CPU)은 프로세스 풀(CONTOUR_PROCESSES, 기본 CPU 수 / WEB_WORKERS)에서 실행
+  → 이벤트 루프와 GIL 을 막지 않는다.
+- 그 밖의 라우트(정적 파일, 랜덤 그림, 플로터, 작업 큐, /metrics …)는 기존 Flask 앱을 그대로 마운트.
+
+선택 의존성: pip install -r requirements-asgi.txt
+"""
+import asyncio
+import contextlib
+import functools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from starlette.applications import Starlette
+    from starlette.middleware.cors import CORSMiddleware
+    from starlette.responses import JSONResponse, Response, StreamingResponse
+    from starlette.routing import Mount, Route, request_response
+except ImportError as e:
+    raise ImportError("ASGI 모드에는 starlette/uvicorn 이 필요합니다: pip install -r requirements-asgi.txt") from e
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError:
+    from starlette.middleware.wsgi import WSGIMiddleware
+
+import app as flask_app
+from services.contour_service import split3_json_job
+from services.image_question_service import aiter_questions_from_image, generate_questions_from_image_async, prepare_image
+from services.imagen_service import generate_image_bytes_async
+from services.job_service import QueueFullError, submit_job
+from services.metrics_service import inc, metrics_enabled, observe, stage_timer
+from services.prompt_cache import get_or_run_async
+from services.response_cache import compress_body
+from services.tts_service import get_tts_async
+
+WEB_WORKERS = int(os.environ.get("WEB_WORKERS", "1"))
+CONTOUR_PROCESSES = int(os.environ.get("CONTOUR_PROCESSES", "0")) or max(1, (os.cpu_count() or 1) // WEB_WORKERS)
+
+_pool = None
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        # 이벤트 루프/스레드가 있는 프로세스를 fork 하지 않도록 spawn
+        _pool = ProcessPoolExecutor(CONTOUR_PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def _json(request, obj, status_code=200):
+    """Flask 쪽 _compress_json 과 같은 규칙으로 압축한 JSON 응답"""
+    body = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    body, encoding = compress_body(body, request.headers.get("accept-encoding"))
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+def _stream(fmt, body):
+    """NDJSON/SSE 스트리밍 응답 (body: 이미 형식을 맞춘 문자열 이터레이터, 동기면 스레드에서 돈다)"""
+    return StreamingResponse(body, media_type=flask_app.STREAM_MIMETYPES[fmt],
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+def _timed(endpoint):
+    """Flask before/after_request 계측과 같은 이름으로 기록"""
+    def wrap(handler):
+        @functools.wraps(handler)
+        async def run(request):
+            if not metrics_enabled():
+                return await handler(request)
+            start = time.perf_counter()
+            response = await handler(request)
+            observe("http_request_seconds", time.perf_counter() - start, endpoint=endpoint, method=request.method)
+            inc("http_requests_total", endpoint=endpoint, method=request.method, status=response.status_code)
+            return response
+        return run
+    return wrap
+
+
+async def run_request_pipeline_async(user_text, host_url, options):
+    """app.run_request_pipeline 의 비동기 버전 (응답 형식, 요청 합치기/결과 캐시 동일)"""
+    return await get_or_run_async(flask_app.request_key(user_text, host_url, options),
+                                  _generate_drawing_async, user_text, host_url, options)
+
+
+async def _generate_drawing_async(user_text, host_url, options):
+    prompt = flask_app.request_prompt(user_text)
+    image_path = flask_app.generated_image_path(prompt)
+    with stage_timer("generate_image"):
+        image_bytes, image_saved = await generate_image_bytes_async(prompt, save_path=image_path)
+    image_url = f"{host_url}static/generated/{os.path.basename(image_path)}"
+
+    loop = asyncio.get_running_loop()
+    with stage_timer("contour_pool"):
+        parts, pipeline_stats, timings = await loop.run_in_executor(
+            _get_pool(), split3_json_job, image_bytes, flask_app.contour_options(options))
+    for stage, seconds in timings.items():
+        observe("stage_seconds", seconds, stage=stage)
+
+    await asyncio.to_thread(flask_app.save_generated_drawing, user_text, image_url, *parts)
+    # imageUrl 을 돌려주기 전에 파일이 다 써졌는지 확인
+    await asyncio.wrap_future(image_saved)
+    return flask_app.request_result(prompt, image_url, parts, pipeline_stats)
+
+
+@_timed("/api/request")
+async def handle_request(request):
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        return JSONResponse({"error": "잘못된 요청입니다."}, status_code=400)
+    user_text = str(data.get("text", "")).strip()
+    if not user_text:
+        return JSONResponse({"error": "내용이 비어있습니다."}, status_code=400)
+
+    host_url = str(request.base_url)
+    # 비동기 모드: Flask 와 같은 작업 큐 사용
+    if data.get("async") or request.query_params.get("async") == "1":
+        try:
+            job = submit_job("request", flask_app.run_request_pipeline, user_text, host_url, data)
+        except QueueFullError as e:
+            return JSONResponse({"error": str(e)}, status_code=503)
+        return JSONResponse({
+            "jobId": job.id,
+            "status": job.status,
+            "statusUrl": f"/api/jobs/{job.id}",
+            "waitUrl": f"/api/jobs/{job.id}/wait"
+        }, status_code=202)
+
+    # 스트리밍 모드: app.stream_request_events 를 스레드에서 돌리며 준비되는 대로 전송
+    fmt = flask_app.stream_format(request.query_params.get("stream"), request.headers.get("accept"))
+    if fmt:
+        return _stream(fmt, flask_app.stream_events(fmt, flask_app.stream_request_events(user_text, host_url, data)))
+
+    try:
+        result = await run_request_pipeline_async(user_text, host_url, data)
+    except flask_app.DrawingSaveError as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+    except Exception as e:
+        print(f"Image generation error: {str(e)}")
+        return JSONResponse({"error": "이미지 생성 실패"}, status_code=500)
+    with stage_timer("json_encode"):
+        return _json(request, result)
+
+
+def _write_file(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+async def upload_events_async(image, host_url):
+    """app.upload_events 의 비동기 버전 (이벤트 형식 동일): 질문마다 TTS 태스크를 바로 띄운다"""
+    events = asyncio.Queue()
+    questions, audio_files = [], {}
+
+    async def tts(index, question):
+        try:
+            path = await get_tts_async(question)
+        except Exception as e:
+            print(f"TTS error: {str(e)}")
+            await events.put({"type": "audio", "index": index, "error": "음성 생성 실패"})
+            return
+        audio_files[index] = flask_app.tts_url(host_url, path)
+        await events.put({"type": "audio", "index": index, "audioUrl": audio_files[index]})
+
+    async def produce():
+        tasks = []
+        try:
+            index = 0
+            async for question in aiter_questions_from_image(image):
+                questions.append(question)
+                await events.put({"type": "question", "index": index, "text": question})
+                tasks.append(asyncio.create_task(tts(index, question)))
+                index += 1
+        except Exception as e:
+            print(f"Question generation error: {str(e)}")
+            await events.put({"type": "error", "error": "질문 생성 실패"})
+        await asyncio.gather(*tasks)
+        await events.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (event := await events.get()) is not None:
+            yield event
+        yield {"type": "done", "questions": questions,
+               "audioFiles": [audio_files.get(i) for i in range(len(questions))]}
+    finally:
+        # 클라이언트가 끊으면 남은 질문/TTS 호출도 취소
+        producer.cancel()
+
+
+@_timed("/api/upload")
+async def upload_image(request):
+    form = await request.form()
+    file = form.get("file")
+    if file is None or isinstance(file, str):
+        return JSONResponse({"error": "No file part"}, status_code=400)
+    if not file.filename:
+        return JSONResponse({"error": "No selected file"}, status_code=400)
+
+    # 1️⃣ 이미지 저장 (질문 생성은 읽어둔 바이트로 바로 시작)
+    data = await file.read()
+    saved = asyncio.create_task(asyncio.to_thread(_write_file, flask_app.upload_path(file.filename), data))
+    # 2️⃣ 질문 생성용으로 줄여서 (base64 페이로드 감소)
+    image = await asyncio.to_thread(prepare_image, data)
+    await saved
+
+    fmt = flask_app.stream_format(request.query_params.get("stream"), request.headers.get("accept"))
+    if fmt:
+        events = upload_events_async(image, str(request.base_url))
+        return _stream(fmt, (flask_app.format_event(fmt, event) async for event in events))
+
+    # 3️⃣ OpenAI로 질문 생성
+    questions = await generate_questions_from_image_async(image)
+    return JSONResponse({"questions": questions})
+
+
+def _cors(handler):
+    """async 라우트에만 CORS (마운트된 Flask 라우트는 flask_cors 가 이미 처리)"""
+    return CORSMiddleware(request_response(handler), allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_app):
+    _get_pool()
+    yield
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+
+
+app = Starlette(
+    routes=[
+        Route("/api/request", _cors(handle_request)),
+        Route("/api/upload", _cors(upload_image)),
+        Mount("/", app=WSGIMiddleware(flask_app.app)),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+db_service 연결 풀 벤치마크: 호출마다 pymysql.connect 하던 방식 vs ConnectionPool.
+로컬 MySQL/MariaDB 가 필요하다 (.env 또는 DB_HOST/DB_USER/DB_PASSWORD/DB_NAME).
+/api/random 과 같은 호출(get_random_drawing_with_wrong_answers)을
+여러 스레드에서 동시에 실행해 처리량과 지연 시간 분포를 비교한다.
+
+사용법 (backend 폴더에서):
+    python benchmarks/bench_db_pool.py --threads 16 --requests 200 --category generated
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import pymysql
+
+from services import db_service
+
+
+@contextmanager
+def _connect_per_call():
+    """기존 방식 (비교 기준)"""
+    conn = pymysql.connect(**db_service.DB_CONFIG)
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _random_request(category):
+    db_service.get_random_drawing_with_wrong_answers(category, 3)
+
+
+def _run(label, threads, requests, category):
+    latencies = []
+    lock = threading.Lock()
+
+    def worker():
+        local = []
+        for _ in range(requests):
+            t0 = time.perf_counter()
+            _random_request(category)
+            local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+
+    t0 = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    p = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    print(f"{label:<16} {len(latencies)/elapsed:8.1f} req/s | p50 {p(0.5):6.2f} ms | p95 {p(0.95):6.2f} ms"
+          f" | p99 {p(0.99):6.2f} ms | mean {statistics.mean(latencies)*1000:6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB connection pool benchmark (needs a local MySQL/MariaDB)")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=100, help="스레드당 요청 수")
+    parser.add_argument("--category", default="generated")
+    args = parser.parse_args()
+
+    db_service.init_database()
+
+    pooled = db_service.get_db_connection
+    db_service.get_db_connection = _connect_per_call
+    _run("connect-per-call", args.threads, args.requests, args.category)
+
+    db_service.get_db_connection = pooled
+    _run(f"pool(size={db_service.DB_POOL_SIZE})", args.threads, args.requests, args.category)
+    print(db_service.get_pool_stats())
+
+
+if __name__ == "__main__":
+    main()
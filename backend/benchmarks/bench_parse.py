@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+'# contour N' txt 파서 벤치마크: 기존 줄 단위 re.match 루프 vs 블록 단위 벌크 파서.
+drawing_bot/contour_txt 전체(+ drawing_bot/contours.txt)에 대해
+services/json_service 와 drawing_bot/contour_processor 의 새 파서(일괄/스트리밍)가
+기존 결과와 완전히 같은지 확인하고 소요 시간을 비교한다.
+
+사용법 (backend 폴더에서):
+    python benchmarks/bench_parse.py --repeat 5
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "drawing_bot"))
+
+import contour_processor
+from services import json_service
+
+TXT_DIR = Path(BACKEND_DIR, "drawing_bot", "contour_txt")
+EXTRA_FILES = [Path(BACKEND_DIR, "drawing_bot", "contours.txt")]
+
+
+def legacy_parse_contours(raw_text, flags=0):
+    """기존 구현 (비교 기준, tests/test_parse.py 에서도 사용)"""
+    blocks = re.split(r'#\s*contour\s*\d+', raw_text, flags=flags)[1:]
+    contours = []
+    for blk in blocks:
+        pts = []
+        for line in blk.strip().splitlines():
+            m = re.match(r'\s*(\d+)\s*,\s*(\d+)\s*$', line)
+            if m:
+                pts.append((int(m.group(1)), int(m.group(2))))
+        if pts:
+            contours.append(pts)
+    return contours
+
+
+def _as_tuples(arrays):
+    return [list(map(tuple, a.tolist())) for a in arrays]
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark contour txt parsers.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=4096, help="스트리밍 검증용 chunk 크기 (작을수록 경계 케이스가 많음)")
+    args = parser.parse_args()
+
+    files = sorted(TXT_DIR.rglob("*.txt")) + [p for p in EXTRA_FILES if p.exists()]
+    totals = {"legacy": 0.0, "json_service": 0.0, "numpy arrays": 0.0, "contour_processor": 0.0}
+    mismatches = 0
+    points = 0
+
+    for path in files:
+        raw = path.read_text(encoding="utf-8")
+        expected = legacy_parse_contours(raw)
+        expected_ci = legacy_parse_contours(raw, flags=re.IGNORECASE)
+        points += sum(len(c) for c in expected)
+
+        checks = {
+            "json_service.parse_contours": json_service.parse_contours(raw) == expected,
+            "json_service.iter_contours": _as_tuples(json_service.iter_contours(path, args.chunk_size)) == expected,
+            "contour_processor.parse_contours": contour_processor.parse_contours(raw) == expected_ci,
+            "contour_processor.iter_contours": list(contour_processor.iter_contours(path, args.chunk_size)) == expected_ci,
+        }
+        for name, ok in checks.items():
+            if not ok:
+                mismatches += 1
+                print(f"MISMATCH {name}: {path}")
+
+        totals["legacy"] += _best_of(lambda: legacy_parse_contours(raw), args.repeat)
+        totals["json_service"] += _best_of(lambda: json_service.parse_contours(raw), args.repeat)
+        totals["numpy arrays"] += _best_of(lambda: json_service.parse_contours_np(raw), args.repeat)
+        totals["contour_processor"] += _best_of(lambda: contour_processor.parse_contours(raw), args.repeat)
+
+    print(f"{len(files)} files, {points} points, mismatches: {mismatches}")
+    for name, seconds in totals.items():
+        print(f"  {name:<18} {seconds * 1000:8.2f} ms  ({totals['legacy'] / seconds:5.1f}x)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+static/images 전체에 대해 EV3 예상 드로잉 시간(plot_simulator)과 시뮬레이터 자체 속도를 측정.
+경로 최적화 전/후 예상 시간을 함께 보여준다.
+
+사용법 (backend 폴더에서):
+    python benchmarks/bench_plot_time.py
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from services.contour_service import MAX_X, MAX_Y, load_parts_int, optimize_parts_pen_path
+from services.plot_simulator import simulate_plot
+
+IMAGE_DIR = os.path.join(BACKEND_DIR, "static", "images")
+
+
+def _all_segments(parts):
+    return [seg for i in range(3) for seg in parts.part_segments(i)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EV3 plot time estimates over the bundled image library")
+    parser.add_argument("--images", default=IMAGE_DIR, help="이미지 루트 폴더 (default: static/images)")
+    args = parser.parse_args()
+
+    total_before = total_after = total_sim = 0.0
+    total_moves = 0
+    print(f"{'image':<36} {'moves':>7} {'before':>9} {'after':>9} {'sim ms':>7}")
+    for category in sorted(os.listdir(args.images)):
+        cat_dir = os.path.join(args.images, category)
+        if not os.path.isdir(cat_dir):
+            continue
+        for name in sorted(os.listdir(cat_dir)):
+            try:
+                parts = load_parts_int(os.path.join(cat_dir, name)).rescale(MAX_X, MAX_Y)
+            except (FileNotFoundError, ValueError):
+                continue
+            before = simulate_plot(_all_segments(parts), per_contour=False)
+            optimized, _ = optimize_parts_pen_path(parts)
+            t0 = time.perf_counter()
+            after = simulate_plot(_all_segments(optimized))
+            sim = time.perf_counter() - t0
+
+            total_before += before["totalSeconds"]
+            total_after += after["totalSeconds"]
+            total_sim += sim
+            total_moves += after["moveCount"]
+            print(f"{category + '/' + name:<36} {after['moveCount']:>7} {before['totalSeconds']:>8.1f}s"
+                  f" {after['totalSeconds']:>8.1f}s {sim*1000:>7.2f}")
+
+    print(f"\n총 예상 시간: 최적화 전 {total_before/60:.1f}분 → 후 {total_after/60:.1f}분"
+          f" | 시뮬레이션 {total_moves} moves in {total_sim*1000:.1f} ms"
+          f" ({total_moves/max(total_sim, 1e-9)/1e6:.2f} M moves/s)")
+
+
+if __name__ == "__main__":
+    main()
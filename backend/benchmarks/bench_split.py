@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+_split_by_three_vertical_bands 벤치마크: 기존 점 단위 파이썬 루프 vs NumPy 마스크/np.diff 버전.
+static/images 전체에 대해 결과가 완전히 같은지 확인하고 소요 시간을 비교한다.
+
+사용법 (backend 폴더에서):
+    python benchmarks/bench_split.py --repeat 5
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from services.contour_service import (
+    MAX_X, MAX_Y,
+    _apply_transform_once,
+    _compute_fit_params,
+    _content_bbox_in_canvas,
+    _rotate_points_90_ccw,
+    _split_by_three_vertical_bands,
+)
+
+IMAGE_DIR = os.path.join(BACKEND_DIR, "static", "images")
+
+
+def legacy_split_by_three_vertical_bands(transformed_contours, content_min_y, content_max_y):
+    """기존 구현 (비교 기준, tests/test_split.py 에서도 사용)"""
+    h = max(1e-9, content_max_y - content_min_y)
+    step = h / 3.0
+    bands = [
+        (content_min_y, content_min_y + step),
+        (content_min_y + step, content_min_y + 2*step),
+        (content_min_y + 2*step, content_max_y + 1e-9)
+    ]
+    parts = [[], [], []]
+    for cnt in transformed_contours:
+        pts = cnt.reshape(-1, 2).astype(np.float64)
+        if pts.shape[0] == 0:
+            continue
+        for band_idx, (y0, y1) in enumerate(bands):
+            seg = []
+            for i in range(pts.shape[0]):
+                y = pts[i,1]
+                in_band = (y0 <= y < y1) if band_idx < 2 else (y0 <= y <= y1)
+                if in_band:
+                    seg.append( (float(pts[i,0]), float(pts[i,1])) )
+                else:
+                    if len(seg) > 0:
+                        parts[band_idx].append(seg)
+                        seg = []
+            if len(seg) > 0:
+                parts[band_idx].append(seg)
+    return parts
+
+
+def prepare_transformed(image_path, simplification_ratio):
+    image = cv2.imread(image_path)
+    if image is None:
+        return None
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    _, binary = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    contours, _ = cv2.findContours(binary, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+    simplified = []
+    for c in contours:
+        approx = cv2.approxPolyDP(c, simplification_ratio * cv2.arcLength(c, True), True)
+        if approx is not None and approx.shape[0] > 0:
+            simplified.append(approx)
+    if not simplified:
+        return None
+    rotated = _rotate_points_90_ccw(simplified)
+    S_n, tx_n, ty_n = _compute_fit_params(simplified, MAX_X, MAX_Y, 0, True)
+    S_r, tx_r, ty_r = _compute_fit_params(rotated, MAX_X, MAX_Y, 0, True)
+    if S_r > S_n:
+        return _apply_transform_once(rotated, S_r, tx_r, ty_r)
+    return _apply_transform_once(simplified, S_n, tx_n, ty_n)
+
+
+def _best_time(fn, args, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="band split benchmark (legacy loop vs vectorized)")
+    parser.add_argument("--images", default=IMAGE_DIR, help="이미지 루트 폴더 (default: static/images)")
+    parser.add_argument("--repeat", type=int, default=3, help="이미지당 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--ratio", type=float, default=0.0001, help="simplification_ratio")
+    args = parser.parse_args()
+
+    total_old = total_new = 0.0
+    total_points = 0
+    print(f"{'image':<40} {'points':>8} {'legacy ms':>10} {'numpy ms':>10} {'speedup':>8}")
+    for category in sorted(os.listdir(args.images)):
+        cat_dir = os.path.join(args.images, category)
+        if not os.path.isdir(cat_dir):
+            continue
+        for name in sorted(os.listdir(cat_dir)):
+            transformed = prepare_transformed(os.path.join(cat_dir, name), args.ratio)
+            if transformed is None:
+                continue
+            _, miny, _, maxy = _content_bbox_in_canvas(transformed)
+            t_old, parts_old = _best_time(legacy_split_by_three_vertical_bands, (transformed, miny, maxy), args.repeat)
+            t_new, parts_new = _best_time(_split_by_three_vertical_bands, (transformed, miny, maxy), args.repeat)
+            if parts_old != parts_new:
+                raise SystemExit(f"❌ 결과 불일치: {category}/{name}")
+            n = sum(c.shape[0] for c in transformed)
+            total_old += t_old
+            total_new += t_new
+            total_points += n
+            print(f"{category + '/' + name:<40} {n:>8} {t_old*1000:>10.2f} {t_new*1000:>10.2f} {t_old/max(t_new, 1e-12):>7.1f}x")
+
+    print(f"\n총 {total_points} points | legacy {total_old*1000:.1f} ms | numpy {total_new*1000:.1f} ms"
+          f" | speedup {total_old/max(total_new, 1e-12):.1f}x (결과 동일)")
+
+
+if __name__ == "__main__":
+    main()
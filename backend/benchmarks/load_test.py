@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+/api/request 부하 테스트 (의존성 없음: asyncio 소켓으로 HTTP/1.1 요청).
+
+OpenAI 비용/속도 제한 없이 서버 쪽 동시 처리량만 보려면 mock provider 로 서버를 띄운다:
+    IMAGE_PROVIDER=mock MOCK_PROVIDER_LATENCY=2 python serve.py --workers 2
+    python benchmarks/load_test.py --concurrency 32 --requests 128
+
+요청마다 다른 text 를 보내 컨투어 캐시가 맞지 않게 한다 (--same-text 로 끌 수 있음).
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from urllib.parse import urlsplit
+
+
+async def _post(host, port, path, payload):
+    body = json.dumps(payload).encode("utf-8")
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f"POST {path} HTTP/1.1\r\nHost: {host}:{port}\r\nContent-Type: application/json\r\n"
+            f"Accept-Encoding: gzip\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("ascii")
+            + body)
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()   # Connection: close → 끝까지 읽으면 응답 완료
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+def _quantile(values, q):
+    return values[max(0, math.ceil(q * len(values)) - 1)] if values else 0.0
+
+
+async def run(url, concurrency, total, same_text):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+    latencies, statuses = [], {}
+
+    async def worker():
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            text = "load test" if same_text else f"load test {i}"
+            start = time.perf_counter()
+            try:
+                status = await _post(host, port, parts.path or "/api/request", {"text": text})
+            except OSError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{total} requests, concurrency {concurrency}: {elapsed:.2f} s ({total / elapsed:.2f} req/s)")
+    print("  status " + ", ".join(f"{k}: {v}" for k, v in sorted(statuses.items(), key=str)))
+    print("  latency " + ", ".join(f"p{int(q * 100)} {_quantile(latencies, q) * 1000:.0f} ms"
+                                   for q in (0.5, 0.95, 0.99)))
+    return 0 if set(statuses) == {200} else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /api/request.")
+    parser.add_argument("--url", default="http://127.0.0.1:5001/api/request")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--same-text", action="store_true", help="모든 요청에 같은 text (캐시 효과 포함)")
+    args = parser.parse_args()
+    return asyncio.run(run(args.url, args.concurrency, args.requests, args.same_text))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+컨투어 파이프라인 벤치마크 묶음 (오프라인: 화면/DB/OpenAI 불필요).
+
+- contour_service: static/images 의 모든 이미지에 대해 파이프라인 단계별 시간
+  (decode, threshold, contours, fit, split3, dedupe, round_clip, rescale, JSON/BSKC 직렬화)
+- json_service:    drawing_bot/contour_txt 의 모든 txt 에 대해 파싱, 스케일, JSON/BSKC 인코딩/디코딩
+
+구간마다 별도 프로세스에서 돌려 처리량(items/s, points/s), 그 구간의 최대 RSS, tracemalloc 으로 추적한
+최대 메모리를 보고하고 결과를 JSON 으로 저장한다. 이전 결과와 단계별로 비교해 느려진 곳을 표시한다.
+
+사용법 (backend 폴더에서):
+    python benchmarks/run_benchmarks.py --repeat 3
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<이전>.json --fail-on-regression
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import cv2
+import numpy as np
+
+from services.contour_service import RESCALE, Stage, extract_pipeline
+from services.json_service import decode_contours_bin, encode_contours_bin, parse_contours_np, scale_contours
+
+IMAGE_DIR = os.path.join(BACKEND_DIR, "static", "images")
+TXT_DIR = os.path.join(BACKEND_DIR, "drawing_bot", "contour_txt")
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+IMAGE_EXTS = (".png", ".jpg", ".jpeg")
+
+
+def _serialize_json(parts, ctx):
+    ctx["jsonBytes"] = len(json.dumps(parts.to_lists()))
+    return parts
+
+
+def _serialize_bin(parts, ctx):
+    ctx["binBytes"] = sum(len(encode_contours_bin(parts.part_segments(i), scale=100))
+                          for i in range(parts.part_count))
+    return parts
+
+
+# API 응답/DB 저장과 같은 직렬화 (파일로 쓰지 않음)
+SERIALIZE_JSON = Stage("serialize_json", _serialize_json, "parts", "parts")
+SERIALIZE_BIN = Stage("serialize_bin", _serialize_bin, "parts", "parts")
+
+
+def _peak_rss_kb():
+    # 프로세스 전체 최대값(줄지 않음) → 구간마다 새 프로세스에서 읽어야 구간별 값이 된다
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Linux: KB
+
+
+def _list_files(root, exts):
+    return sorted(p for p in glob.glob(os.path.join(root, "**", "*"), recursive=True)
+                  if p.lower().endswith(exts))
+
+
+# ----- 구간별 1회 실행: (단계별 초, 처리 점 수) -----
+def _run_contour_service(images):
+    pipeline = extract_pipeline(cache=False).then(RESCALE, SERIALIZE_JSON, SERIALIZE_BIN)
+    timings = {}
+    points = 0
+    for path in images:
+        ctx = {"timings": timings}
+        parts = pipeline.run(path, ctx)
+        points += parts.point_count
+    return timings, points
+
+
+def _run_json_service(txt_files):
+    timings = dict.fromkeys(("read", "parse", "scale", "serialize_json", "encode_bin", "decode_bin"), 0.0)
+    points = 0
+
+    def lap(name, start):
+        now = time.perf_counter()
+        timings[name] += now - start
+        return now
+
+    for path in txt_files:
+        t = time.perf_counter()
+        with open(path, encoding="utf-8") as f:
+            raw = f.read()
+        t = lap("read", t)
+        contours = parse_contours_np(raw)
+        t = lap("parse", t)
+        scaled = scale_contours([c.tolist() for c in contours]) if contours else []
+        t = lap("scale", t)
+        json.dumps(scaled)
+        t = lap("serialize_json", t)
+        data = encode_contours_bin(contours)
+        t = lap("encode_bin", t)
+        decode_contours_bin(data)
+        lap("decode_bin", t)
+        points += sum(c.shape[0] for c in contours)
+    return timings, points
+
+
+SECTIONS = {
+    "contour_service": _run_contour_service,
+    "json_service": _run_json_service,
+}
+
+
+def _measure(name, run, items, repeat):
+    """repeat 번 돌려 단계별 최소 시간, 그 다음 tracemalloc 켜고 한 번 더 (시간 측정과 분리)"""
+    rss_before = _peak_rss_kb()
+    best = None
+    points = 0
+    for _ in range(repeat):
+        timings, points = run(items)
+        best = timings if best is None else {k: min(v, timings.get(k, v)) for k, v in best.items()}
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    run(items)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # CachedStage 가 없으므로 단계 시간은 겹치지 않는다
+    seconds = sum(best.values())
+    result = {
+        "items": len(items),
+        "points": points,
+        "seconds": round(seconds, 6),
+        "itemsPerSecond": round(len(items) / seconds, 2) if seconds else None,
+        "pointsPerSecond": round(points / seconds, 1) if seconds else None,
+        "stages": {k: round(v, 6) for k, v in best.items()},
+        "rssBeforeKB": rss_before,
+        "peakRssKB": _peak_rss_kb(),
+        "tracedPeakBytes": traced_peak,
+    }
+    print(f"\n[{name}] {len(items)} items, {points} points, {seconds * 1000:.1f} ms "
+          f"({result['itemsPerSecond']} items/s, {result['pointsPerSecond']} points/s)")
+    print(f"  peak RSS {result['peakRssKB'] / 1024:.1f} MB (시작 {rss_before / 1024:.1f} MB), "
+          f"tracemalloc peak {traced_peak / 1024 / 1024:.1f} MB")
+    for stage, sec in result["stages"].items():
+        share = sec / seconds * 100 if seconds else 0.0
+        print(f"  {stage:<16} {sec * 1000:9.2f} ms  {share:5.1f}%")
+    return result
+
+
+def _run_section(name, root, repeat):
+    """구간 하나를 새 파이썬 프로세스에서 실행 (최대 RSS 가 앞 구간의 영향을 받지 않도록)"""
+    fd, output = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--section", name, "--root", root,
+                        "--repeat", str(repeat), "--output", output], check=True)
+        with open(output, encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        os.remove(output)
+
+
+def _section_main(args):
+    """--section 모드 (자식 프로세스): 결과를 --output 에 JSON 으로 쓴다"""
+    exts = IMAGE_EXTS if args.section == "contour_service" else (".txt",)
+    result = _measure(args.section, SECTIONS[args.section], _list_files(args.root, exts), args.repeat)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+    return 0
+
+
+def _environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def _latest_result(exclude):
+    files = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")), key=os.path.getmtime)
+    files = [f for f in files if os.path.abspath(f) != os.path.abspath(exclude)]
+    return files[-1] if files else None
+
+
+def compare(previous, current, threshold, min_delta):
+    """단계별 시간 비교. return: threshold(비율) 와 min_delta(초) 를 모두 넘게 느려진 (구간, 단계) 목록"""
+    regressions = []
+    print(f"\n비교 기준: {previous['environment'].get('commit')} ({previous['environment'].get('timestamp')})")
+    for section, cur in current["sections"].items():
+        prev = previous["sections"].get(section)
+        if prev is None:
+            continue
+        rows = [("total", prev["seconds"], cur["seconds"])]
+        rows += [(k, prev["stages"][k], v) for k, v in cur["stages"].items() if k in prev["stages"]]
+        print(f"[{section}]")
+        for stage, before, after in rows:
+            ratio = after / before if before else float("inf")
+            mark = ""
+            if before and ratio > 1 + threshold and after - before > min_delta:
+                mark = "  ← 느려짐"
+                regressions.append((section, stage))
+            print(f"  {stage:<16} {before * 1000:9.2f} → {after * 1000:9.2f} ms  ({ratio:5.2f}x){mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the contour pipeline over the bundled corpus.")
+    parser.add_argument("--images", default=IMAGE_DIR, help="이미지 루트 폴더 (default: static/images)")
+    parser.add_argument("--txt", default=TXT_DIR, help="컨투어 txt 루트 폴더 (default: drawing_bot/contour_txt)")
+    parser.add_argument("--repeat", type=int, default=3, help="구간마다 반복 횟수 (단계별 최소값 사용)")
+    parser.add_argument("--output", help="결과 JSON 경로 (default: benchmarks/results/<시각>_<commit>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON (default: results 폴더의 가장 최근 파일)")
+    parser.add_argument("--no-compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.10, help="느려짐 판정 비율 (default: 0.10 = 10%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="이보다 작은 차이는 잡음으로 무시 (ms)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="느려진 단계가 있으면 exit 1")
+    parser.add_argument("--section", choices=sorted(SECTIONS), help=argparse.SUPPRESS)
+    parser.add_argument("--root", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)  # 실행마다 결과가 흔들리지 않도록
+    if args.section:
+        return _section_main(args)
+    images = _list_files(args.images, IMAGE_EXTS)
+    txt_files = _list_files(args.txt, (".txt",))
+    if not images and not txt_files:
+        print("벤치마크할 파일이 없습니다.")
+        return 1
+
+    env = _environment()
+    result = {"environment": env, "repeat": args.repeat, "sections": {}}
+    if images:
+        result["sections"]["contour_service"] = _run_section("contour_service", args.images, args.repeat)
+    if txt_files:
+        result["sections"]["json_service"] = _run_section("json_service", args.txt, args.repeat)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{env['timestamp'].replace(':', '')}_{env['commit'] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+    previous_path = None if args.no_compare else (args.compare or _latest_result(output))
+    if previous_path:
+        with open(previous_path, encoding="utf-8") as f:
+            previous = json.load(f)
+        regressions = compare(previous, result, args.threshold, args.min_delta_ms / 1000)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
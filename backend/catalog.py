@@ -0,0 +1,82 @@
+"""
+그림 카탈로그: 파일명 → 한글 이름, 화면 카테고리 → 이미지 폴더, 앱이 읽어주는 고정 문구.
+app.py 와 warmup_tts.py 가 같이 사용한다 (DB/Flask 없이 import 가능).
+"""
+
+# 파일명 → 한글 이름 매핑
+NAME_MAP = {
+    "apple": "사과",
+    "grape": "포도",
+    "banana": "바나나",
+    "strawberry": "딸기",
+    "watermelon" : "수박",
+    "pear" : "배",
+    "cosmos":"코스모스",
+    "jangmi" : "장미",
+    "haebalagi" : "해바라기",
+    "gookhwa" : "국화",
+    "baekhap" :"백합",
+    "tulip" : "튤립",
+    "jindallae" :"진달래",
+    "bicycle" : "자전거",
+    "airplane" : "비행기",
+    "bus" : "버스",
+    "motorcycle" : "오토바이",
+    "train" : "기차",
+    "yulgigoo" : "열기구",
+    "ship" : "배",
+    "bag" : "가방",
+    "clock" : "시계",
+    "cup" : "컵",
+    "glass" : "안경",
+    "hat" : "모자",
+    "shoes" : "신발",
+    "umbrella" : "우산",
+    "cat_drawing" : "고양이",
+    "dog_drawing" : "강아지",
+    "fox_drawing" : "여우",
+    "giraffe_drawing" : "기린",
+    "hippo_drawing" : "하마",
+    "owl_drawing" : "부엉이",
+    "penguin" : "펭귄",
+    "1_drawing" : "송학(솔)",
+    "2_drawing" : "매조",
+    "3_drawing" : "벚꽃(사쿠라)",
+    "4_draiwng" :"등나무(흑싸리)",
+    "5_drawing" : "제비붓꽃(난초)",
+    "6_drawing" : "모란(목단)",
+    "7_drawing" : "싸리",
+    "8_drawing" : "억새",
+    "9_drawing" : "국화",
+    "10_drawing" : "단풍",
+    "11_drawing" : "오동",
+    "12_drawing" : "버드나무"
+}
+
+CATEGORY_MAP = {
+    "동물": "animals",
+    "과일": "fruits",
+    "탈것": "vehicles",
+    "꽃": "flowers",
+    "화투" : "hwatu",
+    "사물" : "objects"
+}
+
+# 앱 화면에서 반복해서 읽어주는 문구 (warmup_tts.py 가 미리 합성)
+STOCK_PHRASES = [
+    "무엇을 그려드릴까요?",
+    "무엇을 해볼까요?",
+    "무엇을 그리고 있을까요?",
+    "EV3 로봇이 그림을 그리고 있어요!",
+    "그림이 완성되었습니다!",
+    "정답입니다!",
+    "다시 도전하시겠습니까?",
+]
+ANSWER_TEMPLATE = '그림 완성! 정답은 "{name}"'
+
+
+def tts_phrases():
+    """미리 합성할 문구 전체 (중복 제외, 순서 유지): 고정 문구, 카테고리, 그림 이름, 정답 안내"""
+    names = list(NAME_MAP.values())
+    phrases = STOCK_PHRASES + list(CATEGORY_MAP) + names + [ANSWER_TEMPLATE.format(name=n) for n in names]
+    return list(dict.fromkeys(phrases))
@@ -1,29 +1,33 @@
 #!/usr/bin/env python3
+import itertools
 import re
 import json
+import sys
 from pathlib import Path
 import argparse
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))   # backend
+from services import json_service
+
 # ======================
-# 입력 파싱
+# 입력 파싱 (services/json_service 의 파서를 그대로 사용, 헤더만 대소문자 무시)
 # ======================
+HEADER_RE = re.compile(r'#\s*contour\s*\d+', flags=re.IGNORECASE)
+
 def parse_contours(raw_text: str):
     """
     '# contour N' 으로 구분된 블록에서
     'x, y' 형식의 좌표들을 추출해 contour 리스트를 만든다.
     return: List[List[Tuple[int,int]]]
     """
-    blocks = re.split(r'#\s*contour\s*\d+', raw_text, flags=re.IGNORECASE)[1:]
-    contours = []
-    for blk in blocks:
-        pts = []
-        for line in blk.strip().splitlines():
-            m = re.match(r'\s*(\d+)\s*,\s*(\d+)\s*$', line)
-            if m:
-                pts.append((int(m.group(1)), int(m.group(2))))
-        if pts:
-            contours.append(pts)
-    return contours
+    return json_service.parse_contours(raw_text, header_re=HEADER_RE)
+
+def iter_contours(path: Path, chunk_size: int = 1 << 20):
+    """
+    큰 파일용: chunk 단위로 읽으면서 contour 를 하나씩 yield (결과는 parse_contours 와 동일)
+    """
+    for pts in json_service.iter_contours(path, chunk_size, header_re=HEADER_RE):
+        yield list(map(tuple, pts.tolist()))
 
 # ======================
 # 메인
@@ -39,18 +43,20 @@ def main():
     infile = Path(args.infile)
     outfile = Path(args.outfile)
 
-    raw = infile.read_text(encoding="utf-8")
-    contours = parse_contours(raw)
-    if not contours:
+    # contour 하나당 json.dumps → 한 줄씩 기록 (입력 파일을 통째로 메모리에 올리지 않음)
+    contours = iter_contours(infile)
+    first = next(contours, None)
+    if first is None:
         raise SystemExit("❌ contours를 찾지 못했습니다. 입력 파일 형식을 확인하세요.")
 
-    # contour 하나당 json.dumps → 한 줄씩 기록
+    count = 0
     with outfile.open("w", encoding="utf-8") as f:
-        for contour in contours:
+        for contour in itertools.chain([first], contours):
             f.write(json.dumps(contour, ensure_ascii=False))
             f.write("\n")
+            count += 1
 
-    print(f"✔ {outfile.name} 생성 완료: {len(contours)} contours (한 줄에 1 contour씩)")
+    print(f"✔ {outfile.name} 생성 완료: {count} contours (한 줄에 1 contour씩)")
     print("   (스케일링 없음, 입력 좌표 그대로 사용)")
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ from pybricks.ev3devices import Motor, TouchSensor
 from pybricks.parameters import Port, Stop
 from pybricks.tools     import wait
 import math
+import sys
 import ujson
 
 # ===== 하드웨어 초기화 =====
@@ -57,6 +58,22 @@ def move_to(axis_x, axis_y, speed=150, tol=2):
     while abs(x_motor.angle() - mx) > tol or abs(y_motor1.angle() - my) > tol:
         wait(10)
 
+def draw_path(path):
+    pen_up()
+    move_to(*path[0])
+    pen_down()
+    for x, y in path[1:]:
+        move_to(x, y)
+    pen_up()
+
+def ack(idx):
+    # 서버(services/plotter_service)와의 약속: 컨투어 하나를 다 그릴 때마다 "ACK <번호>" 한 줄
+    print("ACK", idx)
+    try:
+        sys.stdout.flush()
+    except AttributeError:
+        pass
+
 def initial_setup(speed=200):
     # X축 홈 찾기
     x_motor.run(-speed)
@@ -83,24 +100,26 @@ if __name__ == "__main__":
     y_motor2.reset_angle(0)
     z_motor.reset_angle(PEN_UP_ANGLE)
 
-    drawing_paths = []
-
-    with open("drawing_paths_stream.json", "r") as f:
-        for idx, line in enumerate(f):
-            line = line.strip()
-            if not line:
-                continue
-
-            # 경로 파싱
-            path = ujson.loads(line)
-
-            # contour 그리기
-            pen_up()
-            move_to(*path[0])
-            pen_down()
-            for x, y in path[1:]:
-                move_to(x, y)
-            pen_up()
-
-
+    # main.py -  : stdin 으로 한 줄(JSON 컨투어)씩 받아 그리고 ACK (services/plotter_service 의 장기 세션)
+    # main.py      : drawing_paths_stream.json 파일을 처음부터 끝까지 그림
+    stream = len(sys.argv) > 1 and sys.argv[1] == "-"
+    source = sys.stdin if stream else open("drawing_paths_stream.json", "r")
+
+    idx = 0
+    while True:
+        line = source.readline()
+        if not line:
+            break
+        line = line.strip()
+        if not line:
+            continue
+
+        # 경로 파싱 후 contour 그리기
+        draw_path(ujson.loads(line))
+        if stream:
+            ack(idx)
+        idx += 1
+
+    if not stream:
+        source.close()
     ev3.speaker.beep()
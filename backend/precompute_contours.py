@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+static/images/<category>/* 전체를 한 번에 컨투어 JSON으로 변환하는 배치 스크립트 (화면 출력 없음).
+/api/random/<category> 가 가리키는 drawing_bot/contour_json/<category>/<image>_partN.json 을 만든다.
+
+사용법 (backend 폴더에서):
+    python precompute_contours.py                 # 전체 카테고리, CPU 코어 수만큼 병렬
+    python precompute_contours.py -c animals -j 4
+    python precompute_contours.py --force         # 최신 결과가 있어도 다시 생성
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+
+from services.contour_service import process_contours_and_split3_json
+from services.disk_cache import atomic_write
+
+IMAGE_DIR = os.path.join(BACKEND_DIR, "static", "images")
+JSON_DIR = os.path.join(BACKEND_DIR, "drawing_bot", "contour_json")
+IMAGE_EXTS = (".png", ".jpg", ".jpeg")
+
+
+def output_paths(out_dir, category, image_file):
+    return [os.path.join(out_dir, category, f"{image_file}_part{i}.json") for i in (1, 2, 3)]
+
+
+def is_up_to_date(image_path, outputs):
+    src_mtime = os.path.getmtime(image_path)
+    return all(os.path.exists(p) and os.path.getmtime(p) > src_mtime for p in outputs)
+
+
+def process_one(image_path, outputs, simplification_ratio):
+    """워커 프로세스에서 실행: 컨투어 생성 후 파트별 JSON 저장"""
+    t0 = time.perf_counter()
+    parts = process_contours_and_split3_json(image_path, simplification_ratio)
+    elapsed = time.perf_counter() - t0
+
+    for path, part in zip(outputs, parts):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, json.dumps(part, ensure_ascii=False).encode("utf-8"))
+
+    return {
+        "seconds": elapsed,
+        "contours": [len(p) for p in parts],
+        "points": [sum(len(seg) for seg in p) for p in parts],
+    }
+
+
+def collect_jobs(image_dir, out_dir, categories):
+    jobs = []
+    for category in sorted(os.listdir(image_dir)):
+        cat_dir = os.path.join(image_dir, category)
+        if not os.path.isdir(cat_dir) or (categories and category not in categories):
+            continue
+        for image_file in sorted(os.listdir(cat_dir)):
+            if image_file.lower().endswith(IMAGE_EXTS):
+                image_path = os.path.join(cat_dir, image_file)
+                jobs.append((category, image_file, image_path, output_paths(out_dir, category, image_file)))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute part1/2/3 contour JSON for static/images.")
+    parser.add_argument("-c", "--category", action="append", default=[],
+                        help="처리할 카테고리 폴더 (여러 번 지정 가능, default: 전체)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="워커 프로세스 수 (default: CPU 코어 수)")
+    parser.add_argument("--images", default=IMAGE_DIR, help="입력 이미지 루트 (default: static/images)")
+    parser.add_argument("--out", default=JSON_DIR, help="출력 루트 (default: drawing_bot/contour_json)")
+    parser.add_argument("--ratio", type=float, default=0.0001, help="simplification_ratio")
+    parser.add_argument("--force", action="store_true", help="최신 결과가 있어도 다시 생성")
+    args = parser.parse_args()
+
+    jobs = collect_jobs(args.images, args.out, set(args.category))
+    todo = [job for job in jobs if args.force or not is_up_to_date(job[2], job[3])]
+    print(f"{len(jobs)} images, {len(jobs) - len(todo)} up to date, {len(todo)} to process ({args.jobs} workers)")
+
+    t0 = time.perf_counter()
+    failed = 0
+    total_points = 0
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {
+            pool.submit(process_one, image_path, outputs, args.ratio): (category, image_file)
+            for category, image_file, image_path, outputs in todo
+        }
+        for fut in as_completed(futures):
+            category, image_file = futures[fut]
+            try:
+                r = fut.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ {category}/{image_file}: {e}")
+                continue
+            total_points += sum(r["points"])
+            print(f"✔ {category}/{image_file:<28} {r['seconds']*1000:8.1f} ms | "
+                  f"contours {'/'.join(map(str, r['contours']))} | points {'/'.join(map(str, r['points']))}")
+
+    elapsed = time.perf_counter() - t0
+    print(f"done: {len(todo) - failed} ok, {failed} failed, {total_points} points in {elapsed:.2f} s")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
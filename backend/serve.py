@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+운영용 실행기 (개발용 python app.py 는 debug 서버 그대로).
+
+    python serve.py --workers 4          # ASGI (uvicorn), 워커 프로세스 4개 (기본: WEB_WORKERS 또는 1)
+    python serve.py --wsgi               # starlette/uvicorn 없이 Flask 스레드 서버 (debug 끔)
+    IMAGE_PROVIDER=mock python serve.py  # 부하 테스트: OpenAI 대신 MOCK_PROVIDER_LATENCY 초 기다린 뒤 stub 그림
+
+컨투어 프로세스 풀 크기는 CONTOUR_PROCESSES (기본: CPU 수 / 워커 수).
+"""
+import argparse
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the drawing bot backend.")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", "5001")))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_WORKERS", "1")),
+                        help="uvicorn 워커 프로세스 수 (default: WEB_WORKERS 또는 1)")
+    parser.add_argument("--wsgi", action="store_true", help="ASGI 대신 Flask 스레드 서버로 실행")
+    parser.add_argument("--log-level", default=os.environ.get("LOG_LEVEL", "info"))
+    args = parser.parse_args()
+
+    # static/... 상대 경로를 쓰므로 backend 폴더에서 실행
+    os.chdir(BACKEND_DIR)
+    sys.path.insert(0, BACKEND_DIR)
+    # 워커 프로세스(asgi.py)가 프로세스 풀 크기를 나눌 때 사용
+    os.environ["WEB_WORKERS"] = str(args.workers)
+
+    if args.wsgi:
+        from app import app
+        app.run(host=args.host, port=args.port, threaded=True, debug=False, use_reloader=False)
+        return 0
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("uvicorn 이 없습니다: pip install -r requirements-asgi.txt (또는 --wsgi 로 실행)")
+        return 1
+    uvicorn.run("asgi:app", host=args.host, port=args.port, workers=args.workers,
+                log_level=args.log_level, timeout_keep_alive=30)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
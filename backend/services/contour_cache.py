@@ -0,0 +1,104 @@
+import hashlib
+import os
+
+import numpy as np
+
+from services.disk_cache import DiskCache, atomic_write
+
+# 컨투어 추출 결과 디스크 캐시 (이미지 바이트 해시 기반, LRU 용량 제한)
+CACHE_DIR = os.environ.get(
+    "CONTOUR_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "contours")
+)
+CACHE_MAX_BYTES = int(os.environ.get("CONTOUR_CACHE_MAX_MB", "256")) * 1024 * 1024
+CACHE_ENABLED = os.environ.get("CONTOUR_CACHE", "1") != "0"
+
+_MAGIC = b"BSKCACHE"
+_FORMAT_VERSION = 1
+
+_cache = DiskCache(CACHE_DIR, CACHE_MAX_BYTES, ".bin")
+
+
+def make_key(image_bytes, *params):
+    """이미지 바이트 + 결과에 영향을 주는 설정값들(repr 로 직렬화) → 캐시 키"""
+    h = hashlib.sha256()
+    h.update(memoryview(image_bytes))
+    for p in params:
+        h.update(f"|{p!r}".encode())
+    return h.hexdigest()
+
+
+def _entry_path(key):
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.bin")
+
+
+def get(key):
+    """
+    캐시 적중 시 (coords int16→int32, offsets, part_index), 없으면 None.
+    적중한 항목은 mtime을 갱신해 LRU 순서를 유지한다.
+    """
+    if not CACHE_ENABLED:
+        return None
+    path = _entry_path(key)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        _cache.count("misses")
+        return None
+    except OSError:
+        _cache.count("errors")
+        return None
+
+    try:
+        if data[:8] != _MAGIC or data[8] != _FORMAT_VERSION:
+            raise ValueError("bad cache header")
+        n_points, n_segments = np.frombuffer(data, dtype="<u4", count=2, offset=12)
+        pos = 20
+        part_index = np.frombuffer(data, dtype="<u4", count=4, offset=pos).astype(np.int64)
+        pos += 4 * 4
+        offsets = np.frombuffer(data, dtype="<u4", count=int(n_segments) + 1, offset=pos).astype(np.int64)
+        pos += 4 * (int(n_segments) + 1)
+        coords = np.frombuffer(data, dtype="<i2", count=2 * int(n_points), offset=pos)
+        coords = coords.reshape(-1, 2).astype(np.int32)
+    except (ValueError, IndexError):
+        _cache.count("errors")
+        try:
+            os.remove(path)
+        except OSError:
+            return None
+        _cache.removed(len(data))
+        return None
+
+    _cache.touch(path)
+    _cache.count("hits")
+    return coords, offsets, part_index
+
+
+def put(key, coords, offsets, part_index):
+    """
+    정수 좌표 파트를 캐시에 저장 (int16 좌표 + uint32 오프셋).
+    임시 파일에 쓴 뒤 os.replace로 교체하므로 동시 요청에도 깨지지 않는다.
+    """
+    if not CACHE_ENABLED:
+        return
+    path = _entry_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    header = bytearray(_MAGIC)
+    header += bytes([_FORMAT_VERSION, 0, 0, 0])
+    header += np.array([coords.shape[0], offsets.shape[0] - 1], dtype="<u4").tobytes()
+    replaced_size = _cache.size_of(path)
+    try:
+        atomic_write(path, header,
+                     np.asarray(part_index, dtype="<u4").tobytes(),
+                     np.asarray(offsets, dtype="<u4").tobytes(),
+                     np.asarray(coords, dtype="<i2").tobytes())
+    except OSError:
+        _cache.count("errors")
+        return
+    _cache.added(path, replaced_size)
+
+
+def cache_stats():
+    """모니터링용 카운터 + 현재 항목 수/용량"""
+    return _cache.stats(enabled=CACHE_ENABLED)
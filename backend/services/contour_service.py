@@ -1,8 +1,17 @@
 import cv2
+import logging
 import numpy as np
 import os
+import time
+from services import contour_cache
+from services.path_optimizer import optimize_pen_path, pen_up_distance
+from services.path_simplifier import simplify_segments
+from services.plot_simulator import simulate_plot
+
+logger = logging.getLogger(__name__)
 
 MAX_X, MAX_Y = 400, 1100  # 최종 캔버스 크기
+PIPELINE_VERSION = 1  # 추출 결과가 달라지는 변경 시 올릴 것 (캐시 무효화)
 
 def _rotate_points_90_ccw(contours_pts):
     rotated = []
@@ -52,32 +61,44 @@ def _content_bbox_in_canvas(transformed_contours):
     maxy = float(all_pts[:,1].max())
     return minx, miny, maxx, maxy
 
-def _split_by_three_vertical_bands(transformed_contours, content_min_y, content_max_y):
+def _band_bounds(content_min_y, content_max_y):
     h = max(1e-9, content_max_y - content_min_y)
     step = h / 3.0
-    bands = [
-        (content_min_y, content_min_y + step),
-        (content_min_y + step, content_min_y + 2*step),
-        (content_min_y + 2*step, content_max_y + 1e-9)
-    ]
+    return content_min_y + step, content_min_y + 2*step
+
+def _band_runs(transformed_contours, content_min_y, content_max_y):
+    """
+    모든 컨투어 좌표를 한 번에 이어붙여 밴드 번호를 마스크로 계산하고,
+    밴드가 바뀌거나 컨투어가 바뀌는 지점(np.diff)으로 구간(run)을 나눈다.
+    return: (pts, starts, ends, band) — run은 (컨투어, 위치) 순서
+    """
+    arrays = [c.reshape(-1, 2) for c in transformed_contours]
+    lengths = np.array([a.shape[0] for a in arrays], dtype=np.int64)
+    if lengths.sum() == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return np.empty((0, 2), dtype=np.float64), empty, empty, empty
+    pts = np.concatenate(arrays).astype(np.float64, copy=False)
+
+    # 상단 [y0, y1), 중단 [y1, y2), 하단 [y2, max] — 모든 점은 정확히 한 밴드에 속함
+    y1, y2 = _band_bounds(content_min_y, content_max_y)
+    y = pts[:, 1]
+    band = (y >= y1).astype(np.int8) + (y >= y2)
+
+    contour_starts = np.cumsum(lengths)[:-1]
+    contour_starts = contour_starts[contour_starts < pts.shape[0]]
+    breaks = np.zeros(pts.shape[0], dtype=bool)
+    breaks[0] = True
+    breaks[1:] = np.diff(band) != 0
+    breaks[contour_starts] = True
+    starts = np.flatnonzero(breaks)
+    ends = np.append(starts[1:], pts.shape[0])
+    return pts, starts, ends, band[starts].astype(np.int64)
+
+def _split_by_three_vertical_bands(transformed_contours, content_min_y, content_max_y):
     parts = [[], [], []]
-    for cnt in transformed_contours:
-        pts = cnt.reshape(-1, 2).astype(np.float64)
-        if pts.shape[0] == 0:
-            continue
-        for band_idx, (y0, y1) in enumerate(bands):
-            seg = []
-            for i in range(pts.shape[0]):
-                y = pts[i,1]
-                in_band = (y0 <= y < y1) if band_idx < 2 else (y0 <= y <= y1)
-                if in_band:
-                    seg.append( (float(pts[i,0]), float(pts[i,1])) )
-                else:
-                    if len(seg) > 0:
-                        parts[band_idx].append(seg)
-                        seg = []
-            if len(seg) > 0:
-                parts[band_idx].append(seg)
+    pts, starts, ends, band = _band_runs(transformed_contours, content_min_y, content_max_y)
+    for s, e, b in zip(starts.tolist(), ends.tolist(), band.tolist()):
+        parts[b].append(list(map(tuple, pts[s:e].tolist())))
     return parts
 
 def _dedupe_consecutive_points(seq):
@@ -88,58 +109,129 @@ def _dedupe_consecutive_points(seq):
             deduped.append(p)
     return deduped
 
-def _dedupe_parts(parts):
-    cleaned = []
-    for segs in parts:
-        new_segs = []
-        for seg in segs:
-            d = _dedupe_consecutive_points(seg)
-            if len(d) > 0:
-                new_segs.append(d)
-        cleaned.append(new_segs)
-    return cleaned
-
-def _round_clip_parts(parts, w=MAX_X, h=MAX_Y):
-    out = []
-    for segs in parts:
-        new_segs = []
-        for seg in segs:
-            new_seg = []
-            for (x, y) in seg:
-                xi = int(np.clip(round(x), 0, w))
-                yi = int(np.clip(round(y), 0, h))
-                new_seg.append((xi, yi))
-            new_segs.append(new_seg)
-        out.append(new_segs)
-    return out
-
-def save_parts_as_txt(base_name, output_dir, parts_int):
-    os.makedirs(output_dir, exist_ok=True)
-    txt_files = []
-    for i, segs in enumerate(parts_int, start=1):
-        filename = os.path.join(output_dir, f"{base_name}_part{i}.txt")
-        txt_files.append(filename)
-        contour_idx = 0
-        with open(filename, "w") as f:
-            for seg in segs:
-                if not seg: continue
-                seg = _dedupe_consecutive_points(seg)
-                if not seg: continue
-                f.write(f"# contour {contour_idx}\n")
-                for (x,y) in seg:
-                    f.write(f"{x},{y}\n")
-                contour_idx += 1
-    return txt_files
+class ContourParts:
+    """
+    파트별(기본 3개) 컨투어를 하나의 좌표 버퍼로 보관하는 컨테이너.
+    - coords:      (N, 2) 좌표 버퍼 (float64 → round_clip 후 int32 → rescale 후 float64)
+    - offsets:     (M+1,) 세그먼트 k = coords[offsets[k]:offsets[k+1]]
+    - part_index:  (P+1,) 파트 i = 세그먼트 part_index[i]:part_index[i+1]
+    dedupe/round_clip/rescale은 버퍼 전체에 한 번에 적용되고,
+    리스트 형태로는 응답을 만들 때(to_lists) 한 번만 변환한다.
+    """
 
-def process_contours_and_split3(image_path, output_dir, simplification_ratio=0.0001):
-    os.makedirs(output_dir, exist_ok=True)
-    base_name = os.path.splitext(os.path.basename(image_path))[0]
-    image = cv2.imread(image_path)
-    if image is None:
+    def __init__(self, coords, offsets, part_index):
+        self.coords = coords
+        self.offsets = offsets
+        self.part_index = part_index
+
+    @classmethod
+    def empty(cls, dtype=np.float64, n_parts=3):
+        return cls(np.empty((0, 2), dtype=dtype),
+                   np.zeros(1, dtype=np.int64),
+                   np.zeros(n_parts + 1, dtype=np.int64))
+
+    @property
+    def part_count(self):
+        return int(self.part_index.shape[0] - 1)
+
+    @property
+    def point_count(self):
+        return int(self.coords.shape[0])
+
+    @property
+    def segment_count(self):
+        return int(self.offsets.shape[0] - 1)
+
+    @classmethod
+    def from_segments(cls, parts_segments, dtype=np.float64):
+        """[[seg, ...], [seg, ...], [seg, ...]] (seg: (k, 2) 배열) → ContourParts"""
+        segs = [np.asarray(seg, dtype=dtype).reshape(-1, 2) for part in parts_segments for seg in part]
+        if not segs:
+            return cls.empty(dtype, len(parts_segments))
+        lengths = [seg.shape[0] for seg in segs]
+        offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        part_index = np.concatenate(([0], np.cumsum([len(part) for part in parts_segments]))).astype(np.int64)
+        return cls(np.concatenate(segs), offsets, part_index)
+
+    def part_segments(self, i):
+        """파트 i의 세그먼트들을 coords의 view 리스트로 반환 (복사 없음)"""
+        lo, hi = int(self.part_index[i]), int(self.part_index[i + 1])
+        offs = self.offsets[lo:hi + 1].tolist()
+        return [self.coords[a:b] for a, b in zip(offs[:-1], offs[1:])]
+
+    def dedupe(self):
+        """세그먼트 내 연속 중복 좌표 제거 (세그먼트 첫 점은 항상 유지)"""
+        if self.point_count == 0:
+            return self
+        keep = np.ones(self.point_count, dtype=bool)
+        keep[1:] = np.any(self.coords[1:] != self.coords[:-1], axis=1)
+        keep[self.offsets[:-1]] = True
+        if not keep.all():
+            kept_before = np.concatenate(([0], np.cumsum(keep)))
+            self.offsets = kept_before[self.offsets]
+            self.coords = self.coords[keep]
+        return self
+
+    def round_clip(self, w=MAX_X, h=MAX_Y):
+        """float → int 변환은 한 번만: 반올림 후 캔버스 경계로 클립 (스케일 변경 없음)"""
+        rounded = np.rint(self.coords)
+        np.clip(rounded[:, 0], 0, w, out=rounded[:, 0])
+        np.clip(rounded[:, 1], 0, h, out=rounded[:, 1])
+        self.coords = rounded.astype(np.int32)
+        return self
+
+    def rescale(self, w=MAX_X, h=MAX_Y):
+        """전체 바운딩 박스를 0..w, 0..h 로 늘린다 (축별 스케일). 퇴화된 경우 빈 파트."""
+        if self.point_count == 0:
+            return self
+        mins = self.coords.min(axis=0)
+        maxs = self.coords.max(axis=0)
+        if maxs[0] == mins[0] or maxs[1] == mins[1]:
+            empty = ContourParts.empty(n_parts=self.part_count)
+            self.coords, self.offsets, self.part_index = empty.coords, empty.offsets, empty.part_index
+            return self
+        span = maxs - mins
+        scaled = (self.coords - mins) / span
+        scaled *= (w, h)
+        self.coords = scaled
+        return self
+
+    def to_lists(self):
+        """[part1, part2, part3] — 각 파트는 [[x, y], ...] 세그먼트들의 리스트"""
+        flat = self.coords.tolist()
+        offs = self.offsets.tolist()
+        parts = []
+        for i in range(self.part_count):
+            lo, hi = int(self.part_index[i]), int(self.part_index[i + 1])
+            parts.append([flat[offs[k]:offs[k + 1]] for k in range(lo, hi)])
+        return parts
+
+def _split_by_three_vertical_bands_packed(transformed_contours, content_min_y, content_max_y):
+    """
+    _split_by_three_vertical_bands와 같은 세그먼트를 ContourParts로 반환.
+    run을 밴드 기준으로 stable 정렬한 뒤 한 번의 gather로 좌표 버퍼를 만든다.
+    """
+    pts, starts, ends, band = _band_runs(transformed_contours, content_min_y, content_max_y)
+    if starts.shape[0] == 0:
+        return ContourParts.empty()
+    order = np.argsort(band, kind="stable")
+    run_starts = starts[order]
+    run_lengths = (ends - starts)[order]
+    offsets = np.concatenate(([0], np.cumsum(run_lengths)))
+    gather = np.arange(offsets[-1], dtype=np.int64) + np.repeat(run_starts - offsets[:-1], run_lengths)
+    part_index = np.searchsorted(band[order], np.arange(4), side="left").astype(np.int64)
+    return ContourParts(pts[gather], offsets, part_index)
+
+def _read_image_bytes(image_path):
+    try:
+        data = np.fromfile(image_path, dtype=np.uint8)
+    except OSError:
+        data = None
+    if data is None or data.size == 0:
         raise FileNotFoundError(f"Error: Unable to load image at {image_path}")
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    _, binary = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
-    contours, _ = cv2.findContours(binary, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+    return data
+
+def _simplify_contours(contours, simplification_ratio):
     simplified = []
     for c in contours:
         peri = cv2.arcLength(c, True)
@@ -147,97 +239,553 @@ def process_contours_and_split3(image_path, output_dir, simplification_ratio=0.0
         approx = cv2.approxPolyDP(c, eps, True)
         if approx is not None and approx.shape[0] > 0:
             simplified.append(approx)
+    return simplified
 
-    if not simplified:
-        raise ValueError("No contours found.")
+def _find_simplified_contours(binary, simplification_ratio):
+    """findContours + approxPolyDP"""
+    contours, _ = cv2.findContours(binary, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+    return _simplify_contours(contours, simplification_ratio)
 
-    normal_contours = [c.copy() for c in simplified]
-    rotated_contours = _rotate_points_90_ccw(simplified)
-    S_n, tx_n, ty_n = _compute_fit_params(normal_contours, MAX_X, MAX_Y, 0, True)
-    S_r, tx_r, ty_r = _compute_fit_params(rotated_contours, MAX_X, MAX_Y, 0, True)
 
-    if S_r > S_n:
-        chosen_oriented = rotated_contours
-        S, tx, ty = S_r, tx_r, ty_r
-    else:
-        chosen_oriented = normal_contours
-        S, tx, ty = S_n, tx_n, ty_n
-
-    transformed = _apply_transform_once(chosen_oriented, S, tx, ty)
-    minx_c, miny_c, maxx_c, maxy_c = _content_bbox_in_canvas(transformed)
-    parts_float = _split_by_three_vertical_bands(transformed, miny_c, maxy_c)
-    parts_float = _dedupe_parts(parts_float)
-    parts_int   = _round_clip_parts(parts_float, MAX_X, MAX_Y)
-    return save_parts_as_txt(base_name, output_dir, parts_int)
-
-def process_contours_and_split3_json(image_path, simplification_ratio=0.0001):
-    image = cv2.imread(image_path)
+# ===== 파이프라인 엔진 =====
+# 추출/후처리를 종류(kind)가 붙은 단계(Stage)들의 사슬로 조립한다.
+#   path → bytes → image → binary → contours → placed → parts → (sink) → parts
+# - 조립할 때 앞 단계의 gives 와 다음 단계의 takes 가 맞는지 검사 (TypeError)
+# - 단계마다 소요 시간을 ctx["timings"] 에 기록하고 hook(name, seconds, ctx) 을 호출
+# - sink(txt)는 parts → parts 통과 단계라 원하는 만큼 이어 붙이거나 뺄 수 있다
+# - CachedStage 로 구간 전체를 디스크 캐시로 감싸면 적중 시 그 구간의 단계들은 실행하지 않는다
+
+_pipeline_hooks = []   # 모든 파이프라인에 적용되는 hook (예: 메트릭 수집)
+
+def add_pipeline_hook(hook):
+    if hook not in _pipeline_hooks:
+        _pipeline_hooks.append(hook)
+
+def remove_pipeline_hook(hook):
+    if hook in _pipeline_hooks:
+        _pipeline_hooks.remove(hook)
+
+class Stage:
+    """파이프라인 한 단계: fn(value, ctx, **params) → value. takes/gives 는 입력/출력 종류 이름."""
+
+    def __init__(self, name, fn, takes, gives, **params):
+        self.name = name
+        self.fn = fn
+        self.takes = takes
+        self.gives = gives
+        self.params = params
+
+    def with_params(self, **params):
+        """파라미터만 바꾼 새 단계"""
+        return Stage(self.name, self.fn, self.takes, self.gives, **dict(self.params, **params))
+
+    def key_params(self):
+        return tuple(sorted(self.params.items()))
+
+    def __call__(self, value, ctx):
+        return self.fn(value, ctx, **self.params)
+
+    def __repr__(self):
+        return f"Stage({self.name}: {self.takes} → {self.gives})"
+
+class CachedStage(Stage):
+    """
+    sub 파이프라인(bytes → ... → parts)을 contour_cache 로 감싼 단계.
+    키 = 이미지 바이트 + PIPELINE_VERSION + 각 단계 이름/파라미터. 적중하면 sub 의 단계는 건너뛴다.
+    """
+
+    def __init__(self, name, sub):
+        if sub.takes != "bytes" or sub.gives != "parts":
+            raise TypeError(f"CachedStage needs a bytes → parts pipeline, got {sub.takes} → {sub.gives}")
+        super().__init__(name, None, sub.takes, sub.gives)
+        self.sub = sub
+
+    def with_params(self, **params):
+        raise TypeError("CachedStage has no parameters; rebuild it from a new sub pipeline")
+
+    def key_params(self):
+        return tuple((s.name, s.key_params()) for s in self.sub.stages)
+
+    def __call__(self, value, ctx):
+        key = contour_cache.make_key(value, PIPELINE_VERSION, self.key_params())
+        cached = contour_cache.get(key)
+        ctx["cacheHit"] = cached is not None
+        if cached is not None:
+            return ContourParts(*cached)
+        parts = self.sub.run_stages(value, ctx)
+        contour_cache.put(key, parts.coords, parts.offsets, parts.part_index)
+        return parts
+
+class ContourPipeline:
+    """
+    Stage 들의 사슬. 조립 메서드(then/without/replace)는 새 파이프라인을 반환한다.
+        pipe = extract_pipeline().then(txt_sink(output_dir))
+        parts = pipe.run(image_path, stats={})       # 또는 pipe.run(image_path, ctx) 로 결과 ctx 받기
+    """
+
+    def __init__(self, stages, hooks=None):
+        self.stages = list(stages)
+        self.hooks = list(hooks or [])
+        if not self.stages:
+            raise ValueError("pipeline needs at least one stage")
+        for prev, cur in zip(self.stages, self.stages[1:]):
+            if cur.takes != prev.gives:
+                raise TypeError(f"{cur.name} takes {cur.takes}, but {prev.name} gives {prev.gives}")
+
+    @property
+    def takes(self):
+        return self.stages[0].takes
+
+    @property
+    def gives(self):
+        return self.stages[-1].gives
+
+    def stage(self, name):
+        for s in self.stages:
+            if s.name == name:
+                return s
+            if isinstance(s, CachedStage):
+                try:
+                    return s.sub.stage(name)
+                except KeyError:
+                    pass
+        raise KeyError(name)
+
+    def then(self, *stages):
+        return ContourPipeline(self.stages + list(stages), self.hooks)
+
+    def without(self, *names):
+        return ContourPipeline([s for s in self.stages if s.name not in names], self.hooks)
+
+    def replace(self, name, stage):
+        if name not in [s.name for s in self.stages]:
+            raise KeyError(name)
+        return ContourPipeline([stage if s.name == name else s for s in self.stages], self.hooks)
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+        return self
+
+    def run(self, value, ctx=None, **inputs):
+        """
+        value 를 단계 순서대로 통과시킨다. ctx 는 단계 사이에서 공유되는 dict
+        (base_name, stats, name/category/image_url 등 입력 + timings/outputs/rotated 등 결과).
+        결과 ctx 가 필요하면 dict 를 직접 넘긴다.
+        """
+        ctx = {} if ctx is None else ctx
+        ctx.update(inputs)
+        ctx.setdefault("timings", {})
+        ctx["hooks"] = self.hooks + _pipeline_hooks
+        return self.run_stages(value, ctx)
+
+    def run_stages(self, value, ctx):
+        timings = ctx.setdefault("timings", {})
+        hooks = ctx.get("hooks", ())
+        for stage in self.stages:
+            start = time.perf_counter()
+            value = stage(value, ctx)
+            elapsed = time.perf_counter() - start
+            timings[stage.name] = timings.get(stage.name, 0.0) + elapsed
+            for hook in hooks:
+                hook(stage.name, elapsed, ctx)
+        return value
+
+# ----- 단계 함수들 -----
+def _stage_read(image_path, ctx):
+    ctx.setdefault("image_path", image_path)
+    ctx.setdefault("base_name", os.path.splitext(os.path.basename(image_path))[0])
+    return _read_image_bytes(image_path)
+
+def _stage_decode(data, ctx):
+    if not isinstance(data, np.ndarray):
+        data = np.frombuffer(data, dtype=np.uint8)
+    image = cv2.imdecode(data, cv2.IMREAD_COLOR)
     if image is None:
-        raise FileNotFoundError(f"Error: Unable to load image at {image_path}")
+        raise FileNotFoundError(f"Error: Unable to load image at {ctx.get('image_path', '<bytes>')}")
+    ctx["image"] = image
+    return image
+
+def _stage_threshold(image, ctx):
     gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     _, binary = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
-    contours, _ = cv2.findContours(binary, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
-    simplified = []
-    for c in contours:
-        peri = cv2.arcLength(c, True)
-        eps = simplification_ratio * peri
-        approx = cv2.approxPolyDP(c, eps, True)
-        if approx is not None and approx.shape[0] > 0:
-            simplified.append(approx)
+    ctx["binary"] = binary
+    return binary
 
+def _stage_contours(binary, ctx, simplification_ratio=0.0001):
+    simplified = _find_simplified_contours(binary, simplification_ratio)
     if not simplified:
         raise ValueError("No contours found.")
+    return simplified
+
+def _stage_fit(contours, ctx, w=MAX_X, h=MAX_Y, rotate=True):
+    """등방성 스케일로 캔버스 가운데 배치. rotate=True 면 반시계 90도 회전이 더 크게 들어갈 때 회전."""
+    S, tx, ty = _compute_fit_params(contours, w, h, 0, True)
+    ctx["rotated"] = False
+    if rotate:
+        rotated = _rotate_points_90_ccw(contours)
+        S_r, tx_r, ty_r = _compute_fit_params(rotated, w, h, 0, True)
+        if S_r > S:
+            contours, S, tx, ty = rotated, S_r, tx_r, ty_r
+            ctx["rotated"] = True
+    return _apply_transform_once(contours, S, tx, ty)
+
+def _stage_split3(placed, ctx):
+    minx_c, miny_c, maxx_c, maxy_c = _content_bbox_in_canvas(placed)
+    return _split_by_three_vertical_bands_packed(placed, miny_c, maxy_c)
+
+def _stage_dedupe(parts, ctx):
+    return parts.dedupe()
+
+def _stage_round_clip(parts, ctx, w=MAX_X, h=MAX_Y):
+    return parts.round_clip(w, h)
+
+def _stage_rescale(parts, ctx, w=MAX_X, h=MAX_Y):
+    return parts.rescale(w, h)
+
+def _stage_simplify(parts, ctx, tolerance=None, max_vertices=None, max_seconds=None):
+    if tolerance is None and max_vertices is None and max_seconds is None:
+        return parts
+    parts, tol = simplify_parts(parts, tolerance, max_vertices, max_seconds)
+    if ctx.get("stats") is not None:
+        ctx["stats"]["tolerance"] = round(tol, 3)
+    return parts
+
+def _stage_optimize_path(parts, ctx):
+    parts, travel = optimize_parts_pen_path(parts)
+    if ctx.get("stats") is not None:
+        ctx["stats"].update(travel)
+    return parts
+
+def _plot_stats(all_segs, stats):
+    plot = simulate_plot(all_segs, per_contour=False)
+    stats["vertexCount"] = sum(len(seg) for seg in all_segs)
+    stats["estimatedSeconds"] = round(plot["totalSeconds"], 1)
+    stats["penDownDistance"] = round(plot["penDownDistance"], 1)
+
+def _stage_plot_stats(parts, ctx):
+    stats = ctx.get("stats")
+    if stats is not None:
+        _plot_stats([seg for i in range(parts.part_count) for seg in parts.part_segments(i)], stats)
+    return parts
+
+def _segment_runs(lengths, inside):
+    """
+    컨투어들을 이어붙인 점 배열에서 inside 가 연속으로 True 인 구간(컨투어 경계에서 끊음).
+    return: (점 인덱스, 구간 offsets)
+    """
+    first = np.zeros(inside.shape[0] + 1, dtype=bool)
+    first[np.cumsum(lengths)[:-1]] = True
+    start = inside.copy()
+    start[1:] &= ~inside[:-1] | first[1:-1]
+    idx = np.flatnonzero(inside)
+    run = np.cumsum(start)[idx] - 1
+    counts = np.bincount(run, minlength=int(start.sum())) if idx.size else np.zeros(0, dtype=np.int64)
+    return idx, np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+def _stage_fit_box(contours, ctx, w=MAX_X, h=MAX_Y, padding=0, center=True):
+    """
+    (contour2.py 방식) 컨투어 전체를 한 파트로, 시계 방향 90도 회전이 더 크게 들어가면 회전.
+    바운딩 박스 기준으로 맞추고 바로 정수화한다.
+    """
+    arrays = [c.reshape(-1, 2) for c in contours]
+    pts = np.concatenate(arrays).astype(np.float64)
+    offsets = np.concatenate(([0], np.cumsum([a.shape[0] for a in arrays]))).astype(np.int64)
+
+    def fit(p):
+        mins, maxs = p.min(axis=0), p.max(axis=0)
+        src = np.maximum(1.0, maxs - mins)
+        avail_w = max(1.0, float(w - 2 * padding))
+        avail_h = max(1.0, float(h - 2 * padding))
+        scale = min(avail_w / src[0], avail_h / src[1])
+        if center:
+            off = ((w - src[0] * scale) / 2.0, (h - src[1] * scale) / 2.0)
+        else:
+            off = (float(padding), float(padding))
+        out = (p - mins) * scale + off
+        np.clip(np.rint(out[:, 0]), 0, w, out=out[:, 0])
+        np.clip(np.rint(out[:, 1]), 0, h, out=out[:, 1])
+        return out.astype(np.int32), scale
 
-    normal_contours = [c.copy() for c in simplified]
-    rotated_contours = _rotate_points_90_ccw(simplified)
-    S_n, tx_n, ty_n = _compute_fit_params(normal_contours, MAX_X, MAX_Y, 0, True)
-    S_r, tx_r, ty_r = _compute_fit_params(rotated_contours, MAX_X, MAX_Y, 0, True)
+    fitted, scale = fit(pts)
+    fitted_r, scale_r = fit(np.column_stack((pts[:, 1], -pts[:, 0])))
+    ctx["rotated"] = bool(scale_r > scale)
+    coords = fitted_r if ctx["rotated"] else fitted
+    return ContourParts(coords, offsets, np.array([0, len(arrays)], dtype=np.int64))
 
-    if S_r > S_n:
-        chosen_oriented = rotated_contours
-        S, tx, ty = S_r, tx_r, ty_r
+def _stage_robot_split3(contours, ctx, w=MAX_X, h=MAX_Y):
+    """
+    (contour123.py 방식) 원본 이미지 좌표에서 3등분 → 로봇 좌표(y 뒤집기) → 파트마다 가운데 정렬.
+    파트 순서: part1=아래, part2=위, part3=가운데. ctx["binary"] 가 필요 (threshold 단계).
+    """
+    ys, xs = np.where(ctx["binary"] == 0)
+    if xs.size == 0:
+        raise ValueError("드로잉 영역이 없습니다.")
+    x_min, x_max = int(xs.min()), int(xs.max())
+    y_min, y_max = int(ys.min()), int(ys.max())
+    drawing_w = max(1, x_max - x_min)
+    drawing_h = max(1, y_max - y_min)
+    scale = min(w / drawing_w, h / drawing_h)
+    pad_x = (w - drawing_w * scale) / 2.0
+    pad_y = (h - drawing_h * scale) / 2.0
+
+    arrays = [c.reshape(-1, 2) for c in contours]
+    lengths = np.array([a.shape[0] for a in arrays], dtype=np.int64)
+    pts = np.concatenate(arrays).astype(np.int64)
+    step = drawing_h / 3.0
+    areas = [(y_min + 2 * step, y_max), (y_min, y_min + step), (y_min + step, y_min + 2 * step)]
+
+    coords, offsets, part_index = [], [np.zeros(1, dtype=np.int64)], [0]
+    ctx["emptyParts"] = []
+    total = 0
+    for i, (y_start, y_end) in enumerate(areas, start=1):
+        y = pts[:, 1]
+        idx, offs = _segment_runs(lengths, (y >= y_start) & (y < y_end))
+        if idx.size == 0:
+            ctx["emptyParts"].append(i)
+            part_index.append(part_index[-1])
+            continue
+        robot = np.empty((idx.size, 2), dtype=np.float64)
+        robot[:, 0] = (pts[idx, 0] - x_min) * scale + pad_x
+        robot[:, 1] = h - ((pts[idx, 1] - y_min) * scale + pad_y)
+        mins, maxs = robot.min(axis=0), robot.max(axis=0)
+        remaining = np.maximum(0.0, (w, h) - np.maximum(0.0, maxs - mins))
+        robot = np.rint(robot + (remaining / 2.0 - mins))
+        np.clip(robot[:, 0], 0, w, out=robot[:, 0])
+        np.clip(robot[:, 1], 0, h, out=robot[:, 1])
+        coords.append(robot.astype(np.int32))
+        offsets.append(offs[1:] + total)
+        total += idx.size
+        part_index.append(part_index[-1] + offs.size - 1)
+    if not coords:
+        return ContourParts.empty(np.int32)
+    return ContourParts(np.concatenate(coords), np.concatenate(offsets), np.array(part_index, dtype=np.int64))
+
+# ----- sink: parts 를 그대로 넘기면서 부수 효과로 저장 -----
+def _format_txt(segments, start=0):
+    lines = []
+    for k, seg in enumerate(segments, start=start):
+        lines.append(f"# contour {k}\n")
+        lines.extend(f"{x},{y}\n" for x, y in seg.tolist())
+    return "".join(lines)
+
+def _sink_txt(parts, ctx, output_dir=None, path=None, dedupe=True, skip_empty_parts=False, log=False):
+    """
+    '# contour N' txt 저장. path 를 주면 모든 파트를 한 파일에, 아니면 {base_name}_part{i}.txt.
+    dedupe=True 면 정수 좌표 기준 연속 중복을 한 번 더 제거해서 쓴다 (parts 자체는 그대로).
+    """
+    out = ContourParts(parts.coords, parts.offsets, parts.part_index)
+    if dedupe:
+        out.dedupe()
+    files = []
+    if path is not None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        segs = [s for i in range(out.part_count) for s in out.part_segments(i) if len(s)]
+        with open(path, "w") as f:
+            f.write(_format_txt(segs))
+        files.append(path)
     else:
-        chosen_oriented = normal_contours
-        S, tx, ty = S_n, tx_n, ty_n
-
-    transformed = _apply_transform_once(chosen_oriented, S, tx, ty)
-    minx_c, miny_c, maxx_c, maxy_c = _content_bbox_in_canvas(transformed)
-    parts_float = _split_by_three_vertical_bands(transformed, miny_c, maxy_c)
-    parts_float = _dedupe_parts(parts_float)
-    parts_int = _round_clip_parts(parts_float, MAX_X, MAX_Y)
-    
-    def scale_contours(parts_int):
-        all_contours = []
-        for segs in parts_int:
-            for seg in segs:
-                if seg:
-                    all_contours.append(seg)
-        if not all_contours:
-            return [[], [], []]
-        
-        xs = [x for c in all_contours for x, _ in c]
-        ys = [y for c in all_contours for _, y in c]
-        if not xs or not ys:
-            return [[], [], []]
-        
-        minx, maxx = min(xs), max(xs)
-        miny, maxy = min(ys), max(ys)
-        if maxx == minx or maxy == miny:
-            return [[], [], []]
-        
-        def mx(px): return (px - minx) / (maxx - minx) * MAX_X
-        def my(py): return (py - miny) / (maxy - miny) * MAX_Y
-        
-        scaled_parts = []
-        for segs in parts_int:
-            scaled_segs = []
-            for seg in segs:
-                scaled_seg = [(mx(x), my(y)) for x, y in seg]
-                if scaled_seg:
-                    scaled_segs.append(scaled_seg)
-            scaled_parts.append(scaled_segs)
-        
-        return scaled_parts
-    
-    scaled_parts = scale_contours(parts_int)
-    return scaled_parts[0], scaled_parts[1], scaled_parts[2]
\ No newline at end of file
+        os.makedirs(output_dir, exist_ok=True)
+        base_name = ctx.get("base_name", "contours")
+        for i in range(out.part_count):
+            segs = [s for s in out.part_segments(i) if len(s)]
+            if skip_empty_parts and not segs:
+                continue
+            filename = os.path.join(output_dir, f"{base_name}_part{i + 1}.txt")
+            with open(filename, "w") as f:
+                f.write(_format_txt(segs))
+            files.append(filename)
+            if log:
+                logger.info("Saved %s | Total points: %d", filename, sum(len(s) for s in segs))
+    ctx.setdefault("outputs", []).extend(files)
+    return parts
+
+READ = Stage("read", _stage_read, "path", "bytes")
+DECODE = Stage("decode", _stage_decode, "bytes", "image")
+THRESHOLD = Stage("threshold", _stage_threshold, "image", "binary")
+CONTOURS = Stage("contours", _stage_contours, "binary", "contours", simplification_ratio=0.0001)
+FIT = Stage("fit", _stage_fit, "contours", "placed", w=MAX_X, h=MAX_Y, rotate=True)
+SPLIT3 = Stage("split3", _stage_split3, "placed", "parts")
+DEDUPE = Stage("dedupe", _stage_dedupe, "parts", "parts")
+ROUND_CLIP = Stage("round_clip", _stage_round_clip, "parts", "parts", w=MAX_X, h=MAX_Y)
+RESCALE = Stage("rescale", _stage_rescale, "parts", "parts", w=MAX_X, h=MAX_Y)
+SIMPLIFY = Stage("simplify", _stage_simplify, "parts", "parts")
+OPTIMIZE_PATH = Stage("optimize_path", _stage_optimize_path, "parts", "parts")
+PLOT_STATS = Stage("plot_stats", _stage_plot_stats, "parts", "parts")
+FIT_BOX = Stage("fit_box", _stage_fit_box, "contours", "parts", w=MAX_X, h=MAX_Y, padding=0, center=True)
+ROBOT_SPLIT3 = Stage("robot_split3", _stage_robot_split3, "contours", "parts", w=MAX_X, h=MAX_Y)
+
+def txt_sink(output_dir=None, path=None, dedupe=True, skip_empty_parts=False, log=False):
+    return Stage("txt", _sink_txt, "parts", "parts", output_dir=output_dir, path=path, dedupe=dedupe,
+                 skip_empty_parts=skip_empty_parts, log=log)
+
+# ----- 프리셋 -----
+def extract_pipeline(simplification_ratio=0.0001, cache=None, source="path"):
+    """
+    이미지 → 정수화된 3개 파트.
+    source: "path"(파일 경로) / "bytes"(인코딩된 이미지 바이트) / "image"(디코딩된 BGR 배열)
+    bytes 이후 구간은 캐시 대상. "image" 로 시작하면 키로 쓸 바이트가 없으므로 캐시하지 않는다.
+    """
+    stages = [THRESHOLD, CONTOURS.with_params(simplification_ratio=simplification_ratio),
+              FIT, SPLIT3, DEDUPE, ROUND_CLIP]
+    if source == "image":
+        return ContourPipeline(stages)
+    if source not in ("path", "bytes"):
+        raise ValueError(f"unknown source: {source}")
+    sub = ContourPipeline([DECODE] + stages)
+    use_cache = contour_cache.CACHE_ENABLED if cache is None else cache
+    head = [READ] if source == "path" else []
+    return ContourPipeline(head + ([CachedStage("extract", sub)] if use_cache else sub.stages))
+
+def split3_json_pipeline(simplification_ratio=0.0001, optimize_path=True,
+                         tolerance=None, max_vertices=None, max_seconds=None, source="path"):
+    """API 응답용: 추출 → 0..MAX 로 늘리기 → (단순화) → (펜 경로 최적화) → 통계"""
+    stages = [RESCALE, SIMPLIFY.with_params(tolerance=tolerance, max_vertices=max_vertices, max_seconds=max_seconds)]
+    if optimize_path:
+        stages.append(OPTIMIZE_PATH)
+    stages.append(PLOT_STATS)
+    return extract_pipeline(simplification_ratio, source=source).then(*stages)
+
+def fit_box_pipeline(output_path, simplification_ratio=0.0001, w=MAX_X, h=MAX_Y, padding=0, center=True):
+    """contour2.py: 파트 분할 없이 한 파일, 중복 제거 없음"""
+    return ContourPipeline([
+        READ, DECODE, THRESHOLD, CONTOURS.with_params(simplification_ratio=simplification_ratio),
+        FIT_BOX.with_params(w=w, h=h, padding=padding, center=center),
+        txt_sink(path=output_path, dedupe=False),
+    ])
+
+def robot_split3_pipeline(output_dir, simplification_ratio=0.0001):
+    """contour123.py: 원본 좌표 3등분 + 로봇 좌표 + 파트별 가운데 정렬, 중복 제거 없음"""
+    return ContourPipeline([
+        READ, DECODE, THRESHOLD, CONTOURS.with_params(simplification_ratio=simplification_ratio),
+        ROBOT_SPLIT3, txt_sink(output_dir, dedupe=False, skip_empty_parts=True, log=True),
+    ])
+
+def load_parts_int(image_path, simplification_ratio=0.0001):
+    """
+    정수화된 3개 파트를 반환. 같은 이미지 바이트/설정이면 디스크 캐시에서 바로 읽고
+    OpenCV 처리는 건너뛴다.
+    """
+    return extract_pipeline(simplification_ratio).run(image_path)
+
+def process_contours_and_split3(image_path, output_dir, simplification_ratio=0.0001):
+    ctx = {}
+    extract_pipeline(simplification_ratio).then(txt_sink(output_dir)).run(image_path, ctx)
+    return ctx["outputs"]
+
+def optimize_parts_pen_path(parts, start=(0.0, 0.0)):
+    """
+    파트 순서(1→2→3)는 유지하고, 파트 안에서 컨투어 순서/시작점/방향을 바꿔 펜업 이동을 줄인다.
+    다음 파트는 이전 파트가 끝난 위치에서 시작한다.
+    return: (새 ContourParts, {"penUpBefore": ..., "penUpAfter": ...})
+    """
+    stats = {}
+    optimized = list(iter_optimized_parts(parts, start, stats))
+    return ContourParts.from_segments(optimized, parts.coords.dtype), stats
+
+def iter_optimized_parts(parts, start=(0.0, 0.0), stats=None):
+    """
+    optimize_parts_pen_path 를 파트 하나씩: 파트 i 의 최적화된 세그먼트 리스트를 바로 yield
+    (다음 파트는 이전 파트가 끝난 위치에서 시작하므로 순서대로만 계산 가능).
+    다 돌면 stats 에 penUpBefore/penUpAfter 를 채운다.
+    """
+    before = after = 0.0
+    pos_before = pos_after = start
+    for i in range(parts.part_count):
+        segs = parts.part_segments(i)
+        before += pen_up_distance(segs, pos_before)
+        if segs:
+            pos_before = segs[-1][-1]
+        opt, end = optimize_pen_path(segs, pos_after)
+        after += pen_up_distance(opt, pos_after)
+        pos_after = end
+        yield opt
+    if stats is not None:
+        stats.update({"penUpBefore": round(before, 1), "penUpAfter": round(after, 1)})
+
+def simplify_parts(parts, tolerance=None, max_vertices=None, max_seconds=None):
+    """모든 파트 전체를 하나의 예산으로 단순화. return: (새 ContourParts, 사용한 허용오차)"""
+    n = parts.part_count
+    segs = [seg for i in range(n) for seg in parts.part_segments(i)]
+    simplified, tol = simplify_segments(segs, tolerance, max_vertices, max_seconds)
+    counts = np.diff(parts.part_index).tolist()
+    bounds = np.concatenate(([0], np.cumsum(counts))).tolist()
+    regrouped = [simplified[bounds[i]:bounds[i + 1]] for i in range(n)]
+    return ContourParts.from_segments(regrouped, parts.coords.dtype), tol
+
+def _image_source(image):
+    if isinstance(image, np.ndarray):
+        return "image"
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return "bytes"
+    return "path"
+
+def process_contours_and_split3_json(image_path, simplification_ratio=0.0001, optimize_path=True, stats=None,
+                                     tolerance=None, max_vertices=None, max_seconds=None):
+    """
+    image_path 에는 파일 경로 대신 디코딩된 BGR 배열(np.ndarray)이나 인코딩된 이미지 바이트를 넘겨도 된다
+    (생성 직후 디스크를 거치지 않을 때).
+    stats 에 dict 를 넘기면 처리 결과 통계(펜업 이동 거리, 꼭짓점 수, 예상 시간)를 채워준다.
+    tolerance / max_vertices / max_seconds 중 하나라도 주면 최종 캔버스 좌표에서 추가 단순화.
+    """
+    pipe = split3_json_pipeline(simplification_ratio, optimize_path, tolerance, max_vertices, max_seconds,
+                                _image_source(image_path))
+    parts = pipe.run(image_path, stats=stats)
+    part1, part2, part3 = parts.to_lists()
+    return part1, part2, part3
+
+
+def iter_split3_json_parts(image, simplification_ratio=0.0001, optimize_path=True, stats=None,
+                           tolerance=None, max_vertices=None, max_seconds=None):
+    """
+    process_contours_and_split3_json 과 같은 결과를 파트 하나씩 (1, part1), (2, part2), (3, part3) 로 yield.
+    추출/늘리기/단순화는 전체에 한 번(전체 바운딩 박스·예산 기준), 펜 경로 최적화와 리스트 변환만 파트별로 해서
+    part1 을 보내는 동안(플로터가 그리는 동안) 나머지 파트를 계산할 수 있다.
+    stats 는 마지막 파트를 yield 한 뒤에 채워진다.
+    """
+    pipe = extract_pipeline(simplification_ratio, source=_image_source(image)).then(
+        RESCALE, SIMPLIFY.with_params(tolerance=tolerance, max_vertices=max_vertices, max_seconds=max_seconds))
+    ctx = {}
+    parts = pipe.run(image, ctx, stats=stats)
+
+    def record(name, start):
+        elapsed = time.perf_counter() - start
+        ctx["timings"][name] = ctx["timings"].get(name, 0.0) + elapsed
+        for hook in ctx["hooks"]:
+            hook(name, elapsed, ctx)
+
+    travel = {}
+    if optimize_path:
+        part_segments = iter_optimized_parts(parts, stats=travel)
+    else:
+        part_segments = (parts.part_segments(i) for i in range(parts.part_count))
+    all_segs = []
+    for number in range(1, parts.part_count + 1):
+        start = time.perf_counter()
+        segs = next(part_segments)
+        if optimize_path:
+            record("optimize_path", start)
+        all_segs.extend(segs)
+        yield number, [seg.tolist() for seg in segs]
+    if optimize_path:
+        next(part_segments, None)   # 마지막까지 돌아야 travel 이 채워진다
+
+    if stats is not None:
+        start = time.perf_counter()
+        stats.update(travel)
+        _plot_stats(all_segs, stats)
+        record("plot_stats", start)
+
+def split3_json_job(image, options=None):
+    """
+    프로세스 풀(ASGI 모드)용: 최상위 함수라 pickle 가능.
+    return: ((part1, part2, part3), stats, 단계별 시간) — 자식 프로세스의 계측은 부모로 돌려보내 기록한다.
+    """
+    options = options or {}
+    stats = {}
+    timings = {}
+    source = "bytes" if isinstance(image, (bytes, bytearray, memoryview)) else "path"
+    pipe = split3_json_pipeline(options.get("simplification_ratio", 0.0001), options.get("optimize_path", True),
+                                options.get("tolerance"), options.get("max_vertices"),
+                                options.get("max_seconds"), source)
+    parts = pipe.run(image, {"timings": timings}, stats=stats)
+    return tuple(parts.to_lists()), stats, timings
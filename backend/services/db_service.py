@@ -1,11 +1,20 @@
+import atexit
 import pymysql
 import json
+import logging
 import os
+import random
+import threading
+import time
+import zlib
 from contextlib import contextmanager
 from dotenv import load_dotenv
+from services.json_service import encode_contours_bin, decode_contours_bin, contours_from_bin
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 try:
     import sys
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -25,20 +34,145 @@ DB_CONFIG = {
     'cursorclass': pymysql.cursors.DictCursor
 }
 
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '8'))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '10'))      # 빈 연결을 기다리는 최대 시간(초)
+DB_POOL_MAX_IDLE = float(os.environ.get('DB_POOL_MAX_IDLE', '300'))   # 이보다 오래 쉰 연결은 새로 만든다
+DB_POOL_PING_AFTER = float(os.environ.get('DB_POOL_PING_AFTER', '30'))  # 이보다 오래 쉰 연결은 ping 으로 확인
+
+class ConnectionPool:
+    """
+    스레드 안전한 크기 제한 pymysql 연결 풀.
+    - 최근에 반납된 연결부터 재사용(LIFO), 오래 쉰 연결은 ping 확인 또는 재생성
+    - 풀이 가득 차면 DB_POOL_TIMEOUT 까지 대기
+    """
+
+    def __init__(self, config, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT,
+                 max_idle=DB_POOL_MAX_IDLE, ping_after=DB_POOL_PING_AFTER):
+        self.config = config
+        self.size = size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.ping_after = ping_after
+        self._idle = []          # (conn, 반납 시각)
+        self._open = 0           # 풀이 관리하는 연결 수 (사용 중 + 대기)
+        self._cond = threading.Condition()
+        self._stats = {'created': 0, 'recycled': 0, 'healthFailures': 0,
+                       'acquired': 0, 'waits': 0, 'waitSeconds': 0.0, 'maxWaitSeconds': 0.0, 'timeouts': 0}
+
+    def _connect(self):
+        try:
+            conn = pymysql.connect(**self.config)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats['created'] += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        start = time.monotonic()
+        waited = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    conn, released_at = None, None
+                    break
+                waited = True
+                remaining = self.timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise TimeoutError(f"DB 연결 풀 대기 시간 초과 ({self.timeout}s, size={self.size})")
+                self._cond.wait(remaining)
+            wait = time.monotonic() - start
+            self._stats['acquired'] += 1
+            if waited:
+                self._stats['waits'] += 1
+                self._stats['waitSeconds'] += wait
+                self._stats['maxWaitSeconds'] = max(self._stats['maxWaitSeconds'], wait)
+
+        if conn is None:
+            return self._connect()
+
+        idle = time.monotonic() - released_at
+        if idle > self.max_idle:
+            self._discard(conn)
+            with self._cond:
+                self._stats['recycled'] += 1
+            return self._connect()
+        if idle > self.ping_after:
+            try:
+                conn.ping(reconnect=False)
+            except Exception:
+                self._discard(conn)
+                with self._cond:
+                    self._stats['healthFailures'] += 1
+                return self._connect()
+        return conn
+
+    def release(self, conn, broken=False):
+        if broken or not getattr(conn, 'open', True):
+            self._discard(conn)
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            data = dict(self._stats)
+            data.update({
+                'size': self.size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'inUse': self._open - len(self._idle),
+            })
+        return data
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for conn, _ in idle:
+            self._discard(conn)
+
+_pool = ConnectionPool(DB_CONFIG)
+atexit.register(_pool.close_all)   # 종료 시 대기 중인 연결을 정상적으로 닫는다
+
+def get_pool_stats():
+    return _pool.stats()
+
 @contextmanager
 def get_db_connection():
-    conn = None
+    conn = _pool.acquire()
+    broken = False
     try:
-        conn = pymysql.connect(**DB_CONFIG)
         yield conn
         conn.commit()
     except Exception as e:
-        if conn:
+        try:
             conn.rollback()
+        except Exception:
+            broken = True
+        if isinstance(e, (pymysql.err.OperationalError, pymysql.err.InterfaceError)):
+            broken = True
         raise e
     finally:
-        if conn:
-            conn.close()
+        _pool.release(conn, broken)
 
 def init_database():
     with get_db_connection() as conn:
@@ -57,62 +191,163 @@ def init_database():
                 INDEX idx_name (name)
             ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
         """)
+        # 컨투어는 별도 테이블에 압축해서 저장 (drawings 행은 메타데이터만 유지)
+        # 예전 행은 drawings.partN_contours 에 남아 있으므로 읽을 때 그쪽으로 대체한다
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS drawing_parts (
+                drawing_id INT NOT NULL,
+                part TINYINT NOT NULL,
+                format VARCHAR(16) NOT NULL,
+                contour_count INT NOT NULL,
+                point_count INT NOT NULL,
+                data MEDIUMBLOB NOT NULL,
+                PRIMARY KEY (drawing_id, part),
+                FOREIGN KEY (drawing_id) REFERENCES drawings(id) ON DELETE CASCADE
+            ) ENGINE=InnoDB
+        """)
         conn.commit()
 
+# ===== 컨투어 part 저장 형식 =====
+# bskc-f64+zlib: services/json_service 의 바이너리 형식(f64, 손실 없음)을 zlib 압축
+#   → 읽은 좌표가 저장한 float 와 비트 단위로 같다
+PART_NUMBERS = (1, 2, 3)
+PART_FORMAT = 'bskc-f64+zlib'
+
+def encode_part(contours):
+    """컨투어 리스트 → (format, bytes)"""
+    return PART_FORMAT, zlib.compress(encode_contours_bin(contours, encoding='f64'))
+
+def decode_part(fmt, data):
+    if fmt == PART_FORMAT:
+        coords, offsets, _ = decode_contours_bin(zlib.decompress(data))
+        return [c.tolist() for c in contours_from_bin(coords, offsets)]
+    raise ValueError(f"알 수 없는 part 형식: {fmt}")
+
+# ===== 카테고리별 그림 목록 캐시 (ORDER BY RAND() 대신 메모리에서 무작위 선택) =====
+# id/이름/이미지 URL 만 보관 → 무작위 선택과 오답 이름은 DB 왕복 없이 만든다 (컨투어는 drawing_parts)
+CATEGORY_INDEX_TTL = float(os.environ.get('CATEGORY_INDEX_TTL', '60'))  # 다른 프로세스의 INSERT 반영 주기(초)
+# 캐시된 dict 는 만든 뒤 절대 수정하지 않는다 (copy-on-write) → 락 밖에서 읽고 무작위로 골라도 안전
+_category_drawings = {}   # category -> ({id: (name, image_url)}, 로드 시각)
+_index_lock = threading.Lock()
+
+def _cached_category_drawings(category):
+    """TTL 안의 캐시된 목록 (없으면 None) — DB 연결 없이 확인. 반환된 dict 는 읽기 전용."""
+    with _index_lock:
+        entry = _category_drawings.get(category)
+        if entry and time.monotonic() - entry[1] < CATEGORY_INDEX_TTL:
+            return entry[0]
+    return None
+
+def _category_drawings_for(cursor, category, refresh=False):
+    drawings = None if refresh else _cached_category_drawings(category)
+    if drawings is not None:
+        return drawings
+    now = time.monotonic()
+    # JSON/BLOB 컬럼은 건드리지 않는 쿼리
+    cursor.execute("SELECT id, name, image_url FROM drawings WHERE category = %s", (category,))
+    drawings = {r['id']: (r['name'], r['image_url']) for r in cursor.fetchall()}
+    with _index_lock:
+        _category_drawings[category] = (drawings, now)
+    return drawings
+
+def _remember_drawing(category, drawing_id, name, image_url):
+    # 캐시된 목록을 통째로 버리지 않고 새 그림만 추가 (다음 요청도 DB 왕복 없음).
+    # 다른 요청이 이전 dict 를 순회 중일 수 있으므로 제자리 수정 대신 새 dict 로 교체
+    with _index_lock:
+        entry = _category_drawings.get(category)
+        if entry:
+            drawings = dict(entry[0])
+            drawings[drawing_id] = (name, image_url)
+            _category_drawings[category] = (drawings, entry[1])
+
+def _parse_contours(value):
+    return json.loads(value) if value else []
+
+def _insert_parts(cursor, drawing_id, parts):
+    rows = []
+    for n, contours in zip(PART_NUMBERS, parts):
+        fmt, data = encode_part(contours)
+        rows.append((drawing_id, n, fmt, len(contours), sum(len(c) for c in contours), data))
+    cursor.executemany("""
+        INSERT INTO drawing_parts (drawing_id, part, format, contour_count, point_count, data)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, rows)
+
+def _load_parts(cursor, drawing_id, parts=PART_NUMBERS):
+    """drawing_parts 에서 읽고, 없으면 drawings 의 예전 JSON 컬럼에서 읽는다. return {part: contours}"""
+    placeholders = ", ".join(["%s"] * len(parts))
+    cursor.execute(f"""
+        SELECT part, format, data FROM drawing_parts
+        WHERE drawing_id = %s AND part IN ({placeholders})
+    """, (drawing_id, *parts))
+    result = {r['part']: decode_part(r['format'], r['data']) for r in cursor.fetchall()}
+    missing = [n for n in parts if n not in result]
+    if missing:
+        columns = ", ".join(f"part{n}_contours" for n in missing)
+        cursor.execute(f"SELECT {columns} FROM drawings WHERE id = %s", (drawing_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        for n in missing:
+            result[n] = _parse_contours(row[f'part{n}_contours'])
+    return result
+
 def save_contours_to_db(name, category, image_url, part1, part2, part3):
     with get_db_connection() as conn:
         cursor = conn.cursor()
         try:
             cursor.execute("""
-                INSERT INTO drawings (name, category, image_url, part1_contours, part2_contours, part3_contours)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (
-                name,
-                category,
-                image_url,
-                json.dumps(part1, ensure_ascii=False),
-                json.dumps(part2, ensure_ascii=False),
-                json.dumps(part3, ensure_ascii=False)
-            ))
+                INSERT INTO drawings (name, category, image_url)
+                VALUES (%s, %s, %s)
+            """, (name, category, image_url))
             drawing_id = cursor.lastrowid
-            print(f"Successfully saved drawing '{name}' to DB with ID: {drawing_id}")
-            return drawing_id
+            _insert_parts(cursor, drawing_id, (part1, part2, part3))
+            logger.debug("Saved drawing %r to DB with ID: %s", name, drawing_id)
         except Exception as e:
-            print(f"Error saving to DB: {str(e)}")
+            logger.error("Error saving to DB: %s", e)
             raise
+    # 커밋 후에 인덱스에 추가
+    _remember_drawing(category, drawing_id, name, image_url)
+    return drawing_id
 
-def get_random_drawing_by_category(category):
+def get_drawing_part(drawing_id, part):
+    """part 하나의 컨투어 리스트 (없는 그림이면 None)"""
     with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, name, image_url, part1_contours, part2_contours, part3_contours
-            FROM drawings
-            WHERE category = %s
-            ORDER BY RAND()
-            LIMIT 1
-        """, (category,))
-        result = cursor.fetchone()
-        if result:
-            return {
-                'id': result['id'],
-                'name': result['name'],
-                'imageUrl': result['image_url'],
-                'part1Contours': json.loads(result['part1_contours']) if result['part1_contours'] else [],
-                'part2Contours': json.loads(result['part2_contours']) if result['part2_contours'] else [],
-                'part3Contours': json.loads(result['part3_contours']) if result['part3_contours'] else []
-            }
-        return None
+        parts = _load_parts(conn.cursor(), drawing_id, (part,))
+    return parts[part] if parts is not None else None
+
+def _pick_drawing(drawings, wrong_limit):
+    picked = random.sample(list(drawings), min(len(drawings), wrong_limit + 1))
+    name, image_url = drawings[picked[0]]
+    return {
+        'id': picked[0],
+        'name': name,
+        'imageUrl': image_url,
+        'wrongAnswers': [drawings[i][0] for i in picked[1:]]
+    }
+
+def get_random_drawing_with_wrong_answers(category, wrong_limit=3, include_parts=True):
+    """
+    카테고리에서 그림 하나 + 오답 이름 wrong_limit 개.
+    그림 목록(id/이름/URL)은 메모리 캐시에서 고르므로 include_parts=False 면 DB 연결 없이 끝난다
+    (캐시가 비었거나 TTL 이 지났을 때만 한 번 읽음). include_parts=True 면 컨투어만 DB 에서 읽는다.
+    """
+    cached = _cached_category_drawings(category)
+    if cached and not include_parts:
+        return _pick_drawing(cached, wrong_limit)
 
-def get_wrong_answers_by_category(category, exclude_id, limit=3):
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT name
-            FROM drawings
-            WHERE category = %s AND id != %s
-            ORDER BY RAND()
-            LIMIT %s
-        """, (category, exclude_id, limit))
-        results = cursor.fetchall()
-        return [r['name'] for r in results]
-
+        for attempt in range(2):
+            drawings = _category_drawings_for(cursor, category, refresh=attempt > 0)
+            if not drawings:
+                return None
+            drawing = _pick_drawing(drawings, wrong_limit)
+            if include_parts:
+                parts = _load_parts(cursor, drawing['id'])
+                if parts is None:
+                    continue  # 캐시가 오래됨 (삭제된 행) → 새로 읽고 한 번 더
+                for n in PART_NUMBERS:
+                    drawing[f'part{n}Contours'] = parts.get(n, [])
+            return drawing
+        return None
@@ -0,0 +1,153 @@
+import contextlib
+import os
+import threading
+import time
+
+# 파일 하나가 항목 하나인 디스크 캐시 공통 부분 (컨투어 캐시, TTS 캐시)
+# - 용량(max_bytes)을 넘으면 mtime 이 가장 오래된(가장 오래 안 쓴) 항목부터 삭제 → 적중 시 os.utime 으로 갱신
+# - 임시 파일에 다 쓴 뒤 os.replace (반쯤 쓴 파일이 캐시/정적 파일로 보이지 않게)
+# - 적중/실패/쓰기/삭제/오류 카운터
+
+
+def tmp_path(path):
+    """같은 경로를 여러 프로세스/스레드가 동시에 써도 겹치지 않는 임시 파일 이름"""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+@contextlib.contextmanager
+def atomic_path(path):
+    """
+    with atomic_path(path) as tmp: tmp 에 쓴다 → 블록이 끝나면 path 로 교체.
+    블록이나 교체가 실패하면 임시 파일을 지우고 예외를 그대로 올린다.
+    """
+    tmp = tmp_path(path)
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def atomic_write(path, *chunks):
+    with atomic_path(path) as tmp:
+        with open(tmp, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+
+class DiskCache:
+    """
+    root 아래(하위 폴더 한 단계까지)의 *suffix 파일들을 LRU-by-mtime 으로 관리.
+    항목 수/용량은 만들 때(시작 시) 한 번만 폴더를 훑어 세고 이후에는 쓰기/삭제 때 갱신한다
+    → put/stats 는 O(1), 폴더 전체를 훑는 것은 용량을 넘어 실제로 지워야 할 때뿐.
+    (다른 프로세스가 쓰거나 지운 것은 그다음 정리 때 다시 맞춰진다)
+    """
+
+    def __init__(self, root, max_bytes, suffix):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "errors": 0}
+        entries = self._scan()
+        self._entries = len(entries)
+        self._bytes = sum(size for _, size, _ in entries)
+
+    def count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def touch(self, path):
+        """적중한 항목의 mtime 갱신 (LRU 순서). return: 파일이 있었는지"""
+        try:
+            os.utime(path)
+        except OSError:
+            return False
+        return True
+
+    def size_of(self, path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return None
+
+    def _scan(self):
+        """[(mtime, size, path)]"""
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        dirs = [self.root]
+        for entry in os.scandir(self.root):
+            if entry.is_dir():
+                dirs.append(entry.path)
+        for d in dirs:
+            for entry in os.scandir(d):
+                if entry.name.endswith(self.suffix):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def added(self, path, replaced_size=None):
+        """path 에 항목을 썼다 (replaced_size: 덮어쓴 이전 파일 크기). 용량을 넘으면 정리."""
+        size = self.size_of(path) or 0
+        with self._lock:
+            self._stats["writes"] += 1
+            self._bytes += size - (replaced_size or 0)
+            if replaced_size is None:
+                self._entries += 1
+            over = self._bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def removed(self, size):
+        """캐시 쪽에서 항목 하나를 지웠다 (예: 깨진 항목)"""
+        with self._lock:
+            self._entries = max(0, self._entries - 1)
+            self._bytes = max(0, self._bytes - size)
+
+    def evict(self):
+        """
+        용량을 넘었으면 가장 오래 사용되지 않은 항목부터 용량의 90% 까지 삭제
+        (바로 다음 쓰기에서 다시 폴더를 훑지 않도록 여유를 둔다). 실제 폴더 기준으로 수/용량도 다시 맞춘다.
+        """
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        evicted = 0
+        if total > self.max_bytes:
+            target = self.max_bytes * 0.9
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                count -= 1
+                evicted += 1
+        with self._lock:
+            self._entries, self._bytes = count, total
+            self._stats["evictions"] += evicted
+
+    def stats(self, **extra):
+        """모니터링용 카운터 + 현재 항목 수/용량"""
+        with self._lock:
+            stats = dict(self._stats)
+            entries, size = self._entries, self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats.update(extra)
+        stats.update({
+            "entries": entries,
+            "bytes": size,
+            "maxBytes": self.max_bytes,
+            "hitRate": (stats["hits"] / lookups) if lookups else 0.0,
+            "timestamp": time.time(),
+        })
+        return stats
@@ -1,32 +1,129 @@
-from openai import OpenAI
-import os
+import asyncio
 import base64
+import os
+import cv2
+import numpy as np
+from services.imagen_service import PNG_SIGNATURE
+from services.openai_clients import get_client, get_async_client
 
-client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+SYSTEM_PROMPT = "당신은 노인분들의 기억력과 인지 기능을 자극하는 대화 도우미입니다. 사진을 보고 구체적인 기억을 떠올릴 수 있도록 질문을 만드세요. 질문은 따뜻하고 존중하는 말투를 사용하세요."
+USER_PROMPT = "이 사진을 보고 기억을 떠올릴 수 있는 질문 3개를 만들어주세요. 단순히 기분을 묻기보다는, 사람, 장소, 계절, 활동 같은 구체적인 맥락을 자극하세요."
+QUESTION_COUNT = 3
+# 질문 생성용으로 보내는 이미지: 긴 변을 줄이고 JPEG 로 다시 인코딩 (휴대폰 원본 수 MB → 수백 KB)
+QUESTION_IMAGE_MAX_SIDE = int(os.environ.get("QUESTION_IMAGE_MAX_SIDE", "1024"))
+QUESTION_JPEG_QUALITY = int(os.environ.get("QUESTION_JPEG_QUALITY", "85"))
 
-def encode_image(image_path):
+def prepare_image(data):
+    """
+    업로드 원본 바이트 → 질문 생성용 JPEG 바이트 (긴 변 QUESTION_IMAGE_MAX_SIDE 이하).
+    디코딩할 수 없거나 다시 인코딩해도 줄지 않으면 원본 그대로.
+    """
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)  # EXIF 회전 반영
+    if image is None:
+        return data
+    h, w = image.shape[:2]
+    scale = QUESTION_IMAGE_MAX_SIDE / max(h, w)
+    if scale < 1:
+        image = cv2.resize(image, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+    ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, QUESTION_JPEG_QUALITY])
+    if not ok or (scale >= 1 and len(encoded) >= len(data)):
+        return data
+    return encoded.tobytes()
+
+def _read_image(image_path):
     with open(image_path, "rb") as image_file:
-        return base64.b64encode(image_file.read()).decode("utf-8")
-def generate_questions_from_image(image_path):
-    base64_image = encode_image(image_path)
-    response = client.responses.create(
-        model="gpt-4.1-mini",
-        input=[
+        return prepare_image(image_file.read())
+
+def _image_data_url(image):
+    """image: 파일 경로 또는 (prepare_image() 로 줄인) 이미지 바이트"""
+    data = _read_image(image) if isinstance(image, str) else image
+    mime = "image/png" if data.startswith(PNG_SIGNATURE) else "image/jpeg"
+    return f"data:{mime};base64,{base64.b64encode(data).decode('utf-8')}"
+
+def _question_request(image_url):
+    return {
+        "model": "gpt-4.1-mini",
+        "input": [
             {
                 "role": "system",
-                "content": "당신은 노인분들의 기억력과 인지 기능을 자극하는 대화 도우미입니다. 사진을 보고 구체적인 기억을 떠올릴 수 있도록 질문을 만드세요. 질문은 따뜻하고 존중하는 말투를 사용하세요."
+                "content": SYSTEM_PROMPT
             },
             {
                 "role": "user",
                 "content": [
-                    {"type": "input_text", "text": "이 사진을 보고 기억을 떠올릴 수 있는 질문 3개를 만들어주세요. 단순히 기분을 묻기보다는, 사람, 장소, 계절, 활동 같은 구체적인 맥락을 자극하세요."},
-                    {"type": "input_image", "image_url": f"data:image/jpeg;base64,{base64_image}"}
+                    {"type": "input_text", "text": USER_PROMPT},
+                    {"type": "input_image", "image_url": image_url}
                 ]
             }
         ],
-    )
+    }
+
+class _QuestionLines:
+    """스트리밍 텍스트 조각 → 완성된 질문 줄 (빈 줄 제외, 최대 QUESTION_COUNT 개)"""
+
+    def __init__(self):
+        self.buffer = ""
+        self.count = 0
+
+    @property
+    def full(self):
+        return self.count >= QUESTION_COUNT
 
-    text = response.output_text
+    def _take(self, lines):
+        questions = [q.strip() for q in lines if q.strip()][:QUESTION_COUNT - self.count]
+        self.count += len(questions)
+        return questions
+
+    def feed(self, delta):
+        *lines, self.buffer = (self.buffer + delta).split("\n")
+        return self._take(lines)
+
+    def finish(self):
+        return self._take([self.buffer])
+
+def _parse_questions(text):
     # 텍스트를 3개 질문 리스트로 변환
-    questions = [q.strip() for q in text.split("\n") if q.strip()]
-    return questions[:3]
\ No newline at end of file
+    lines = _QuestionLines()
+    return lines.feed(text) + lines.finish()
+
+def generate_questions_from_image(image):
+    """image: 파일 경로 또는 prepare_image() 로 줄인 바이트"""
+    response = get_client().responses.create(**_question_request(_image_data_url(image)))
+    return _parse_questions(response.output_text)
+
+def iter_questions_from_image(image):
+    """응답을 스트리밍으로 받아 질문이 한 줄 완성될 때마다 yield"""
+    lines = _QuestionLines()
+    stream = get_client().responses.create(stream=True, **_question_request(_image_data_url(image)))
+    try:
+        for event in stream:
+            if event.type == "response.output_text.delta":
+                yield from lines.feed(event.delta)
+                if lines.full:
+                    return
+        yield from lines.finish()
+    finally:
+        stream.close()
+
+async def generate_questions_from_image_async(image):
+    """ASGI 모드용. image 는 파일 경로 또는 업로드된 이미지 바이트."""
+    image_url = await asyncio.to_thread(_image_data_url, image)
+    response = await get_async_client().responses.create(**_question_request(image_url))
+    return _parse_questions(response.output_text)
+
+async def aiter_questions_from_image(image):
+    """iter_questions_from_image 의 비동기 버전"""
+    lines = _QuestionLines()
+    image_url = await asyncio.to_thread(_image_data_url, image)
+    stream = await get_async_client().responses.create(stream=True, **_question_request(image_url))
+    try:
+        async for event in stream:
+            if event.type == "response.output_text.delta":
+                for question in lines.feed(event.delta):
+                    yield question
+                if lines.full:
+                    return
+        for question in lines.finish():
+            yield question
+    finally:
+        await stream.close()
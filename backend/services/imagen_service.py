@@ -1,28 +1,122 @@
 # imagen_service.py
+import asyncio
 import base64
+import functools
+import hashlib
 import os
-from openai import OpenAI
-from PIL import Image
+import time
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw
 from io import BytesIO
+from services.disk_cache import atomic_write
+from services.metrics_service import stage_timer
+from services.openai_clients import get_client, get_async_client
 
-client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+IMAGE_REQUEST = {"model": "gpt-image-1", "quality": "low", "size": "1024x1024"}
+MOCK_PROVIDER_LATENCY = float(os.environ.get("MOCK_PROVIDER_LATENCY", "2.0"))  # 부하 테스트용 가짜 생성 시간(초)
 
-# 이미지 생성 함수
-def generate_image(prompt: str, save_path: str = "static/generated/img1.png") -> str:
+# ===== 이미지 생성 provider: prompt → PNG 바이트 =====
+def openai_provider(prompt: str) -> bytes:
+    result = get_client().images.generate(prompt=prompt, **IMAGE_REQUEST)
+    return base64.b64decode(result.data[0].b64_json)
+
+def stub_provider(prompt: str) -> bytes:
+    """테스트/부하 측정용 로컬 생성기: prompt 해시로 결정되는 흑백 도형 그림 (OpenAI 호출 없음)"""
+    seed = hashlib.sha256(prompt.encode("utf-8")).digest()
+    image = Image.new("RGB", (1024, 1024), "white")
+    draw = ImageDraw.Draw(image)
+    for i in range(0, 24, 3):
+        x, y, r = seed[i] * 3 + 100, seed[i + 1] * 3 + 100, seed[i + 2] // 2 + 40
+        if i % 2:
+            draw.ellipse((x - r, y - r, x + r, y + r), outline="black", width=6)
+        else:
+            draw.rectangle((x - r, y - r, x + r, y + r), outline="black", width=6)
+    buf = BytesIO()
+    image.save(buf, format="PNG")
+    return buf.getvalue()
+
+@functools.lru_cache(maxsize=64)
+def _stub_png(prompt):
+    return stub_provider(prompt)
+
+def mock_provider(prompt: str) -> bytes:
+    """부하 테스트용: OpenAI 처럼 MOCK_PROVIDER_LATENCY 초 걸린 뒤 stub 그림 (서버 CPU 는 거의 안 씀)"""
+    time.sleep(MOCK_PROVIDER_LATENCY)
+    return _stub_png(prompt)
+
+# 비동기 provider (ASGI 모드): 기다리는 동안 스레드를 잡지 않는다
+async def openai_provider_async(prompt: str) -> bytes:
+    result = await get_async_client().images.generate(prompt=prompt, **IMAGE_REQUEST)
+    return base64.b64decode(result.data[0].b64_json)
+
+async def mock_provider_async(prompt: str) -> bytes:
+    await asyncio.sleep(MOCK_PROVIDER_LATENCY)
+    return _stub_png(prompt)
+
+def _to_async(provider):
+    async def run(prompt):
+        return await asyncio.to_thread(provider, prompt)
+    return run
+
+IMAGE_PROVIDERS = {
+    "openai": openai_provider,
+    "stub": stub_provider,
+    "mock": mock_provider,
+}
+
+ASYNC_IMAGE_PROVIDERS = {
+    "openai": openai_provider_async,
+    "stub": _to_async(stub_provider),
+    "mock": mock_provider_async,
+}
+
+_provider_name = os.environ.get("IMAGE_PROVIDER", "openai")
+_provider = IMAGE_PROVIDERS.get(_provider_name, openai_provider)
+_async_provider = ASYNC_IMAGE_PROVIDERS.get(_provider_name, openai_provider_async)
+
+# ===== 디스크를 거치지 않는 경로: prompt → 디코딩된 BGR 배열 (+ 백그라운드 PNG 저장) =====
+# provider 가 준 PNG 바이트를 cv2.imdecode 로 한 번만 디코딩해 컨투어 파이프라인에 바로 넘기고,
+# 파일은 별도 스레드에서 그 바이트 그대로(재인코딩/optimize 없이) 쓴다.
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-writer")
+
+def _write_image_file(save_path, image_bytes, image=None):
+    with stage_timer("png_save"):
+        if not image_bytes.startswith(PNG_SIGNATURE):
+            # PNG 가 아닌 provider 출력(JPEG 등)만 PNG 로 다시 인코딩 (압축 레벨 기본값)
+            if image is None:
+                image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+            ok, encoded = cv2.imencode(".png", image) if image is not None else (False, None)
+            if not ok:
+                raise ValueError(f"PNG 인코딩 실패: {save_path}")
+            image_bytes = encoded.tobytes()
+        # 정적 파일로 바로 제공되므로 다 쓴 뒤에 이름을 바꾼다 (반쯤 쓴 파일이 보이지 않게)
+        # 같은 prompt 를 여러 프로세스(uvicorn 워커)가 동시에 쓸 수 있으므로 임시 파일 이름은 쓰는 쪽마다 다르게
+        atomic_write(save_path, image_bytes)
+    return save_path
+
+def generate_image_array(prompt: str, save_path: str = "static/generated/img1.png"):
+    """
+    return: (BGR 이미지 배열, PNG 저장 Future)
+    Future.result() 는 저장된 경로를 반환한다 (URL 을 클라이언트에 주기 전에 기다릴 것).
+    """
     os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    with stage_timer("image_provider"):
+        image_bytes = _provider(prompt)
+    with stage_timer("image_decode"):
+        image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("생성된 이미지를 디코딩할 수 없습니다.")
+    return image, _writer.submit(_write_image_file, save_path, image_bytes, image)
 
-    result = client.images.generate(
-        model="gpt-image-1",
-        prompt=prompt,
-        quality="low",
-        size="1024x1024"
-    )
-
-    # Base64 → 이미지 변환
-    image_base64 = result.data[0].b64_json
-    image_bytes = base64.b64decode(image_base64)
-    image = Image.open(BytesIO(image_bytes))
-
-    # PNG로 저장
-    image.save(save_path, format="PNG", optimize=True)
-    return save_path
\ No newline at end of file
+async def generate_image_bytes_async(prompt: str, save_path: str = "static/generated/img1.png"):
+    """
+    ASGI 모드용: return (provider 이미지 바이트, PNG 저장 Future).
+    디코딩은 하지 않는다 — 바이트를 그대로 프로세스 풀로 넘기는 편이 픽셀 배열보다 작다.
+    """
+    os.makedirs(os.path.dirname(save_path), exist_ok=True)
+    with stage_timer("image_provider"):
+        image_bytes = await _async_provider(prompt)
+    return image_bytes, _writer.submit(_write_image_file, save_path, image_bytes)
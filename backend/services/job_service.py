@@ -0,0 +1,109 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# 오래 걸리는 작업(이미지 생성 → 컨투어 → DB 저장)을 요청 스레드 밖에서 실행하는 작업 큐
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+JOB_QUEUE_LIMIT = int(os.environ.get("JOB_QUEUE_LIMIT", "32"))   # 대기+실행 중 작업 최대 수
+JOB_TTL_SECONDS = int(os.environ.get("JOB_TTL_SECONDS", "3600"))  # 끝난 작업 결과 보관 시간
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, kind):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.done = threading.Event()
+
+    def to_dict(self):
+        data = {
+            "jobId": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+        }
+        if self.status == "done":
+            data["result"] = self.result
+        elif self.status == "error":
+            data["error"] = self.error
+        return data
+
+
+_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+_jobs = {}
+_lock = threading.Lock()
+
+
+def _pending_count():
+    return sum(1 for j in _jobs.values() if j.status in ("queued", "running"))
+
+
+def _purge_expired(now):
+    expired = [jid for jid, j in _jobs.items()
+               if j.finished_at is not None and now - j.finished_at > JOB_TTL_SECONDS]
+    for jid in expired:
+        del _jobs[jid]
+
+
+def _run(job, fn, args, kwargs):
+    job.status = "running"
+    job.started_at = time.time()
+    try:
+        job.result = fn(*args, **kwargs)
+        job.status = "done"
+    except Exception as e:
+        logger.exception("Job %s (%s) failed: %s", job.id, job.kind, e)
+        job.error = str(e)
+        job.status = "error"
+    finally:
+        job.finished_at = time.time()
+        job.done.set()
+
+
+def submit_job(kind, fn, *args, **kwargs):
+    """작업 등록 후 바로 Job 반환. 대기 중인 작업이 JOB_QUEUE_LIMIT 이상이면 QueueFullError."""
+    with _lock:
+        _purge_expired(time.time())
+        if _pending_count() >= JOB_QUEUE_LIMIT:
+            raise QueueFullError("작업 대기열이 가득 찼습니다.")
+        job = Job(kind)
+        _jobs[job.id] = job
+    _executor.submit(_run, job, fn, args, kwargs)
+    return job
+
+
+def get_job(job_id):
+    with _lock:
+        return _jobs.get(job_id)
+
+
+def wait_job(job_id, timeout):
+    """long-poll: 작업이 끝나거나 timeout(초)이 지날 때까지 대기"""
+    job = get_job(job_id)
+    if job is not None:
+        job.done.wait(timeout)
+    return job
+
+
+def job_stats():
+    with _lock:
+        counts = {}
+        for j in _jobs.values():
+            counts[j.status] = counts.get(j.status, 0) + 1
+    return {"workers": JOB_WORKERS, "queueLimit": JOB_QUEUE_LIMIT, "jobs": counts}
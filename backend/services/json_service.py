@@ -1,23 +1,146 @@
+import argparse
+import mmap
 import re
 import json
+import struct
 from pathlib import Path
 
+import numpy as np
+
+from services.disk_cache import atomic_write
+
 # EV3 축 기준 최대값
 AXIS_MAX_X = 400
 AXIS_MAX_Y = 1100
 
-def parse_contours(raw_text):
-    blocks = re.split(r'#\s*contour\s*\d+', raw_text)[1:]
-    contours = []
-    for blk in blocks:
-        pts = []
-        for line in blk.strip().splitlines():
-            m = re.match(r'\s*(\d+)\s*,\s*(\d+)\s*$', line)
-            if m:
-                pts.append((int(m.group(1)), int(m.group(2))))
-        if pts:
-            contours.append(pts)
-    return contours
+# '# contour N' 헤더, 그리고 헤더 사이 블록에서 좌표 줄을 고르는 기존 규칙
+_HEADER_RE = re.compile(r'#\s*contour\s*\d+')
+_POINT_LINE_RE = re.compile(r'\s*(\d+)\s*,\s*(\d+)\s*$')
+_MAX_LINE_DIGITS = 18   # int64 안전 범위 (넘으면 느린 경로)
+
+# 바이트 분류: 0 그 외, 1 숫자, 2 콤마, 3 \n, 4 공백/탭, 5 \r
+_CHAR_CLASS = np.zeros(256, dtype=np.uint8)
+_CHAR_CLASS[48:58] = 1
+_CHAR_CLASS[44] = 2
+_CHAR_CLASS[10] = 3
+_CHAR_CLASS[[32, 9]] = 4
+_CHAR_CLASS[13] = 5
+# 공백을 뺀 인접 문자 쌍 중 허용되는 것: 숫자-숫자, 숫자-콤마, 콤마-숫자, 숫자-\n, \n-숫자, \n-\n
+_ALLOWED_PAIR = np.zeros(16, dtype=bool)
+_ALLOWED_PAIR[[1 * 4 + 1, 1 * 4 + 2, 2 * 4 + 1, 1 * 4 + 3, 3 * 4 + 1, 3 * 4 + 3]] = True
+
+def _clean_point_counts(text, bounds):
+    """
+    text 가 'x,y' 줄과 빈 줄로만 되어 있으면 (ASCII, 공백/탭 허용, CRLF 허용)
+    bounds[i]:bounds[i+1] 구간마다 점 개수를 반환하고, 아니면 None.
+    정규식 대신 바이트 배열 마스크로 한 번에 검사한다.
+    """
+    try:
+        b = np.frombuffer(text.encode("ascii") + b"\n", dtype=np.uint8)
+    except UnicodeEncodeError:
+        return None
+    cls = _CHAR_CLASS.take(b)
+    if not cls.all():
+        return None
+    cr = np.flatnonzero(cls == 5)
+    if cr.size and not np.all(b[cr + 1] == 10):
+        return None   # 단독 \r 은 splitlines 에서 줄바꿈이므로 느린 경로로
+    kept_pos = np.flatnonzero(cls < 4)
+    k = cls.take(kept_pos)
+    pair = k[:-1] * 4 + k[1:]
+    if k[0] == 2 or not _ALLOWED_PAIR.take(pair).all():
+        return None
+    # "1 2" 처럼 공백으로 떨어진 숫자
+    if np.any((pair == 1 * 4 + 1) & (np.diff(kept_pos) > 1)):
+        return None
+    # 줄마다 콤마 0개(빈 줄) 또는 1개, 숫자가 있는 줄은 콤마 1개
+    newlines = np.flatnonzero(k == 3)
+    commas = np.flatnonzero(k == 2)
+    commas_per_line = np.diff(np.searchsorted(commas, newlines), prepend=0)
+    digits_per_line = np.diff(newlines, prepend=-1) - 1 - commas_per_line
+    if np.any(commas_per_line > 1) or np.any((digits_per_line > 0) != (commas_per_line == 1)):
+        return None
+    if np.any(digits_per_line > _MAX_LINE_DIGITS):
+        return None
+    return np.diff(np.searchsorted(kept_pos[commas], bounds))
+
+def _parse_block_slow(blk):
+    pts = []
+    for line in blk.strip().splitlines():
+        m = _POINT_LINE_RE.match(line)
+        if m:
+            pts.append((int(m.group(1)), int(m.group(2))))
+    try:
+        return np.array(pts, dtype=np.int64).reshape(-1, 2)
+    except OverflowError:
+        return np.array(pts, dtype=object).reshape(-1, 2)   # int64 를 넘는 값은 그대로 보존
+
+def _parse_blocks(blocks):
+    """
+    헤더 사이 블록들 → 비어 있지 않은 contour 의 (k, 2) int64 배열 리스트.
+    전체가 깨끗하면 np.fromstring 한 번으로 변환해 블록별로 나누고 (view),
+    아니면 블록마다 같은 검사 후 깨끗하지 않은 블록만 줄 단위 정규식으로 처리한다.
+    """
+    if not blocks:
+        return []
+    text = "\n".join(blocks)
+    bounds = np.cumsum([0] + [len(blk) + 1 for blk in blocks])
+    counts = _clean_point_counts(text, bounds)
+    if counts is not None:
+        if not counts.any():
+            return []
+        pts = np.fromstring(text.replace(",", " "), dtype=np.int64, sep=" ").reshape(-1, 2)
+        ends = np.cumsum(counts)
+        return [pts[e - n:e] for n, e in zip(counts.tolist(), ends.tolist()) if n]
+    if len(blocks) == 1:
+        pts = _parse_block_slow(blocks[0])
+        return [pts] if pts.shape[0] else []
+    return [pts for blk in blocks for pts in _parse_blocks([blk])]
+
+def parse_contours_np(raw_text, header_re=_HEADER_RE):
+    """
+    txt 전체 → contour 별 (k, 2) int64 배열 리스트 (parse_contours 와 같은 규칙)
+    header_re: contour 헤더 정규식 (drawing_bot/contour_processor 는 대소문자 무시 버전을 넘긴다)
+    """
+    matches = list(header_re.finditer(raw_text))
+    ends = [m.start() for m in matches[1:]] + [len(raw_text)]
+    return _parse_blocks([raw_text[m.end():e] for m, e in zip(matches, ends)])
+
+def parse_contours(raw_text, header_re=_HEADER_RE):
+    return [list(map(tuple, pts.tolist())) for pts in parse_contours_np(raw_text, header_re)]
+
+def iter_contours(path, chunk_size=1 << 20, header_re=_HEADER_RE):
+    """
+    큰 txt 파일용 스트리밍 파서: 파일을 chunk_size 씩 읽으며 contour 를 하나씩 (k, 2) 배열로 yield.
+    헤더가 chunk 경계에 걸쳐도 다음 chunk 를 읽은 뒤에 판단하므로 결과는 parse_contours_np 와 같다.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        start = None   # 현재 블록 시작 위치 (첫 헤더 전이면 None)
+        eof = False
+        while not eof:
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf += chunk
+            pos = 0 if start is None else start
+            blocks = []
+            while True:
+                m = header_re.search(buf, pos)
+                # 버퍼 끝에 닿은 헤더는 숫자가 더 이어질 수 있으므로 다음 chunk 까지 보류
+                if m is None or (m.end() == len(buf) and not eof):
+                    break
+                if start is not None:
+                    blocks.append(buf[start:m.start()])
+                start = pos = m.end()
+            yield from _parse_blocks(blocks)
+            if start is None:
+                # 헤더 전 텍스트는 버리되, 걸쳐 있을 수 있는 헤더 앞부분은 남긴다
+                cut = buf.rfind('#')
+                buf = buf[cut:] if cut >= 0 else ""
+            else:
+                buf, start = buf[start:], 0
+        if start is not None:
+            yield from _parse_blocks([buf[start:]])
 
 def scale_contours(contours):
     xs = [x for c in contours for x,_ in c]
@@ -52,4 +175,190 @@ def contours_txt_to_json(txt_files, outfile_path):
             f.write("\n")
 
     print(f"✔ {outfile.name} 생성 완료: {len(all_contours)} contours")
-    return str(outfile)
\ No newline at end of file
+    return str(outfile)
+
+# ===== 바이너리 컨투어 형식 (.bin) =====
+# 헤더(24B, little-endian): magic "BSKC", version, encoding, 예약(2B), scale(float64), contour 수, point 수
+# 그 뒤: offsets uint32[contour 수 + 1] (point 단위) → 좌표 payload
+# - 좌표는 round(값 * scale) 정수로 저장 (정수 좌표는 scale=1, 실수 좌표는 예: scale=100 → 0.01 단위)
+# - encoding
+#     raw16  : 절대 좌표 int16        → mmap 위에 그대로 NumPy view (완전 zero-copy)
+#     delta16: 직전 점과의 차이 int16  → view + cumsum 한 번
+#     varint : 차이를 zigzag 후 (dx, dy) 비트를 교차(Morton)해 점 하나당 varint 하나
+#              → 이웃 픽셀 이동(|d| <= 3)은 1바이트, 가장 작음 (저장/DB 용)
+#     f64    : 절대 좌표 float64 그대로 (반올림 없음, scale 무시) → 실수 좌표를 손실 없이 저장
+BIN_MAGIC = b"BSKC"
+BIN_VERSION = 1
+BIN_ENCODINGS = {"raw16": 0, "delta16": 1, "varint": 2, "f64": 3}
+_BIN_ENCODING_NAMES = {v: k for k, v in BIN_ENCODINGS.items()}
+_BIN_HEADER = struct.Struct("<4sBBHdII")
+
+def _zigzag(v):
+    return ((v << 1) ^ (v >> 63)).astype(np.uint64)
+
+def _unzigzag(u):
+    return (u >> np.uint64(1)).astype(np.int64) ^ -(u & np.uint64(1)).astype(np.int64)
+
+_MORTON_MASKS = [(16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F),
+                 (2, 0x3333333333333333), (1, 0x5555555555555555)]
+
+def _spread_bits(v):
+    """하위 32비트를 짝수 비트 자리로 벌린다"""
+    v = v & np.uint64(0xFFFFFFFF)
+    for shift, mask in _MORTON_MASKS:
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+    return v
+
+def _compact_bits(v):
+    """_spread_bits 의 역"""
+    v = v & np.uint64(0x5555555555555555)
+    for shift, mask in [(1, 0x3333333333333333), (2, 0x0F0F0F0F0F0F0F0F), (4, 0x00FF00FF00FF00FF),
+                        (8, 0x0000FFFF0000FFFF), (16, 0x00000000FFFFFFFF)]:
+        v = (v | (v >> np.uint64(shift))) & np.uint64(mask)
+    return v
+
+def _varint_encode(values):
+    """uint64 배열 → varint 바이트 (벡터화)"""
+    values = values.astype(np.uint64)
+    nbytes = np.ones(values.shape[0], dtype=np.int64)
+    for k in range(1, 10):
+        nbytes += values >= np.uint64(1 << (7 * k))
+    ends = np.cumsum(nbytes)
+    out = np.empty(int(ends[-1]) if ends.size else 0, dtype=np.uint8)
+    starts = ends - nbytes
+    for k in range(int(nbytes.max()) if nbytes.size else 0):
+        m = nbytes > k
+        byte = (values[m] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (nbytes[m] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[m] + k] = (byte | more).astype(np.uint8)
+    return out.tobytes()
+
+def _varint_decode(data, count):
+    """varint 바이트 → uint64 배열 (벡터화)"""
+    b = np.frombuffer(data, dtype=np.uint8)
+    last = b < 0x80
+    if int(np.count_nonzero(last)) != count:
+        raise ValueError("varint payload 길이가 헤더와 다릅니다.")
+    if not b.size:
+        return np.zeros(0, dtype=np.uint64)
+    value_idx = np.concatenate(([0], np.cumsum(last)[:-1]))
+    starts = np.flatnonzero(np.concatenate(([True], last[:-1])))
+    shift = (np.arange(b.size) - starts[value_idx]) * 7
+    contrib = (b & 0x7F).astype(np.uint64) << shift.astype(np.uint64)
+    return np.add.reduceat(contrib, starts)
+
+def _as_packed(contours):
+    """컨투어 리스트 → (coords (n, 2) float64, offsets uint32)"""
+    arrays = [np.asarray(c, dtype=np.float64).reshape(-1, 2) for c in contours]
+    offsets = np.zeros(len(arrays) + 1, dtype=np.uint32)
+    if arrays:
+        offsets[1:] = np.cumsum([a.shape[0] for a in arrays])
+    coords = np.concatenate(arrays) if arrays else np.zeros((0, 2))
+    return coords, offsets
+
+def encode_contours_bin(contours, encoding="varint", scale=1.0, offsets=None):
+    """
+    contours: [[x, y], ...] 리스트들, 또는 offsets 와 함께 (n, 2) 좌표 배열
+    return: bytes
+    """
+    if offsets is None:
+        coords, offsets = _as_packed(contours)
+    else:
+        coords = np.asarray(contours).reshape(-1, 2)
+        offsets = np.asarray(offsets, dtype=np.uint32)
+    if encoding == "f64":
+        header = _BIN_HEADER.pack(BIN_MAGIC, BIN_VERSION, BIN_ENCODINGS["f64"], 0, 1.0, len(offsets) - 1, coords.shape[0])
+        return header + offsets.astype("<u4").tobytes() + np.asarray(coords, dtype="<f8").tobytes()
+    ints = np.rint(coords * scale).astype(np.int64) if scale != 1 else np.rint(coords).astype(np.int64)
+    code = BIN_ENCODINGS[encoding]
+    if encoding == "raw16":
+        values = ints
+    else:
+        values = np.diff(ints, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+    if encoding == "varint":
+        zz = _zigzag(values)
+        if zz.size and int(zz.max()) > 0xFFFFFFFF:
+            raise ValueError("varint: 좌표 차이가 너무 큽니다.")
+        payload = _varint_encode(_spread_bits(zz[:, 0]) | (_spread_bits(zz[:, 1]) << np.uint64(1)))
+    else:
+        values = values.reshape(-1)
+        if values.size and (values.min() < -32768 or values.max() > 32767):
+            raise ValueError(f"{encoding}: int16 범위를 벗어난 좌표입니다 (varint 를 사용하세요).")
+        payload = values.astype("<i2").tobytes()
+    header = _BIN_HEADER.pack(BIN_MAGIC, BIN_VERSION, code, 0, float(scale), len(offsets) - 1, coords.shape[0])
+    return header + offsets.astype("<u4").tobytes() + payload
+
+def decode_contours_bin(buf):
+    """
+    bytes / mmap → (coords, offsets, scale)
+    coords: (n, 2) — raw16/f64 는 버퍼 위의 int16/float64 view, delta16/varint 는 int32 (scale != 1 이면 float64)
+    offsets: uint32 view, contour i = coords[offsets[i]:offsets[i + 1]]
+    """
+    magic, version, code, _, scale, n_contours, n_points = _BIN_HEADER.unpack_from(buf, 0)
+    if magic != BIN_MAGIC:
+        raise ValueError("BSKC 바이너리 컨투어 파일이 아닙니다.")
+    if version != BIN_VERSION:
+        raise ValueError(f"지원하지 않는 버전: {version}")
+    encoding = _BIN_ENCODING_NAMES.get(code)
+    pos = _BIN_HEADER.size
+    offsets = np.frombuffer(buf, dtype="<u4", count=n_contours + 1, offset=pos)
+    pos += offsets.nbytes
+    if encoding == "varint":
+        packed = _varint_decode(memoryview(buf)[pos:], n_points)
+        values = np.stack((_unzigzag(_compact_bits(packed)), _unzigzag(_compact_bits(packed >> np.uint64(1)))), axis=1)
+    elif encoding in ("raw16", "delta16"):
+        values = np.frombuffer(buf, dtype="<i2", count=n_points * 2, offset=pos)
+    elif encoding == "f64":
+        values = np.frombuffer(buf, dtype="<f8", count=n_points * 2, offset=pos)
+    else:
+        raise ValueError(f"알 수 없는 encoding: {code}")
+    coords = values.reshape(-1, 2)
+    if encoding not in ("raw16", "f64"):
+        coords = np.cumsum(coords, axis=0, dtype=np.int32)
+    if scale != 1:
+        coords = coords / scale
+    return coords, offsets, scale
+
+def contours_from_bin(coords, offsets):
+    """(coords, offsets) → contour 별 (k, 2) view 리스트"""
+    return [coords[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+def write_contours_bin(path, contours, encoding="varint", scale=1.0):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(path, encode_contours_bin(contours, encoding=encoding, scale=scale))
+    return str(path)
+
+def read_contours_bin(path, use_mmap=True):
+    """파일 → (coords, offsets, scale). use_mmap=True 면 파일을 복사하지 않고 mmap 위의 view 로 읽는다."""
+    with open(path, "rb") as f:
+        if not use_mmap:
+            return decode_contours_bin(f.read())
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return decode_contours_bin(mm)
+
+def convert_txt_tree(src_dir, dst_dir, encoding="varint"):
+    """'# contour N' txt 트리(drawing_bot/contour_txt) → 같은 구조의 .bin 트리. return: (txt 바이트, bin 바이트)"""
+    src_dir, dst_dir = Path(src_dir), Path(dst_dir)
+    txt_bytes = bin_bytes = 0
+    for txt in sorted(src_dir.rglob("*.txt")):
+        out = dst_dir / txt.relative_to(src_dir).with_suffix(".bin")
+        write_contours_bin(out, parse_contours_np(txt.read_text(encoding="utf-8")), encoding=encoding)
+        txt_bytes += txt.stat().st_size
+        bin_bytes += out.stat().st_size
+        print(f"{txt} → {out}")
+    return txt_bytes, bin_bytes
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert '# contour N' txt files to the BSKC binary contour format.")
+    parser.add_argument("src", help="txt 폴더 (예: drawing_bot/contour_txt)")
+    parser.add_argument("dst", help="출력 폴더 (예: drawing_bot/contour_bin)")
+    parser.add_argument("--encoding", choices=sorted(BIN_ENCODINGS), default="varint")
+    args = parser.parse_args()
+
+    txt_bytes, bin_bytes = convert_txt_tree(args.src, args.dst, args.encoding)
+    if bin_bytes:
+        print(f"✔ {txt_bytes / 1024:.0f} KB → {bin_bytes / 1024:.0f} KB ({txt_bytes / bin_bytes:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import collections
+import contextlib
+import math
+import os
+import threading
+import time
+
+# 요청 경로 계측: 단계별 타이머, 점/컨투어 수, 엔드포인트별 지연 시간 (최근 METRICS_WINDOW 개 기준 p50/p95/p99)
+# - METRICS=1 로 켜서 시작하거나 실행 중 set_enabled() (/api/metrics) 로 켜고 끈다
+# - 꺼져 있으면 timer() 는 공용 nullcontext, observe()/inc() 는 바로 반환, 파이프라인 hook 도 등록 해제
+METRICS_WINDOW = int(os.environ.get("METRICS_WINDOW", "1024"))
+METRICS_PREFIX = "drawbot_"
+QUANTILES = (0.5, 0.95, 0.99)
+
+_enabled = False
+_lock = threading.Lock()
+_series = {}     # (name, labels) → _Series
+_counters = {}   # (name, labels) → float
+_NOOP = contextlib.nullcontext()
+
+
+class _Series:
+    __slots__ = ("window", "count", "total")
+
+    def __init__(self):
+        self.window = collections.deque(maxlen=METRICS_WINDOW)
+        self.count = 0
+        self.total = 0.0
+
+    def quantiles(self):
+        values = sorted(self.window)
+        if not values:
+            return {q: 0.0 for q in QUANTILES}
+        # nearest-rank
+        return {q: values[max(0, math.ceil(q * len(values)) - 1)] for q in QUANTILES}
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def metrics_enabled():
+    return _enabled
+
+
+def set_enabled(on):
+    """계측 켜기/끄기. 컨투어 파이프라인 hook 도 같이 등록/해제한다."""
+    global _enabled
+    from services.contour_service import add_pipeline_hook, remove_pipeline_hook
+    _enabled = bool(on)
+    if _enabled:
+        add_pipeline_hook(_pipeline_hook)
+    else:
+        remove_pipeline_hook(_pipeline_hook)
+
+
+def reset():
+    with _lock:
+        _series.clear()
+        _counters.clear()
+
+
+def observe(name, value, **labels):
+    """값 하나 기록 (지연 시간, 그림 하나의 점 수 등) → 누적 count/sum + 최근 값 분위수"""
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        series = _series.get(key)
+        if series is None:
+            series = _series[key] = _Series()
+        series.window.append(value)
+        series.count += 1
+        series.total += value
+
+
+def inc(name, value=1, **labels):
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+def timer(name, **labels):
+    """with timer("stage_seconds", stage="png_save"): ...  (꺼져 있으면 아무것도 하지 않음)"""
+    return _Timer(name, labels) if _enabled else _NOOP
+
+
+def stage_timer(stage):
+    return timer("stage_seconds", stage=stage)
+
+
+def _pipeline_hook(stage, seconds, ctx):
+    observe("stage_seconds", seconds, stage=stage)
+
+
+def snapshot():
+    """JSON 용: {"enabled", "series": [...], "counters": [...]}"""
+    with _lock:
+        series = [(k, s.count, s.total, s.quantiles()) for k, s in _series.items()]
+        counters = list(_counters.items())
+    return {
+        "enabled": _enabled,
+        "window": METRICS_WINDOW,
+        "series": [
+            {"name": name, "labels": dict(labels), "count": count, "sum": round(total, 6),
+             "quantiles": {str(q): round(v, 6) for q, v in qs.items()}}
+            for (name, labels), count, total, qs in sorted(series)
+        ],
+        "counters": [{"name": name, "labels": dict(labels), "value": value}
+                     for (name, labels), value in sorted(counters)],
+    }
+
+
+def _label_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def render_prometheus():
+    """Prometheus text format (0.0.4). 관측값은 summary(분위수는 최근 창 기준), 카운터는 counter."""
+    with _lock:
+        series = sorted((k, s.count, s.total, s.quantiles()) for k, s in _series.items())
+        counters = sorted(_counters.items())
+    lines = [f"# TYPE {METRICS_PREFIX}metrics_enabled gauge", f"{METRICS_PREFIX}metrics_enabled {int(_enabled)}"]
+    current = None
+    for (name, labels), count, total, qs in series:
+        full = METRICS_PREFIX + name
+        if name != current:
+            lines.append(f"# TYPE {full} summary")
+            current = name
+        for q, v in qs.items():
+            lines.append(f"{full}{_label_text(labels, [('quantile', q)])} {v:.6g}")
+        lines.append(f"{full}_sum{_label_text(labels)} {total:.6g}")
+        lines.append(f"{full}_count{_label_text(labels)} {count}")
+    current = None
+    for (name, labels), value in counters:
+        full = METRICS_PREFIX + name
+        if name != current:
+            lines.append(f"# TYPE {full} counter")
+            current = name
+        lines.append(f"{full}{_label_text(labels)} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+if os.environ.get("METRICS", "0") == "1":
+    set_enabled(True)
@@ -0,0 +1,22 @@
+import os
+from openai import AsyncOpenAI, OpenAI
+
+# 프로세스당 OpenAI 클라이언트 하나씩 (동기/비동기). 내부 httpx 연결 풀을 요청 간에 재사용한다.
+# import 시점에 만들지 않으므로 API 키 없이도(mock/stub provider) 서버를 띄울 수 있다.
+_client = None
+_async_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    return _client
+
+
+def get_async_client():
+    """ASGI 모드용. 이벤트 루프 하나(uvicorn 워커 프로세스 하나)에서만 쓸 것."""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    return _async_client
@@ -0,0 +1,215 @@
+import math
+import time
+
+import numpy as np
+
+# 펜을 든 채 이동하는 거리(pen-up travel)를 줄이기 위한 컨투어 순서/시작점 최적화
+# - nearest neighbour (격자 공간 인덱스) 로 초기 순서 결정
+# - 2-opt 로 구간 뒤집기 개선 (시간 제한)
+# - 닫힌 컨투어는 시작 꼭짓점 회전, 열린 컨투어는 필요 시 역방향
+CLOSED_TOL = 2.0  # 첫 점/끝 점이 이 거리(축별) 이내면 닫힌 컨투어로 취급 (EV3 move_to tol과 동일)
+
+
+def pen_up_distance(segments, start=(0.0, 0.0)):
+    """start 에서 출발해 segments 를 순서대로 그릴 때 펜을 든 채 이동하는 총 거리"""
+    total = 0.0
+    px, py = float(start[0]), float(start[1])
+    for seg in segments:
+        if len(seg) == 0:
+            continue
+        x0, y0 = seg[0]
+        total += math.hypot(x0 - px, y0 - py)
+        px, py = seg[-1]
+    return total
+
+
+def _is_closed(pts, tol=CLOSED_TOL):
+    if pts.shape[0] < 3:
+        return False
+    return bool(np.all(np.abs(pts[0] - pts[-1]) <= tol))
+
+
+def _loop_base(pts):
+    """닫힌 컨투어의 꼭짓점 (마지막 중복점 제외)"""
+    if np.array_equal(pts[0], pts[-1]):
+        return pts[:-1]
+    return pts
+
+
+def _rotate_loop(pts, k):
+    base = _loop_base(pts)
+    return np.concatenate((base[k:], base[:k], base[k:k + 1]))
+
+
+class _GridIndex:
+    """후보 시작점들을 균일 격자에 넣어두고 가장 가까운 미사용 후보를 찾는다."""
+
+    def __init__(self, points, owners, cell_size):
+        self.points = points
+        self.owners = owners
+        self.cell = max(cell_size, 1e-6)
+        self.cells = {}
+        keys = np.floor(points / self.cell).astype(np.int64)
+        for idx, (cx, cy) in enumerate(keys.tolist()):
+            self.cells.setdefault((cx, cy), []).append(idx)
+        self.min_key = keys.min(axis=0).tolist() if len(points) else [0, 0]
+        self.max_key = keys.max(axis=0).tolist() if len(points) else [0, 0]
+
+    def nearest(self, q, used):
+        qx, qy = float(q[0]), float(q[1])
+        ccx, ccy = int(math.floor(qx / self.cell)), int(math.floor(qy / self.cell))
+        max_ring = max(abs(ccx - self.min_key[0]), abs(ccx - self.max_key[0]),
+                       abs(ccy - self.min_key[1]), abs(ccy - self.max_key[1]))
+        best, best_d = -1, float("inf")
+        pts = self.points
+        for r in range(max_ring + 1):
+            for cx in range(ccx - r, ccx + r + 1):
+                edge = cx == ccx - r or cx == ccx + r
+                for cy in ((range(ccy - r, ccy + r + 1)) if edge else (ccy - r, ccy + r)):
+                    bucket = self.cells.get((cx, cy))
+                    if not bucket:
+                        continue
+                    alive = [i for i in bucket if not used[self.owners[i]]]
+                    if len(alive) != len(bucket):
+                        if alive:
+                            self.cells[(cx, cy)] = alive
+                        else:
+                            del self.cells[(cx, cy)]
+                    for i in alive:
+                        d = math.hypot(pts[i, 0] - qx, pts[i, 1] - qy)
+                        if d < best_d:
+                            best, best_d = i, d
+            # 다음 링의 모든 점은 r*cell 보다 멀다
+            if best >= 0 and best_d <= r * self.cell:
+                break
+        return best
+
+
+def _greedy_order(segs, closed, start, allow_reverse):
+    """nearest neighbour 순서 + 각 컨투어의 진입 꼭짓점 (열린 컨투어는 0 또는 -1)"""
+    cand_pts, cand_owner, cand_vertex = [], [], []
+    for i, pts in enumerate(segs):
+        if closed[i]:
+            base = _loop_base(pts)
+            cand_pts.append(base)
+            cand_owner.append(np.full(base.shape[0], i, dtype=np.int64))
+            cand_vertex.append(np.arange(base.shape[0], dtype=np.int64))
+        else:
+            ends = pts[[0, -1]] if (allow_reverse and pts.shape[0] > 1) else pts[:1]
+            cand_pts.append(ends)
+            cand_owner.append(np.full(ends.shape[0], i, dtype=np.int64))
+            cand_vertex.append(np.array([0, -1][:ends.shape[0]], dtype=np.int64))
+    points = np.concatenate(cand_pts).astype(np.float64)
+    owners = np.concatenate(cand_owner)
+    vertices = np.concatenate(cand_vertex)
+
+    span = np.ptp(points, axis=0).max() if points.shape[0] > 1 else 1.0
+    index = _GridIndex(points, owners.tolist(), span / max(1.0, math.sqrt(points.shape[0])) * 2.0)
+    used = [False] * len(segs)
+    order, entry = [], []
+    pos = start
+    for _ in range(len(segs)):
+        c = index.nearest(pos, used)
+        i = int(owners[c])
+        used[i] = True
+        order.append(i)
+        entry.append(int(vertices[c]))
+        if closed[i]:
+            pos = points[c]
+        else:
+            pos = segs[i][0] if vertices[c] == -1 else segs[i][-1]
+    return order, entry
+
+
+def _two_opt(entry_pts, exit_pts, start, time_budget):
+    """
+    구간 [i..j] 를 뒤집었을 때 줄어드는 펜업 거리(gain)를 j 에 대해 벡터화 계산.
+    뒤집힌 구간의 컨투어는 방향도 뒤집히므로 진입/탈출 점이 서로 바뀐다.
+    return: 뒤집기가 반영된 순서 인덱스와 각 컨투어의 역방향 여부
+    """
+    n = entry_pts.shape[0]
+    perm = np.arange(n)
+    flipped = np.zeros(n, dtype=bool)
+    if n < 3:
+        return perm, flipped
+    deadline = time.perf_counter() + time_budget
+    start = np.asarray(start, dtype=np.float64)
+
+    def cur_entry():
+        return np.where(flipped[:, None], exit_pts[perm], entry_pts[perm])
+
+    def cur_exit():
+        return np.where(flipped[:, None], entry_pts[perm], exit_pts[perm])
+
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        en, ex = cur_entry(), cur_exit()
+        en_next = np.vstack((en[1:], en[-1:]))
+        for i in range(n - 1):
+            prev = start if i == 0 else ex[i - 1]
+            js = np.arange(i + 1, n)
+            has_next = js < n - 1
+            old = math.hypot(*(prev - en[i])) + np.where(has_next, np.hypot(*(ex[js] - en_next[js]).T), 0.0)
+            new = np.hypot(*(prev - ex[js]).T) + np.where(has_next, np.hypot(*(en[i] - en_next[js]).T), 0.0)
+            gain = old - new
+            k = int(np.argmax(gain))
+            if gain[k] > 1e-9:
+                j = int(js[k])
+                perm[i:j + 1] = perm[i:j + 1][::-1].copy()
+                flipped[i:j + 1] = ~flipped[i:j + 1][::-1]
+                en, ex = cur_entry(), cur_exit()
+                en_next = np.vstack((en[1:], en[-1:]))
+                improved = True
+            if time.perf_counter() >= deadline:
+                break
+    return perm, flipped
+
+
+def optimize_pen_path(segments, start=(0.0, 0.0), allow_reverse=True, two_opt_seconds=0.2):
+    """
+    segments: 좌표 배열 (k, 2) 리스트. 그리는 선은 바꾸지 않고 순서/시작점/방향만 바꾼다.
+    return: (최적화된 segments, 마지막 펜 위치)
+    """
+    segs = [np.asarray(s, dtype=np.float64).reshape(-1, 2) for s in segments]
+    segs = [s for s in segs if s.shape[0] > 0]
+    if not segs:
+        return [], tuple(start)
+
+    closed = [_is_closed(s) for s in segs]
+    order, entry = _greedy_order(segs, closed, start, allow_reverse)
+
+    # 1) greedy 결과 배치
+    placed = []
+    for i, v in zip(order, entry):
+        s = segs[i]
+        if closed[i]:
+            s = _rotate_loop(s, v)
+        elif v == -1:
+            s = s[::-1]
+        placed.append((s, closed[i]))
+
+    # 2) 2-opt (닫힌 컨투어는 진입=탈출 이므로 방향과 무관)
+    entry_pts = np.array([s[0] for s, _ in placed])
+    exit_pts = np.array([s[-1] for s, _ in placed])
+    if allow_reverse:
+        perm, flipped = _two_opt(entry_pts, exit_pts, start, two_opt_seconds)
+        placed = [(placed[p][0][::-1] if f else placed[p][0], placed[p][1])
+                  for p, f in zip(perm.tolist(), flipped.tolist())]
+
+    # 3) 닫힌 컨투어 시작 꼭짓점 재선택: 이전 탈출점 + 다음 진입점 거리 합 최소
+    result = [s for s, _ in placed]
+    for k, (s, is_closed) in enumerate(placed):
+        if not is_closed:
+            continue
+        prev = np.asarray(start, dtype=np.float64) if k == 0 else result[k - 1][-1]
+        base = _loop_base(s)
+        cost = np.hypot(*(base - prev).T)
+        if k + 1 < len(result):
+            cost = cost + np.hypot(*(base - result[k + 1][0]).T)
+        result[k] = _rotate_loop(s, int(np.argmin(cost)))
+
+    # greedy + 2-opt 는 최적을 보장하지 않는다 → 원래 순서보다 나빠지면 원래 순서 그대로
+    if pen_up_distance(result, start) > pen_up_distance(segs, start):
+        result = segs
+    return result, (float(result[-1][-1][0]), float(result[-1][-1][1]))
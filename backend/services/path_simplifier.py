@@ -0,0 +1,114 @@
+import numpy as np
+
+from services.plot_simulator import PEN_SECONDS, move_seconds
+
+# 최종 캔버스 좌표(= 모터 각도, 기어비 1.0)에서의 폴리라인 단순화
+# - Douglas–Peucker 를 끝까지 한 번 돌려 점마다 "제거되는 허용오차"를 구해두고,
+#   허용오차/꼭짓점 수/예상 시간 예산은 그 값에 대한 임계값으로 빠르게 탐색한다.
+# - 마지막으로 모터 각도 기준 최소 이동 거리(min_step) 보다 짧은 이동을 제거한다.
+MIN_STEP_DEG = 2.0      # EV3 move_to 의 tol=2 보다 짧은 이동은 의미가 없음
+MAX_TOLERANCE = 20.0    # 예산 탐색 시 허용오차 상한 (캔버스 단위)
+
+
+def _segment_significance(pts):
+    """
+    Douglas–Peucker 분할 트리에서 각 점이 제거되는 허용오차.
+    부모보다 커지지 않도록 보정하므로 tol 로 단순화 == (significance > tol) 인 점만 남기기.
+    양 끝점은 inf.
+    """
+    n = pts.shape[0]
+    sig = np.full(n, np.inf)
+    if n <= 2:
+        return sig
+    stack = [(0, n - 1, np.inf)]
+    while stack:
+        a, b, cap = stack.pop()
+        if b - a < 2:
+            continue
+        inner = pts[a + 1:b]
+        p, q = pts[a], pts[b]
+        d = q - p
+        length = np.hypot(d[0], d[1])
+        rel = inner - p
+        if length > 0:
+            dist = np.abs(d[0] * rel[:, 1] - d[1] * rel[:, 0]) / length
+        else:
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        k = int(np.argmax(dist))
+        value = min(float(dist[k]), cap)
+        m = a + 1 + k
+        sig[m] = value
+        stack.append((a, m, value))
+        stack.append((m, b, value))
+    return sig
+
+
+def _min_step_filter(pts, min_step):
+    """직전에 남긴 점과 축별 이동량이 모두 min_step 미만인 점 제거 (마지막 점은 유지)"""
+    if pts.shape[0] <= 2 or min_step <= 0:
+        return pts
+    keep = [0]
+    last = pts[0]
+    for i in range(1, pts.shape[0] - 1):
+        if np.max(np.abs(pts[i] - last)) >= min_step:
+            keep.append(i)
+            last = pts[i]
+    keep.append(pts.shape[0] - 1)
+    return pts[keep]
+
+
+def _pen_down_seconds(segments, significance, tol):
+    """예산 탐색용: 펜업 이동을 제외한 예상 시간 (경로 순서 최적화 전에도 의미 있음)"""
+    total = 0.0
+    for seg, sig in zip(segments, significance):
+        kept = seg[sig > tol]
+        d = np.diff(kept, axis=0)
+        total += float(move_seconds(d[:, 0], d[:, 1]).sum()) + 2 * PEN_SECONDS
+    return total
+
+
+def simplify_segments(segments, tolerance=None, max_vertices=None, max_seconds=None,
+                      min_step=MIN_STEP_DEG, max_tolerance=MAX_TOLERANCE):
+    """
+    segments: (k, 2) 좌표 배열 리스트 (최종 캔버스 좌표)
+    - tolerance 만 주면: 그 허용오차로 단순화
+    - max_vertices / max_seconds 를 주면: 예산을 만족하는 가장 작은 허용오차를 이분 탐색
+      (tolerance 가 있으면 그것이 상한, 없으면 max_tolerance)
+    return: (단순화된 segments, 사용한 허용오차)
+    """
+    segs = [np.asarray(s, dtype=np.float64).reshape(-1, 2) for s in segments]
+    significance = [_segment_significance(s) for s in segs]
+
+    if max_vertices is None and max_seconds is None:
+        tol = float(tolerance or 0.0)
+    else:
+        upper = float(tolerance) if tolerance is not None else max_tolerance
+
+        def fits(t):
+            if max_vertices is not None and sum(int(np.count_nonzero(s > t)) for s in significance) > max_vertices:
+                return False
+            if max_seconds is not None and _pen_down_seconds(segs, significance, t) > max_seconds:
+                return False
+            return True
+
+        if fits(0.0):
+            tol = 0.0
+        elif not fits(upper):
+            tol = upper  # 상한에서도 예산 초과 → 상한 허용오차로 최선의 결과
+        else:
+            lo, hi = 0.0, upper
+            for _ in range(30):
+                mid = (lo + hi) / 2
+                if fits(mid):
+                    hi = mid
+                else:
+                    lo = mid
+                if hi - lo < 1e-3:
+                    break
+            tol = hi
+
+    out = []
+    for s, sig in zip(segs, significance):
+        kept = s[sig > tol]
+        out.append(_min_step_filter(kept, min_step))
+    return out, tol
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+drawing_bot/main.py 의 동작을 그대로 따라가는 EV3 플로터 시간 시뮬레이터.
+실제 로봇 없이 JSONL 스트림 또는 part1/2/3 컨투어의 예상 소요 시간과
+펜 다운/펜 업 이동 거리, 컨투어별 시간을 계산한다.
+
+사용법 (backend 폴더에서):
+    python -m services.plot_simulator drawing_bot/drawing_paths_stream.json
+"""
+import argparse
+import json
+import math
+
+import numpy as np
+
+# ===== drawing_bot/main.py 와 같은 상수 =====
+AXIS_MAX_X = 400
+AXIS_MAX_Y = 1100
+MOVE_SPEED = 150.0      # move_to(speed=150) deg/s, X/Y 축 동시 구동
+MOVE_TOL = 2.0          # move_to(tol=2) 이 범위 안에 들어오면 다음 명령
+POLL_SECONDS = 0.01     # while ...: wait(10)
+PEN_SPEED = 100.0       # pen_up/pen_down(speed=100) deg/s, run_target 은 도착까지 대기
+PEN_DOWN_ANGLE = 50
+PEN_UP_ANGLE = 0
+HOME_SPEED = 200.0      # initial_setup(speed=200)
+BEEP_SECONDS = 0.1      # ev3.speaker.beep() 기본 100ms
+
+PEN_SECONDS = abs(PEN_DOWN_ANGLE - PEN_UP_ANGLE) / PEN_SPEED
+
+
+def _clamp_targets(pts):
+    pts = np.asarray(pts, dtype=np.float64).reshape(-1, 2)
+    out = np.empty_like(pts)
+    np.clip(pts[:, 0], 0, AXIS_MAX_X, out=out[:, 0])
+    np.clip(pts[:, 1], 0, AXIS_MAX_Y, out=out[:, 1])
+    return out
+
+
+def move_seconds(dx, dy):
+    """
+    move_to 연속 호출 시 이동 한 번의 평균 시간 (벡터화 근사).
+    느린 축 기준 이동량 / 속도 + 폴링 대기 평균(10ms 의 절반). 예산 탐색 같은 빠른 추정용.
+    """
+    d = np.maximum(np.abs(dx), np.abs(dy))
+    return np.where(d > 0, d / MOVE_SPEED + POLL_SECONDS / 2, 0.0)
+
+
+def _advance(pos, target, step):
+    """pos 에서 target 방향으로 최대 step 만큼 이동 (축 하나)"""
+    if abs(target - pos) <= step:
+        return target
+    return pos + step if target > pos else pos - step
+
+
+def _move_wait_times(targets, starts):
+    """
+    main.py 의 move_to 대기 시간을 순서대로 계산.
+    move_to 는 느린 축이 tol 안에 들어오면 바로 반환하므로 모터는 목표보다 조금 뒤처진 채로
+    다음 move_to 를 시작한다(이 지연이 다음 대기에 누적됨). 대기 시간이 10ms 단위로 올림되고
+    축마다 목표에서 멈추므로 선형 점화식이 아니어서 누적합 같은 벡터 연산으로 바꿀 수 없다 → 이 부분만 순차 루프.
+    (남은 지연은 항상 MOVE_TOL 이하라 컨투어끼리는 독립이지만, "컨투어마다 j 번째 점"을 한꺼번에 계산하는
+    방식은 static/images 에서 이 루프보다 2배 이상 느렸다: 긴 컨투어 몇 개(최대 1218점, 중앙값 37점)가 반복 횟수를 정한다)
+    펜 업/다운(0.5s) 동안은 XY 모터가 계속 목표로 이동한다.
+    """
+    waits = [0.0] * len(targets)
+    is_start = [False] * len(targets)
+    for s in starts:
+        is_start[s] = True
+    pen_step = MOVE_SPEED * PEN_SECONDS
+    ax = ay = 0.0
+    tx = ty = 0.0
+    for k, (nx, ny) in enumerate(targets):
+        if is_start[k] and k > 0:
+            # 직전 컨투어 끝의 pen_up() 동안 이동
+            ax, ay = _advance(ax, tx, pen_step), _advance(ay, ty, pen_step)
+        tx, ty = nx, ny
+        need = max(abs(tx - ax), abs(ty - ay)) - MOVE_TOL
+        if need > 0:
+            w = math.ceil(need / MOVE_SPEED / POLL_SECONDS - 1e-9) * POLL_SECONDS
+            step = MOVE_SPEED * w
+            ax, ay = _advance(ax, tx, step), _advance(ay, ty, step)
+            waits[k] = w
+        if is_start[k]:
+            # 첫 점 도착 후 pen_down() 동안 이동
+            ax, ay = _advance(ax, tx, pen_step), _advance(ay, ty, pen_step)
+    return np.array(waits)
+
+
+def homing_seconds(home_from):
+    """initial_setup: X축, Y축 순서로 터치센서까지 이동 + 비프 2회"""
+    if home_from is None:
+        return 2 * BEEP_SECONDS
+    x, y = home_from
+    return abs(x) / HOME_SPEED + abs(y) / HOME_SPEED + 2 * BEEP_SECONDS
+
+
+def simulate_plot(contours, home_from=None, per_contour=True):
+    """
+    contours: [[x, y], ...] 리스트들 (JSONL 한 줄 = 컨투어 하나, main.py 와 같은 순서로 그림)
+    home_from: 시작 전 펜 위치 (None 이면 이미 원점)
+    return: dict (totalSeconds, penDownDistance, penUpDistance, contours...)
+    """
+    arrays = [_clamp_targets(c) for c in contours if len(c) > 0]
+    setup = homing_seconds(home_from)
+    if not arrays:
+        return {
+            "totalSeconds": setup + BEEP_SECONDS,
+            "setupSeconds": setup,
+            "penDownDistance": 0.0,
+            "penUpDistance": 0.0,
+            "contourCount": 0,
+            "moveCount": 0,
+            "contours": [] if per_contour else None,
+        }
+
+    lengths = np.array([a.shape[0] for a in arrays], dtype=np.int64)
+    targets = np.concatenate(arrays)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    # 거리는 목표점 사이 경로 기준 (맨 처음은 원점에서 출발)
+    prev = np.vstack(([0.0, 0.0], targets[:-1]))
+    d = targets - prev
+    dist = np.hypot(d[:, 0], d[:, 1])
+    t_move = _move_wait_times(targets.tolist(), starts.tolist())
+
+    # 컨투어의 첫 move 는 펜 업 이동, 나머지는 펜 다운
+    pen_up_mask = np.zeros(targets.shape[0], dtype=bool)
+    pen_up_mask[starts] = True
+    pen_up_dist = float(dist[pen_up_mask].sum())
+    pen_down_dist = float(dist[~pen_up_mask].sum())
+
+    # 컨투어마다: pen_up(이미 올라가 있음, 0s) → 이동 → pen_down → 이동들 → pen_up
+    # 마지막 pen_up 이후 남은 XY 이동은 다음 컨투어의 첫 move_to 대기에 포함된다
+    contour_move = np.add.reduceat(t_move, starts)
+    contour_seconds = contour_move + 2 * PEN_SECONDS
+    total = setup + float(contour_seconds.sum()) + BEEP_SECONDS
+
+    result = {
+        "totalSeconds": total,
+        "setupSeconds": setup,
+        "penDownDistance": pen_down_dist,
+        "penUpDistance": pen_up_dist,
+        "contourCount": int(lengths.shape[0]),
+        "moveCount": int(targets.shape[0]),
+        "contours": None,
+    }
+    if per_contour:
+        travel = t_move[starts]
+        down_dist = np.add.reduceat(np.where(pen_up_mask, 0.0, dist), starts)
+        result["contours"] = [
+            {"points": int(n), "seconds": float(s), "travelSeconds": float(tr), "penDownDistance": float(dd)}
+            for n, s, tr, dd in zip(lengths.tolist(), contour_seconds.tolist(), travel.tolist(), down_dist.tolist())
+        ]
+    return result
+
+
+def read_jsonl(path):
+    contours = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                contours.append(json.loads(line))
+    return contours
+
+
+def simulate_jsonl(path, home_from=None):
+    return simulate_plot(read_jsonl(path), home_from=home_from)
+
+
+def _format_seconds(s):
+    m, s = divmod(s, 60)
+    return f"{int(m)}m {s:04.1f}s" if m else f"{s:.1f}s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate EV3 drawing time for JSONL contour streams.")
+    parser.add_argument("files", nargs="+", help="JSONL 파일 (한 줄에 contour 하나)")
+    parser.add_argument("--per-contour", action="store_true", help="컨투어별 시간 출력")
+    args = parser.parse_args()
+
+    for path in args.files:
+        r = simulate_jsonl(path)
+        print(f"{path}: {_format_seconds(r['totalSeconds'])} | contours {r['contourCount']} | moves {r['moveCount']}"
+              f" | pen-down {r['penDownDistance']:.0f} | pen-up {r['penUpDistance']:.0f}")
+        if args.per_contour:
+            for i, c in enumerate(r["contours"]):
+                print(f"  #{i:<4} {c['points']:>6} pts {c['seconds']:8.2f}s (travel {c['travelSeconds']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
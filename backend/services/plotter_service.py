@@ -0,0 +1,288 @@
+import collections
+import json
+import logging
+import os
+import queue
+import shlex
+import subprocess
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# EV3 드로잉 봇과의 장기 세션: 프로세스 하나를 계속 띄워두고 stdin 으로 컨투어를 JSONL 한 줄씩 흘려보낸다.
+# (임시 파일 + 요청마다 subprocess.run 으로 끝날 때까지 기다리던 방식 대체)
+# - 제어 프로세스(drawing_bot/main.py -)는 stdin 에서 한 줄(=컨투어 하나)씩 읽어 그리고,
+#   다 그린 컨투어마다 stdout 에 "ACK <번호>" 한 줄을 출력한다. 그 밖의 출력은 진행 상황으로 세지 않는다.
+# - 대기열 한도(PLOTTER_QUEUE_SIZE)는 이미 쌓인 일의 양 기준: 대기열이 가득 차 있으면 새 batch 는
+#   거절(HTTP)되거나 자리가 날 때까지 기다린다(backpressure). 자리가 있으면 batch 는 크기와 상관없이 한 번에 들어간다.
+# - 보내기에 계속 실패하거나 그리는 도중 프로세스가 끝나면 그 batch 는 error 로 끝난다 (남은 컨투어는 버림).
+# PC 에서 EV3 로 띄울 때는 예: PLOTTER_COMMAND="ssh robot@ev3dev brickrun -r -- pybricks-micropython /home/robot/drawing_bot/main.py -"
+PLOTTER_COMMAND = shlex.split(os.environ.get("PLOTTER_COMMAND", "pybricks-micropython drawing_bot/main.py -"))
+PLOTTER_QUEUE_SIZE = int(os.environ.get("PLOTTER_QUEUE_SIZE", "2000"))
+ACK_TOKEN = "ACK"
+MAX_BATCH_HISTORY = 100
+
+
+class PlotterBusyError(Exception):
+    pass
+
+
+class PlotterSession:
+    def __init__(self, command=None, queue_size=PLOTTER_QUEUE_SIZE):
+        self.command = command or PLOTTER_COMMAND
+        self.queue_size = queue_size
+        self.pending = collections.deque()    # (batch, index, contour) — 아직 보내지 않은 컨투어
+        self.proc = None
+        self.writer = None
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+        self.inflight = collections.deque()   # 보냈지만 아직 ACK 가 없는 (batch, index)
+        self.batches = {}
+        self.sent = 0
+        self.drawn = 0
+        self.last_error = None
+        self.last_output = None
+        self.started_at = None
+        self.subscribers = []
+
+    # ----- 프로세스 관리 -----
+    def _ensure_started(self):
+        with self.lock:
+            if self.writer is None:
+                self.writer = threading.Thread(target=self._writer, daemon=True, name="plotter-writer")
+                self.writer.start()
+
+    def _ensure_process(self):
+        """제어 프로세스가 없거나 종료됐으면 새로 띄운다 (writer 스레드에서만 호출)"""
+        with self.lock:
+            if self.proc is not None and self.proc.poll() is None:
+                return self.proc
+            self.proc = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+            )
+            self.started_at = time.time()
+            # 이전 프로세스에 보냈지만 ACK 가 없던 컨투어는 그려졌는지 알 수 없다
+            lost = {b for b, _ in self.inflight}
+            self.inflight.clear()
+            proc = self.proc
+        threading.Thread(target=self._reader, args=(proc,), daemon=True, name="plotter-reader").start()
+        if lost:
+            self._fail_batches(lost, "plotter restarted before finishing the drawing")
+        return proc
+
+    def _writer(self):
+        while True:
+            with self.not_empty:
+                while not self.pending:
+                    self.not_empty.wait()
+                batch_id, index, contour = self.pending.popleft()
+                self.not_full.notify_all()
+            line = json.dumps(contour) + "\n"
+            sent = error = None
+            for attempt in range(3):
+                try:
+                    proc = self._ensure_process()
+                    # ACK 가 flush 보다 먼저 올 수 있으므로 쓰기 전에 inflight 에 넣는다
+                    with self.lock:
+                        if self.batches[batch_id]["error"] is not None:
+                            error = None   # 재시작으로 이미 실패 처리된 batch → 나머지는 보내지 않는다
+                            break
+                        self.inflight.append((batch_id, index))
+                    proc.stdin.write(line)
+                    proc.stdin.flush()
+                    sent = True
+                    break
+                except (OSError, ValueError) as e:
+                    with self.lock:
+                        if self.inflight and self.inflight[-1] == (batch_id, index):
+                            self.inflight.pop()
+                    error = f"plotter write failed: {str(e)}"
+                    time.sleep(0.5 * (attempt + 1))
+            if not sent:
+                if error is not None:
+                    self._fail_batches({batch_id}, error)
+                continue
+            with self.lock:
+                self.sent += 1
+                self.batches[batch_id]["sent"] += 1
+            self._publish("sent", batch_id, index)
+
+    def _reader(self, proc):
+        for line in proc.stdout:
+            line = line.strip()
+            if line.split(" ", 1)[0] != ACK_TOKEN:
+                with self.lock:
+                    self.last_output = line
+                continue
+            with self.lock:
+                if self.proc is not proc or not self.inflight:
+                    continue
+                batch_id, index = self.inflight.popleft()
+                self.drawn += 1
+                self.batches[batch_id]["drawn"] += 1
+            self._publish("drawn", batch_id, index)
+        code = proc.wait()
+        with self.lock:
+            lost = set()
+            if self.proc is proc:
+                lost = {b for b, _ in self.inflight}
+                self.inflight.clear()
+        if lost:
+            self._fail_batches(lost, f"plotter exited with code {code} before finishing the drawing")
+        elif code != 0:
+            self._fail(f"plotter exited with code {code}")
+
+    def _fail(self, message, batch_id=None):
+        logger.error("Plotter error: %s", message)
+        with self.lock:
+            self.last_error = message
+        self._publish("error", batch_id, None, message=message)
+
+    def _fail_batches(self, batch_ids, message):
+        """batch 를 실패로 표시하고 아직 보내지 않은 컨투어는 버린다 (status 의 error 로 끝을 알 수 있게)"""
+        with self.lock:
+            for batch_id in batch_ids:
+                if batch_id in self.batches:
+                    self.batches[batch_id]["error"] = message
+            self.pending = collections.deque(item for item in self.pending if item[0] not in batch_ids)
+            self.not_full.notify_all()
+        for batch_id in batch_ids:
+            self._fail(message, batch_id)
+
+    # ----- 생산자 API -----
+    def _wait_for_room(self, block, timeout):
+        """대기열에 자리가 날 때까지 (self.lock 안에서 호출). 못 기다리면 PlotterBusyError"""
+        if len(self.pending) < self.queue_size:
+            return
+        if not block or not self.not_full.wait_for(lambda: len(self.pending) < self.queue_size, timeout):
+            raise PlotterBusyError("플로터 대기열이 가득 찼습니다.")
+
+    def _enqueue(self, batch_id, contours):
+        """batch 의 컨투어를 한 번에 대기열에 넣는다 (self.lock 안에서 호출)"""
+        batch = self.batches[batch_id]
+        start = batch["total"]
+        batch["total"] += len(contours)
+        self.pending.extend((batch_id, i, contour) for i, contour in enumerate(contours, start=start))
+        self.not_empty.notify()
+
+    def submit(self, contours, block=False, timeout=None):
+        """
+        새 batch 를 만들어 컨투어를 순서대로 대기열에 넣고 batch id 반환.
+        대기열이 가득 차 있으면 block=False 면 PlotterBusyError (HTTP 요청용),
+        block=True 면 자리가 날 때까지(최대 timeout 초) 기다린다. 일부만 들어가는 경우는 없다.
+        """
+        contours = [c for c in contours if len(c) > 0]
+        batch_id = uuid.uuid4().hex
+        with self.lock:
+            self._wait_for_room(block, timeout)
+            self._forget_finished_batches()
+            self.batches[batch_id] = {"total": 0, "sent": 0, "drawn": 0, "error": None, "createdAt": time.time()}
+            self._enqueue(batch_id, contours)
+        self._ensure_started()
+        self._publish("queued", batch_id, None)
+        return batch_id
+
+    def extend(self, batch_id, contours, timeout=None):
+        """
+        이미 만든 batch 에 컨투어 추가 (예: part1 을 그리는 동안 part2/3 을 이어서 넣기).
+        대기열이 가득 차 있으면 자리가 날 때까지 기다린다. 실패한 batch 에는 더 넣지 않는다.
+        """
+        contours = [c for c in contours if len(c) > 0]
+        with self.lock:
+            self._wait_for_room(True, timeout)
+            batch = self.batches.get(batch_id)
+            if batch is None or batch["error"] is not None:
+                return
+            self._enqueue(batch_id, contours)
+        self._ensure_started()
+
+    def _forget_finished_batches(self):
+        if len(self.batches) < MAX_BATCH_HISTORY:
+            return
+        in_use = {b for b, _ in self.inflight} | {b for b, _, _ in self.pending}
+        for batch_id in list(self.batches):
+            batch = self.batches[batch_id]
+            if batch_id not in in_use and (batch["error"] is not None or batch["sent"] >= batch["total"]):
+                del self.batches[batch_id]
+            if len(self.batches) < MAX_BATCH_HISTORY // 2:
+                break
+
+    # ----- 상태/이벤트 -----
+    def status(self, batch_id=None):
+        with self.lock:
+            running = self.proc is not None and self.proc.poll() is None
+            data = {
+                "running": running,
+                "queued": len(self.pending),
+                "queueLimit": self.queue_size,
+                "sent": self.sent,
+                "drawn": self.drawn,
+                "inFlight": len(self.inflight),
+                "lastError": self.last_error,
+                "lastOutput": self.last_output,
+                "startedAt": self.started_at,
+            }
+            if batch_id is not None:
+                batch = self.batches.get(batch_id)
+                data["batch"] = dict(batch, batchId=batch_id) if batch else None
+        return data
+
+    def subscribe(self):
+        q = queue.Queue(maxsize=256)
+        with self.lock:
+            self.subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self.lock:
+            if q in self.subscribers:
+                self.subscribers.remove(q)
+
+    def _publish(self, event, batch_id, index, **extra):
+        with self.lock:
+            payload = {"event": event, "batchId": batch_id, "contour": index,
+                       "sent": self.sent, "drawn": self.drawn, "queued": len(self.pending)}
+            if batch_id in self.batches:
+                payload["batch"] = dict(self.batches[batch_id])
+            payload.update(extra)
+            subscribers = list(self.subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(payload)
+            except queue.Full:
+                pass  # 느린 구독자는 이벤트를 건너뛴다 (status 로 언제든 재동기화 가능)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_plotter():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = PlotterSession()
+        return _session
+
+
+def sse_stream(session, heartbeat=15.0):
+    """Server-Sent Events 제너레이터 (진행 이벤트 + 주기적 heartbeat)"""
+    q = session.subscribe()
+    try:
+        yield f"data: {json.dumps(dict(session.status(), event='status'))}\n\n"
+        while True:
+            try:
+                payload = q.get(timeout=heartbeat)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"data: {json.dumps(payload)}\n\n"
+    finally:
+        session.unsubscribe(q)
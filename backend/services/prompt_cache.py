@@ -0,0 +1,116 @@
+import asyncio
+import collections
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future
+
+from services.metrics_service import inc
+
+# /api/request 결과 single-flight + TTL 캐시 (프로세스 단위)
+# - 같은 키(정규화된 prompt + 옵션)로 동시에 들어온 요청은 진행 중인 생성 하나를 같이 기다린다
+#   → 이미지 생성 유료 호출, 컨투어 추출, DB 저장, 같은 PNG 파일 쓰기가 한 번만 일어난다
+# - 성공한 결과는 PROMPT_CACHE_TTL 초 동안 그대로 재사용 (0 이면 캐시 없이 합치기만)
+# - 실패는 캐시하지 않는다: 기다리던 요청 모두 같은 예외를 받고, 다음 요청은 새로 시도
+# 동기(스레드, 작업 큐) 호출과 비동기(ASGI) 호출이 같은 진행 중 Future 를 공유한다.
+PROMPT_CACHE_TTL = float(os.environ.get("PROMPT_CACHE_TTL", "600"))
+PROMPT_CACHE_MAX = int(os.environ.get("PROMPT_CACHE_MAX", "256"))
+
+_lock = threading.Lock()
+_inflight = {}                        # key → Future
+_results = collections.OrderedDict()  # key → (만료 시각, 결과)
+_stats = {"hits": 0, "coalesced": 0, "misses": 0, "errors": 0}
+
+
+def normalize_prompt(text):
+    """대소문자, 앞뒤/연속 공백 차이는 같은 요청으로 본다"""
+    return re.sub(r"\s+", " ", text).strip().casefold()
+
+
+def _lookup(key):
+    """return: ("hit", 결과) / ("coalesced", 진행 중 Future) / ("miss", 새 Future). _lock 안에서 호출."""
+    entry = _results.get(key)
+    if entry is not None:
+        if entry[0] > time.monotonic():
+            _results.move_to_end(key)
+            _stats["hits"] += 1
+            return "hit", entry[1]
+        del _results[key]
+    future = _inflight.get(key)
+    if future is not None:
+        _stats["coalesced"] += 1
+        return "coalesced", future
+    future = _inflight[key] = Future()
+    # RUNNING 상태로 두면 기다리던 쪽이 취소돼도(asyncio.wrap_future) 공유 Future 는 취소되지 않는다
+    future.set_running_or_notify_cancel()
+    _stats["misses"] += 1
+    return "miss", future
+
+
+def finish(key, future, result=None, error=None):
+    """진행 중인 생성의 결과(또는 예외)를 기다리던 요청에 알리고, 성공이면 TTL 동안 캐시"""
+    with _lock:
+        _inflight.pop(key, None)
+        if error is None and PROMPT_CACHE_TTL > 0:
+            _results[key] = (time.monotonic() + PROMPT_CACHE_TTL, result)
+            _results.move_to_end(key)
+            while len(_results) > PROMPT_CACHE_MAX:
+                _results.popitem(last=False)
+        elif error is not None:
+            _stats["errors"] += 1
+    if error is None:
+        future.set_result(result)
+    else:
+        future.set_exception(error)
+
+
+def claim(key):
+    """
+    get_or_run 을 직접 쓰기 어려운 호출자(스트리밍 응답)용.
+    return: ("hit", 결과) / ("coalesced", 진행 중 Future) / ("miss", Future) —
+    "miss" 를 받은 쪽은 반드시 finish(key, future, ...) 로 끝을 알려야 한다.
+    """
+    with _lock:
+        state, value = _lookup(key)
+    inc("prompt_requests_total", result=state)
+    return state, value
+
+
+def get_or_run(key, fn, *args, **kwargs):
+    """fn(*args, **kwargs) 결과를 key 로 합치고 캐시한다 (호출한 스레드에서 실행)"""
+    state, value = claim(key)
+    if state == "hit":
+        return value
+    if state == "coalesced":
+        return value.result()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as e:
+        finish(key, value, error=e)
+        raise
+    finish(key, value, result)
+    return result
+
+
+async def get_or_run_async(key, coro_fn, *args, **kwargs):
+    """get_or_run 의 비동기 버전: await coro_fn(*args, **kwargs)"""
+    state, value = claim(key)
+    if state == "hit":
+        return value
+    if state == "coalesced":
+        return await asyncio.wrap_future(value)
+    try:
+        result = await coro_fn(*args, **kwargs)
+    except BaseException as e:
+        # 취소(클라이언트 연결 끊김)도 기다리던 요청에 알려야 Future 가 남지 않는다
+        finish(key, value, error=e if isinstance(e, Exception) else RuntimeError("요청이 취소되었습니다."))
+        raise
+    finish(key, value, result)
+    return result
+
+
+def prompt_cache_stats():
+    with _lock:
+        return dict(_stats, entries=len(_results), inflight=len(_inflight),
+                    ttlSeconds=PROMPT_CACHE_TTL, maxEntries=PROMPT_CACHE_MAX)
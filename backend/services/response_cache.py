@@ -0,0 +1,185 @@
+import collections
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli  # 선택 의존성: 없으면 gzip 만 사용
+except ImportError:
+    brotli = None
+
+# HTTP 응답 캐시/압축 도우미
+# - 바뀌지 않는 JSON(그림 part 컨투어, precompute 된 contour_json)은 직렬화 + 압축 결과를 LRU 로 보관하고
+#   내용 해시로 strong ETag 를 만든다 → 같은 태블릿의 재요청은 304, 다른 클라이언트는 압축본 재사용
+# - 그 밖의 큰 JSON 응답은 after_request 에서 그때그때 압축
+PAYLOAD_CACHE_MAX_BYTES = int(os.environ.get("PAYLOAD_CACHE_MAX_MB", "32")) * 1024 * 1024
+COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", "1024"))
+FILE_ETAG_MAX = int(os.environ.get("FILE_ETAG_MAX", "4096"))
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+_lock = threading.Lock()
+_payloads = collections.OrderedDict()   # key → Payload
+_payload_bytes = 0
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_file_etags = collections.OrderedDict()   # (path, mtime_ns, size) → etag (LRU, 최대 FILE_ETAG_MAX 개)
+
+
+def _compress(body, encoding, best=False):
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if best else 5)
+    return gzip.compress(body, compresslevel=9 if best else 6, mtime=0)
+
+
+def choose_encoding(accept_encodings):
+    """werkzeug request.accept_encodings → "br" / "gzip" / None(identity)"""
+    return accept_encodings.best_match(ENCODINGS)
+
+
+class Payload:
+    """직렬화된 JSON 본문 + strong ETag. 압축본은 인코딩별로 처음 요청될 때 한 번만 만든다."""
+    __slots__ = ("key", "body", "etag", "variants")
+
+    def __init__(self, key, body):
+        self.key = key
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.variants = {}
+
+    @property
+    def size(self):
+        return len(self.body) + sum(len(v) for v in self.variants.values())
+
+    def encoded(self, encoding):
+        """return: (본문, 실제 인코딩, ETag). 작은 본문은 압축하지 않는다."""
+        if encoding is None or len(self.body) < COMPRESS_MIN_BYTES:
+            return self.body, None, self.etag
+        data = self.variants.get(encoding)
+        if data is None:
+            data = _compress(self.body, encoding, best=True)
+            _resize(self, encoding, data)
+        # 표현(representation)마다 ETag 가 달라야 한다
+        return data, encoding, f"{self.etag}-{encoding}"
+
+
+def _resize(payload, encoding, data):
+    global _payload_bytes
+    with _lock:
+        before = payload.size
+        payload.variants[encoding] = data
+        if _payloads.get(payload.key) is payload:
+            _payload_bytes += payload.size - before
+            _evict()
+
+
+def _evict():
+    global _payload_bytes
+    while _payload_bytes > PAYLOAD_CACHE_MAX_BYTES and len(_payloads) > 1:
+        _, old = _payloads.popitem(last=False)
+        _payload_bytes -= old.size
+        _stats["evictions"] += 1
+
+
+def _get_or_build(key, build_body):
+    global _payload_bytes
+    with _lock:
+        payload = _payloads.get(key)
+        if payload is not None:
+            _payloads.move_to_end(key)
+            _stats["hits"] += 1
+            return payload
+        _stats["misses"] += 1
+    body = build_body()
+    if body is None:
+        return None
+    payload = Payload(key, body)
+    with _lock:
+        if key not in _payloads:
+            _payloads[key] = payload
+            _payload_bytes += payload.size
+            _evict()
+    return payload
+
+
+def get_payload(key, build):
+    """
+    key 로 캐시된 Payload 를 반환. 없으면 build() 결과(JSON 으로 만들 객체)를 직렬화해 넣는다.
+    build() 가 None 을 반환하면(없는 그림 등) 캐시하지 않고 None.
+    """
+    def build_body():
+        obj = build()
+        if obj is None:
+            return None
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    return _get_or_build(key, build_body)
+
+
+def get_file_payload(path):
+    """precompute 된 JSON 파일 → Payload (경로 + mtime + 크기로 캐시, 파일이 바뀌면 새로 읽음)"""
+    st = os.stat(path)
+
+    def read():
+        with open(path, "rb") as f:
+            return f.read()
+
+    return _get_or_build(("file", path, st.st_mtime_ns, st.st_size), read)
+
+
+def file_etag(path):
+    """정적 파일 내용의 sha1 (경로 + mtime + 크기 기준으로 한 번만 계산)"""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    with _lock:
+        etag = _file_etags.get(key)
+        if etag is not None:
+            _file_etags.move_to_end(key)
+            return etag
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    etag = h.hexdigest()
+    with _lock:
+        _file_etags[key] = etag
+        while len(_file_etags) > FILE_ETAG_MAX:
+            _file_etags.popitem(last=False)
+    return etag
+
+
+def compress_response(response, accept_encodings):
+    """after_request 용: 압축 안 된 큰 JSON 응답을 그 자리에서 압축"""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or "Content-Encoding" in response.headers or response.mimetype != "application/json"):
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+    encoding = choose_encoding(accept_encodings)
+    response.vary.add("Accept-Encoding")
+    if encoding is None:
+        return response
+    response.set_data(_compress(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def compress_body(body, accept_encoding_header):
+    """
+    werkzeug 응답 객체가 없을 때(ASGI 라우트): Accept-Encoding 헤더 문자열 → (본문, Content-Encoding 또는 None)
+    """
+    if len(body) < COMPRESS_MIN_BYTES:
+        return body, None
+    encoding = choose_encoding(parse_accept_header(accept_encoding_header or ""))
+    if encoding is None:
+        return body, None
+    return _compress(body, encoding), encoding
+
+
+def payload_cache_stats():
+    with _lock:
+        return dict(_stats, entries=len(_payloads), bytes=_payload_bytes, fileEtags=len(_file_etags),
+                    maxBytes=PAYLOAD_CACHE_MAX_BYTES, encodings=list(ENCODINGS))
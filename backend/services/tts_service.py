@@ -1,16 +1,146 @@
-from openai import OpenAI
+import asyncio
+import hashlib
 import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from services.disk_cache import DiskCache, atomic_path
+from services.openai_clients import get_client, get_async_client
 
-client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+TTS_MODEL = "gpt-4o-mini-tts"
+TTS_VOICE = "alloy"    # 원하는 목소리
+TTS_FORMAT = "mp3"
+# 질문 3개의 음성을 동시에 합성 (요청 하나에 스레드 하나씩, 응답을 기다리는 동안 CPU 는 거의 안 씀)
+TTS_WORKERS = int(os.environ.get("TTS_WORKERS", "6"))
 
-def generate_tts(text, save_path="output.mp3"):
+# 합성 결과 캐시: hash(text, voice, model) 이름의 파일 (/static/audio/tts/<key>.mp3 로 바로 제공)
+# 같은 문구(카테고리, 그림 이름, 고정 안내)는 provider 호출 없이 재사용, 용량을 넘으면 오래 안 쓴 것부터 삭제
+TTS_CACHE_DIR = os.environ.get(
+    "TTS_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "audio", "tts")
+)
+TTS_CACHE_MAX_BYTES = int(os.environ.get("TTS_CACHE_MAX_MB", "256")) * 1024 * 1024
+
+_executor = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="tts")
+_lock = threading.Lock()
+_inflight = {}   # 캐시 경로 → Future (같은 문구 동시 요청은 합성 한 번)
+_cache = DiskCache(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES, f".{TTS_FORMAT}")
+
+
+def tts_key(text, voice=TTS_VOICE, model=TTS_MODEL):
+    return hashlib.sha256(f"{model}\0{voice}\0{TTS_FORMAT}\0{text}".encode("utf-8")).hexdigest()[:40]
+
+
+def tts_cache_path(text):
+    return os.path.join(TTS_CACHE_DIR, f"{tts_key(text)}.{TTS_FORMAT}")
+
+
+def cached_tts(text):
+    """캐시에 있으면 파일 경로(LRU 순서 갱신), 없으면 None. provider 를 호출하지 않는다."""
+    path = tts_cache_path(text)
+    if not _cache.touch(path):
+        return None
+    _cache.count("hits")
+    return path
+
+
+def _speech_request(text):
+    return {"model": TTS_MODEL, "voice": TTS_VOICE, "input": text, "response_format": TTS_FORMAT}
+
+
+def _begin(path):
+    """return: (직접 합성해야 하면 True, Future)"""
+    with _lock:
+        future = _inflight.get(path)
+        if future is not None:
+            return False, future
+        future = _inflight[path] = Future()
+        future.set_running_or_notify_cancel()
+    _cache.count("misses")
+    os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+    return True, future
+
+
+def _end(path, future, error=None):
+    """합성 결과(이미 캐시 경로에 있음)를 기다리던 요청에 알린다"""
+    with _lock:
+        _inflight.pop(path, None)
+    if error is not None:
+        _cache.count("errors")
+        future.set_exception(error)
+        return
+    _cache.added(path)
+    future.set_result(path)
+
+
+def get_tts(text):
+    """text → 캐시된 음성 파일 경로. 없으면 합성하며 응답을 파일로 바로 스트리밍한다."""
+    path = cached_tts(text)
+    if path is not None:
+        return path
+    path = tts_cache_path(text)
+    owner, future = _begin(path)
+    if not owner:
+        return future.result()
+    try:
+        # 다 받은 뒤에 캐시 경로로 바꾼다
+        with atomic_path(path) as tmp, \
+                get_client().audio.speech.with_streaming_response.create(**_speech_request(text)) as response:
+            response.stream_to_file(tmp)
+    except Exception as e:
+        _end(path, future, e)
+        raise
+    _end(path, future)
+    return path
+
+
+async def get_tts_async(text):
+    """ASGI 모드용 get_tts (동기 호출과 진행 중 합성을 공유)"""
+    path = await asyncio.to_thread(cached_tts, text)
+    if path is not None:
+        return path
+    path = tts_cache_path(text)
+    owner, future = _begin(path)
+    if not owner:
+        return await asyncio.wrap_future(future)
+    try:
+        with atomic_path(path) as tmp:
+            async with get_async_client().audio.speech.with_streaming_response.create(**_speech_request(text)) as response:
+                await response.stream_to_file(tmp)
+    except BaseException as e:
+        _end(path, future, e if isinstance(e, Exception) else RuntimeError("요청이 취소되었습니다."))
+        raise
+    await asyncio.to_thread(_end, path, future)
+    return path
+
+
+def generate_tts(text, save_path=None):
     """
-    GPT TTS 모델을 사용해 음성 파일 생성
+    GPT TTS 모델을 사용해 음성 파일 생성 (캐시 경유).
+    save_path 를 주면 그 경로로 복사하고, 없으면 캐시 파일 경로를 반환한다.
     """
-    response = client.audio.speech.create(
-        model="gpt-4o-mini-tts",
-        voice="alloy",    # 원하는 목소리
-        input=text
-    )
-    with open(save_path, "wb") as f:
-        f.write(response.audio)
\ No newline at end of file
+    path = get_tts(text)
+    if save_path is None:
+        return path
+    shutil.copyfile(path, save_path)
+    return save_path
+
+
+def submit_tts(text):
+    """get_tts 를 TTS 스레드 풀에서 실행 → Future (결과: 캐시 파일 경로)"""
+    return _executor.submit(get_tts, text)
+
+
+async def generate_tts_async(text, save_path=None):
+    """ASGI 모드용 generate_tts"""
+    path = await get_tts_async(text)
+    if save_path is None:
+        return path
+    await asyncio.to_thread(shutil.copyfile, path, save_path)
+    return save_path
+
+
+def tts_cache_stats():
+    with _lock:
+        inflight = len(_inflight)
+    return _cache.stats(inflight=inflight)
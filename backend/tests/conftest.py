@@ -0,0 +1,9 @@
+import os
+import sys
+
+# backend 폴더에서 `python -m pytest` 로 실행. services 패키지, benchmarks 의 기존 구현(비교 기준),
+# drawing_bot/contour_processor 를 import 한다.
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (BACKEND_DIR, os.path.join(BACKEND_DIR, "benchmarks"), os.path.join(BACKEND_DIR, "drawing_bot")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from services.db_service import PART_FORMAT, decode_part, encode_part
+from services.json_service import (
+    BIN_ENCODINGS,
+    contours_from_bin,
+    decode_contours_bin,
+    encode_contours_bin,
+    read_contours_bin,
+    write_contours_bin,
+)
+
+
+def _random_int_contours(rng, low=0, high=1100, count=50):
+    return [rng.integers(low, high, size=(rng.integers(1, 80), 2)).tolist() for _ in range(count)]
+
+
+def _decoded(buf):
+    coords, offsets, scale = decode_contours_bin(buf)
+    return [c.tolist() for c in contours_from_bin(coords, offsets)], scale
+
+
+@pytest.mark.parametrize("encoding", sorted(BIN_ENCODINGS))
+def test_integer_contours_round_trip(encoding):
+    contours = _random_int_contours(np.random.default_rng(0))
+    contours.insert(3, [])   # 빈 컨투어도 자리를 유지
+    decoded, scale = _decoded(encode_contours_bin(contours, encoding=encoding))
+    assert decoded == contours
+    assert scale == 1.0
+
+
+def test_f64_round_trip_is_bit_exact():
+    rng = np.random.default_rng(1)
+    contours = [(rng.standard_normal((rng.integers(1, 40), 2)) * 1e3).tolist() for _ in range(30)]
+    contours.append([[0.1, -0.0], [1e-300, 5e300]])
+    decoded, _ = _decoded(encode_contours_bin(contours, encoding="f64"))
+    assert decoded == contours
+
+
+@pytest.mark.parametrize("encoding", ["varint", "delta16", "raw16"])
+def test_scaled_encoding_keeps_hundredths(encoding):
+    rng = np.random.default_rng(2)
+    contours = [(rng.integers(0, 30000, size=(20, 2)) / 100).tolist() for _ in range(10)]
+    decoded, scale = _decoded(encode_contours_bin(contours, encoding=encoding, scale=100))
+    assert scale == 100
+    np.testing.assert_allclose(np.concatenate(decoded), np.concatenate(contours), rtol=0, atol=1e-9)
+
+
+def test_varint_handles_large_jumps_and_negative_coordinates():
+    contours = [[[-2_000_000, 5], [2_000_000, -7], [0, 0]], [[123456, -654321]]]
+    decoded, _ = _decoded(encode_contours_bin(contours, encoding="varint"))
+    assert decoded == contours
+
+
+@pytest.mark.parametrize("encoding", ["delta16", "raw16"])
+def test_int16_encodings_reject_out_of_range(encoding):
+    with pytest.raises(ValueError):
+        encode_contours_bin([[[0, 0], [40000, 0]]], encoding=encoding)
+
+
+def test_empty_input_round_trips():
+    for encoding in BIN_ENCODINGS:
+        assert _decoded(encode_contours_bin([], encoding=encoding))[0] == []
+
+
+def test_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        decode_contours_bin(b"NOPE" + bytes(40))
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_file_round_trip(tmp_path, use_mmap):
+    contours = _random_int_contours(np.random.default_rng(3))
+    path = write_contours_bin(tmp_path / "sub" / "c.bin", contours)
+    coords, offsets, _ = read_contours_bin(path, use_mmap=use_mmap)
+    assert [c.tolist() for c in contours_from_bin(coords, offsets)] == contours
+
+
+def test_db_part_round_trip_is_lossless():
+    rng = np.random.default_rng(4)
+    contours = [(rng.random((rng.integers(1, 60), 2)) * [400, 1100]).tolist() for _ in range(25)]
+    fmt, data = encode_part(contours)
+    assert fmt == PART_FORMAT
+    assert decode_part(fmt, data) == contours
+    assert decode_part(*encode_part([])) == []
+
+
+def test_db_part_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        decode_part("json+zlib", b"")
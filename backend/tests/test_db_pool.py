@@ -0,0 +1,131 @@
+import threading
+
+import pytest
+
+from services import db_service
+from services.db_service import ConnectionPool
+
+
+class FakeConnection:
+    def __init__(self, n):
+        self.n = n
+        self.open = True
+        self.ping_ok = True
+
+    def ping(self, reconnect=False):
+        if not self.ping_ok:
+            raise ConnectionError("gone away")
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.open = False
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    made = []
+
+    def connect(**config):
+        made.append(FakeConnection(len(made)))
+        return made[-1]
+
+    monkeypatch.setattr(db_service.pymysql, "connect", connect)
+    return made
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(db_service.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_reuses_most_recently_released_connection(connections):
+    pool = ConnectionPool({}, size=2)
+    a, b = pool.acquire(), pool.acquire()
+    pool.release(a)
+    pool.release(b)
+    assert pool.acquire() is b
+    assert pool.stats()["created"] == 2
+
+
+def test_idle_connection_is_recycled_after_max_idle(connections, clock):
+    pool = ConnectionPool({}, size=1, max_idle=300, ping_after=30)
+    first = pool.acquire()
+    pool.release(first)
+    clock[0] += 301
+    second = pool.acquire()
+    assert second is not first and not first.open
+    stats = pool.stats()
+    assert (stats["recycled"], stats["created"], stats["open"]) == (1, 2, 1)
+
+
+def test_failed_ping_replaces_connection(connections, clock):
+    pool = ConnectionPool({}, size=1, max_idle=300, ping_after=30)
+    first = pool.acquire()
+    pool.release(first)
+    first.ping_ok = False
+    clock[0] += 31
+    second = pool.acquire()
+    assert second is not first and not first.open
+    assert pool.stats()["healthFailures"] == 1
+
+
+def test_recently_used_connection_is_not_pinged(connections, clock):
+    pool = ConnectionPool({}, size=1, max_idle=300, ping_after=30)
+    first = pool.acquire()
+    pool.release(first)
+    first.ping_ok = False
+    clock[0] += 5
+    assert pool.acquire() is first
+
+
+def test_broken_connection_frees_its_slot(connections):
+    pool = ConnectionPool({}, size=1, timeout=0.05)
+    conn = pool.acquire()
+    pool.release(conn, broken=True)
+    assert not conn.open
+    assert pool.stats()["open"] == 0
+    assert pool.acquire() is not conn
+
+
+def test_waits_for_a_release_then_times_out(connections):
+    pool = ConnectionPool({}, size=1, timeout=0.5)
+    conn = pool.acquire()
+    timer = threading.Timer(0.05, pool.release, (conn,))
+    timer.start()
+    assert pool.acquire() is conn
+    timer.join()
+    assert pool.stats()["waits"] == 1
+
+    pool.timeout = 0.05
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_failed_connect_does_not_leak_a_slot(monkeypatch):
+    def connect(**config):
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(db_service.pymysql, "connect", connect)
+    pool = ConnectionPool({}, size=1, timeout=0.05)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            pool.acquire()
+    assert pool.stats()["open"] == 0
+
+
+def test_close_all_closes_idle_connections(connections):
+    pool = ConnectionPool({}, size=2)
+    a, b = pool.acquire(), pool.acquire()
+    pool.release(a)
+    pool.close_all()
+    assert not a.open and b.open
+    stats = pool.stats()
+    assert (stats["open"], stats["idle"], stats["inUse"]) == (1, 0, 1)
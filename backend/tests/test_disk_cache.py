@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+import pytest
+
+from services import contour_cache
+from services.disk_cache import DiskCache, atomic_write
+
+
+def _put(cache, path, size, mtime):
+    replaced = cache.size_of(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, b"x" * size)
+    os.utime(path, (mtime, mtime))
+    cache.added(path, replaced)
+
+
+def _dir_totals(root, suffix):
+    sizes = [os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(root) for f in files if f.endswith(suffix)]
+    return len(sizes), sum(sizes)
+
+
+def test_counts_are_seeded_from_existing_entries(tmp_path):
+    (tmp_path / "ab").mkdir()
+    for i in range(3):
+        (tmp_path / "ab" / f"{i}.bin").write_bytes(b"x" * 100)
+    (tmp_path / "other.txt").write_bytes(b"x" * 1000)   # suffix 가 다른 파일은 세지 않는다
+    stats = DiskCache(str(tmp_path), 10_000, ".bin").stats()
+    assert (stats["entries"], stats["bytes"]) == (3, 300)
+
+
+def test_evicts_least_recently_used_down_to_90_percent(tmp_path):
+    cache = DiskCache(str(tmp_path), 1000, ".bin")
+    paths = [str(tmp_path / "aa" / f"{i}.bin") for i in range(10)]
+    for i, path in enumerate(paths):
+        _put(cache, path, 100, mtime=1000 + i)
+    assert cache.stats()["evictions"] == 0
+
+    # 가장 오래된 항목을 적중시키면(mtime 갱신) 그다음으로 오래된 것부터 지워진다
+    cache.touch(paths[0])
+    _put(cache, str(tmp_path / "aa" / "new.bin"), 100, mtime=2_000_000_000)
+
+    remaining = sorted(os.listdir(tmp_path / "aa"))
+    assert "0.bin" in remaining and "new.bin" in remaining
+    assert "1.bin" not in remaining and "2.bin" not in remaining
+    stats = cache.stats()
+    assert stats["bytes"] <= 900
+    assert stats["evictions"] == 2
+    assert (stats["entries"], stats["bytes"]) == _dir_totals(str(tmp_path), ".bin")
+
+
+def test_overwrite_does_not_double_count(tmp_path):
+    cache = DiskCache(str(tmp_path), 10_000, ".bin")
+    path = str(tmp_path / "aa" / "k.bin")
+    _put(cache, path, 100, mtime=1000)
+    _put(cache, path, 300, mtime=1001)
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["writes"]) == (1, 300, 2)
+
+
+def test_removed_keeps_counts_in_sync(tmp_path):
+    cache = DiskCache(str(tmp_path), 10_000, ".bin")
+    path = str(tmp_path / "aa" / "k.bin")
+    _put(cache, path, 100, mtime=1000)
+    os.remove(path)
+    cache.removed(100)
+    assert (cache.stats()["entries"], cache.stats()["bytes"]) == (0, 0)
+
+
+@pytest.fixture
+def contour_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(contour_cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(contour_cache, "CACHE_ENABLED", True)
+    monkeypatch.setattr(contour_cache, "_cache", DiskCache(str(tmp_path), 10_000, ".bin"))
+    return tmp_path
+
+
+def test_contour_cache_round_trip_and_corrupt_entry(contour_cache_dir):
+    coords = np.array([[0, 0], [400, 1100], [-5, 7]], dtype=np.int32)
+    offsets = np.array([0, 2, 3], dtype=np.int64)
+    part_index = np.array([0, 1, 2, 2], dtype=np.int64)
+    key = contour_cache.make_key(b"image", 0.0001)
+    assert contour_cache.get(key) is None
+    contour_cache.put(key, coords, offsets, part_index)
+
+    got = contour_cache.get(key)
+    assert got is not None
+    np.testing.assert_array_equal(got[0], coords)
+    np.testing.assert_array_equal(got[1], offsets)
+    np.testing.assert_array_equal(got[2], part_index)
+
+    # 깨진 항목은 지우고 miss 로 처리, 카운터도 함께 줄어든다
+    with open(contour_cache._entry_path(key), "wb") as f:
+        f.write(b"garbage")
+    contour_cache._cache = DiskCache(str(contour_cache_dir), 10_000, ".bin")
+    assert contour_cache.get(key) is None
+    assert not os.path.exists(contour_cache._entry_path(key))
+    stats = contour_cache.cache_stats()
+    assert (stats["entries"], stats["bytes"], stats["errors"]) == (0, 0, 1)
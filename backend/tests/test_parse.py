@@ -0,0 +1,72 @@
+import re
+
+import numpy as np
+import pytest
+
+import contour_processor
+from bench_parse import EXTRA_FILES, TXT_DIR, legacy_parse_contours
+from services import json_service
+
+LIBRARY_FILES = sorted(TXT_DIR.rglob("*.txt")) + [p for p in EXTRA_FILES if p.exists()]
+
+# 기존 줄 단위 파서가 건너뛰거나 받아들이는 줄을 골고루 섞은 입력
+EDGE_CASES = {
+    "spaces_and_crlf": "# contour 0\r\n  1 , 2 \r\n3,4\r\n# contour 1\r\n5,6",
+    "junk_lines": "# contour 0\n1,2\nx,3\n-4,5\n6,7,8\n1.5,2\n\n9,10\n# contour 1\nnothing here\n# contour 2\n11,12\n",
+    "text_before_first_header": "1,1\n2,2\n# contour 0\n3,3\n",
+    "header_variants": "#contour0\n1,2\n#   contour   7\n3,4\n# Contour 2\n5,6\n# CONTOUR 3\n7,8\n",
+    "header_mid_line": "# contour 0\n1,2 # contour 1\n3,4\n",
+    "big_numbers": "# contour 0\n12345678901234567890,1\n2,99999999999999999\n3,4\n",
+    "no_trailing_newline": "# contour 0\n1,2\n3,4",
+    "tabs": "# contour 0\n\t1\t,\t2\t\n",
+    "empty": "",
+}
+
+
+def _as_tuples(arrays):
+    return [list(map(tuple, a.tolist())) for a in arrays]
+
+
+def _write(tmp_path, text):
+    path = tmp_path / "contours.txt"
+    path.write_bytes(text.encode("utf-8"))
+    return path
+
+
+@pytest.mark.parametrize("path", LIBRARY_FILES, ids=lambda p: p.name)
+def test_parsers_match_legacy_on_library(path):
+    raw = path.read_text(encoding="utf-8")
+    expected = legacy_parse_contours(raw)
+    assert json_service.parse_contours(raw) == expected
+    assert _as_tuples(json_service.parse_contours_np(raw)) == expected
+    assert _as_tuples(json_service.iter_contours(path, chunk_size=4096)) == expected
+    expected_ci = legacy_parse_contours(raw, flags=re.IGNORECASE)
+    assert contour_processor.parse_contours(raw) == expected_ci
+    assert list(contour_processor.iter_contours(path, chunk_size=4096)) == expected_ci
+
+
+@pytest.mark.parametrize("name", sorted(EDGE_CASES))
+def test_parsers_match_legacy_on_edge_cases(name, tmp_path):
+    raw = EDGE_CASES[name]
+    path = _write(tmp_path, raw)
+    expected = legacy_parse_contours(raw)
+    expected_ci = legacy_parse_contours(raw, flags=re.IGNORECASE)
+    assert json_service.parse_contours(raw) == expected
+    assert contour_processor.parse_contours(raw) == expected_ci
+    # 아주 작은 chunk 로 헤더/숫자가 chunk 경계에 걸리는 경우까지
+    for chunk_size in (1, 3, 7, 64):
+        assert _as_tuples(json_service.iter_contours(path, chunk_size=chunk_size)) == expected
+        assert list(contour_processor.iter_contours(path, chunk_size=chunk_size)) == expected_ci
+
+
+def test_random_text_matches_legacy(tmp_path):
+    rng = np.random.default_rng(0)
+    pieces = ["# contour 1\n", "#contour 22\n", "# Contour 3\n", "12,34\n", " 5 , 6 \n", "7,8,9\n", "-1,2\n",
+              "a,b\n", "\n", "\r\n", "100,200", "3,", ",4\n", "\t9\t,\t9\n"]
+    for _ in range(50):
+        raw = "".join(pieces[i] for i in rng.integers(0, len(pieces), size=rng.integers(0, 60)))
+        path = _write(tmp_path, raw)
+        expected = legacy_parse_contours(raw)
+        assert json_service.parse_contours(raw) == expected, raw
+        assert _as_tuples(json_service.iter_contours(path, chunk_size=5)) == expected, raw
+        assert contour_processor.parse_contours(raw) == legacy_parse_contours(raw, flags=re.IGNORECASE), raw
@@ -0,0 +1,92 @@
+import collections
+import os
+
+import numpy as np
+import pytest
+
+from bench_split import IMAGE_DIR
+from services.contour_service import MAX_X, MAX_Y, load_parts_int
+from services.path_optimizer import _is_closed, _loop_base, optimize_pen_path, pen_up_distance
+
+
+def _library_images():
+    return [os.path.join(IMAGE_DIR, category, name)
+            for category in sorted(os.listdir(IMAGE_DIR)) if os.path.isdir(os.path.join(IMAGE_DIR, category))
+            for name in sorted(os.listdir(os.path.join(IMAGE_DIR, category)))]
+
+
+def _vertex_key(pts):
+    return tuple(sorted(map(tuple, pts.tolist())))
+
+
+def _same_stroke(original, drawn):
+    """drawn 이 original 과 같은 선인지: 그대로/역방향, 닫힌 컨투어는 시작 꼭짓점 회전까지 허용"""
+    if not _is_closed(original):
+        return np.array_equal(drawn, original) or np.array_equal(drawn, original[::-1])
+    base = _loop_base(original)
+    if drawn.shape[0] != base.shape[0] + 1 or not np.array_equal(drawn[0], drawn[-1]):
+        return False
+    return any(np.array_equal(drawn[:-1], np.roll(loop, -k, axis=0))
+               for loop in (base, base[::-1])
+               for k in np.flatnonzero((loop == drawn[0]).all(axis=1)).tolist())
+
+
+def _assert_same_strokes(segments, optimized):
+    originals = [np.asarray(s, dtype=np.float64).reshape(-1, 2) for s in segments]
+    originals = [s for s in originals if s.shape[0] > 0]
+    assert len(optimized) == len(originals)
+    unmatched = collections.defaultdict(list)
+    for s in originals:
+        key = _vertex_key(_loop_base(s) if _is_closed(s) else s)
+        unmatched[key].append(s)
+    for drawn in optimized:
+        key = _vertex_key(drawn[:-1] if _is_closed(drawn) and np.array_equal(drawn[0], drawn[-1]) else drawn)
+        candidates = unmatched.get(key, [])
+        match = next((i for i, s in enumerate(candidates) if _same_stroke(s, drawn)), None)
+        assert match is not None, "최적화 결과에 원래 없던 선이 있음"
+        candidates.pop(match)
+
+
+@pytest.mark.parametrize("image_path", _library_images(), ids=os.path.basename)
+def test_optimizer_keeps_strokes_and_never_adds_pen_up_travel(image_path):
+    try:
+        parts = load_parts_int(image_path).rescale(MAX_X, MAX_Y)
+    except (FileNotFoundError, ValueError):
+        pytest.skip("이미지를 읽을 수 없음")
+    for i in range(parts.part_count):
+        segments = parts.part_segments(i)
+        optimized, end = optimize_pen_path(segments)
+        _assert_same_strokes(segments, optimized)
+        assert pen_up_distance(optimized) <= pen_up_distance(segments) + 1e-6
+        if optimized:
+            assert end == tuple(optimized[-1][-1].tolist())
+
+
+def test_optimizer_chains_shuffled_collinear_strokes():
+    # 0→10, 10→20, ... 를 섞고 절반은 뒤집어 둔다 → 이어 그리면 펜 업 이동은 0
+    strokes = [np.array([[10.0 * k, 0.0], [10.0 * k + 10.0, 0.0]]) for k in range(20)]
+    rng = np.random.default_rng(1)
+    shuffled = [s[::-1] if rng.random() < 0.5 else s for s in (strokes[i] for i in rng.permutation(20))]
+    optimized, end = optimize_pen_path(shuffled)
+    _assert_same_strokes(shuffled, optimized)
+    assert pen_up_distance(optimized) == pytest.approx(0.0)
+    assert end == (200.0, 0.0)
+
+
+def test_optimizer_rotates_closed_loops_without_changing_them():
+    square = np.array([[100, 100], [110, 100], [110, 110], [100, 110], [100, 100]], dtype=np.float64)
+    optimized, _ = optimize_pen_path([square], start=(111.0, 111.0))
+    _assert_same_strokes([square], optimized)
+    np.testing.assert_array_equal(optimized[0][0], [110, 110])
+
+
+def test_optimizer_without_reverse_keeps_direction():
+    strokes = [np.array([[50.0, 0.0], [0.0, 0.0]]), np.array([[60.0, 0.0], [100.0, 0.0]])]
+    optimized, _ = optimize_pen_path(strokes, allow_reverse=False)
+    for drawn in optimized:
+        assert any(np.array_equal(drawn, s) for s in strokes)
+
+
+def test_optimizer_empty_input():
+    assert optimize_pen_path([], start=(3.0, 4.0)) == ([], (3.0, 4.0))
+    assert optimize_pen_path([np.zeros((0, 2))]) == ([], (0.0, 0.0))
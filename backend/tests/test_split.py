@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pytest
+
+from bench_split import IMAGE_DIR, legacy_split_by_three_vertical_bands, prepare_transformed
+from services.contour_service import (
+    _content_bbox_in_canvas,
+    _split_by_three_vertical_bands,
+    _split_by_three_vertical_bands_packed,
+)
+
+
+def _library_images():
+    paths = []
+    for category in sorted(os.listdir(IMAGE_DIR)):
+        cat_dir = os.path.join(IMAGE_DIR, category)
+        if os.path.isdir(cat_dir):
+            paths.extend(os.path.join(cat_dir, name) for name in sorted(os.listdir(cat_dir)))
+    return paths
+
+
+def _as_tuples(parts):
+    return [[list(map(tuple, seg)) for seg in part] for part in parts.to_lists()]
+
+
+def _contours(*point_lists):
+    return [np.array(pts, dtype=np.float64).reshape(-1, 1, 2) for pts in point_lists]
+
+
+@pytest.mark.parametrize("image_path", _library_images(), ids=os.path.basename)
+def test_split_matches_legacy_on_library(image_path):
+    transformed = prepare_transformed(image_path, 0.0001)
+    if transformed is None:
+        pytest.skip("이미지를 읽을 수 없음")
+    _, miny, _, maxy = _content_bbox_in_canvas(transformed)
+    expected = legacy_split_by_three_vertical_bands(transformed, miny, maxy)
+    assert _split_by_three_vertical_bands(transformed, miny, maxy) == expected
+    assert _as_tuples(_split_by_three_vertical_bands_packed(transformed, miny, maxy)) == expected
+
+
+@pytest.mark.parametrize("contours, miny, maxy", [
+    # 밴드 경계(0, 10, 20, 30) 위의 점과 경계를 여러 번 넘나드는 컨투어
+    (_contours([(0, 0), (1, 10), (2, 20), (3, 30), (4, 20), (5, 9.999), (6, 10)]), 0.0, 30.0),
+    # 점 하나짜리 / 빈 컨투어가 섞인 경우
+    (_contours([(1, 5)], [], [(2, 25), (3, 25)], [(4, 15)]), 0.0, 30.0),
+    # 높이가 0 (모든 점이 같은 y)
+    (_contours([(0, 7), (5, 7), (9, 7)]), 7.0, 7.0),
+])
+def test_split_matches_legacy_on_edge_cases(contours, miny, maxy):
+    expected = legacy_split_by_three_vertical_bands(contours, miny, maxy)
+    assert _split_by_three_vertical_bands(contours, miny, maxy) == expected
+    assert _as_tuples(_split_by_three_vertical_bands_packed(contours, miny, maxy)) == expected
+
+
+def test_split_matches_legacy_on_random_contours():
+    rng = np.random.default_rng(0)
+    contours = [rng.integers(0, 60, size=(rng.integers(1, 40), 1, 2)).astype(np.float64) for _ in range(200)]
+    expected = legacy_split_by_three_vertical_bands(contours, 0.0, 59.0)
+    assert _split_by_three_vertical_bands(contours, 0.0, 59.0) == expected
+    assert _as_tuples(_split_by_three_vertical_bands_packed(contours, 0.0, 59.0)) == expected
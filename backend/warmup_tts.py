@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+앱이 반복해서 읽어주는 문구(그림 이름, 카테고리, 정답 안내, 고정 문구)를 TTS 캐시에 미리 합성한다.
+이미 캐시에 있는 문구는 provider 를 호출하지 않는다.
+
+사용법 (backend 폴더에서):
+    python warmup_tts.py              # catalog.tts_phrases() 전체, TTS_WORKERS 개씩 동시에
+    python warmup_tts.py -j 2
+    python warmup_tts.py --dry-run    # 합성할 문구와 캐시 여부만 출력
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+
+from catalog import tts_phrases
+from services.tts_service import TTS_WORKERS, cached_tts, get_tts, tts_cache_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-synthesize catalog phrases into the TTS cache.")
+    parser.add_argument("-j", "--jobs", type=int, default=TTS_WORKERS, help="동시 합성 수 (default: TTS_WORKERS)")
+    parser.add_argument("--dry-run", action="store_true", help="합성하지 않고 목록만 출력")
+    args = parser.parse_args()
+
+    phrases = tts_phrases()
+    missing = [p for p in phrases if cached_tts(p) is None]
+    print(f"문구 {len(phrases)}개 중 캐시에 없는 것 {len(missing)}개")
+    if args.dry_run:
+        for phrase in missing:
+            print(f"  {phrase}")
+        return 0
+
+    t0 = time.perf_counter()
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = {pool.submit(get_tts, phrase): phrase for phrase in missing}
+        for done, future in enumerate(as_completed(futures), 1):
+            phrase = futures[future]
+            try:
+                path = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"[{done}/{len(missing)}] 실패: {phrase} ({e})")
+                continue
+            print(f"[{done}/{len(missing)}] {phrase} → {os.path.basename(path)}")
+
+    stats = tts_cache_stats()
+    print(f"완료: {len(missing) - failed}개 합성, {failed}개 실패, {time.perf_counter() - t0:.1f}s "
+          f"(캐시 {stats['entries']}개, {stats['bytes'] / 1024 / 1024:.1f} MB)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())